@@ -0,0 +1,112 @@
+"""比较主文件各存储格式的写入字节数、fsync 延迟与加载耗时。
+
+用法：``python benchmarks/storage_formats.py --count 20000 --repeat 5``
+数据写入临时目录，不会触碰真实的 ``todos.json``。
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from todo_app import storage  # noqa: E402
+
+
+FORMATS = ("pretty", "compact", "gzip", "columnar")
+
+
+def build_todos(count: int) -> list[dict[str, object]]:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": index + 1,
+            "text": f"示例任务 {index}：整理会议记录并同步给项目组",
+            "createdAt": (base + timedelta(minutes=index)).isoformat(),
+            "completed": index % 3 == 0,
+            "priority": ("高", "中", "低")[index % 3],
+            "dueDate": (base + timedelta(days=index % 90)).isoformat(),
+            "reminderOffset": 900,
+            "snoozeUntil": None,
+            "lastNotifiedAt": None,
+            "notifiedForReminder": False,
+            "notifiedForDue": False,
+        }
+        for index in range(count)
+    ]
+
+
+def measure(data_format: str, todos: list[dict[str, object]], repeat: int) -> dict[str, float]:
+    fsync_durations: list[float] = []
+    real_fsync = os.fsync
+
+    def timed_fsync(fd: int) -> None:
+        started = time.perf_counter()
+        real_fsync(fd)
+        fsync_durations.append(time.perf_counter() - started)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_file = Path(temp_dir) / "todos.json"
+        with (
+            patch.object(storage, "DATA_FILE", data_file),
+            patch.object(storage.os, "fsync", timed_fsync),
+        ):
+            storage.configure_storage(storage.StorageOptions(data_format=data_format))
+            try:
+                storage.save_todos(todos)
+                save_durations: list[float] = []
+                fsync_durations.clear()
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    storage.save_todos(todos)
+                    save_durations.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                storage.load_todos()
+                load_duration = time.perf_counter() - started
+            finally:
+                storage.configure_storage(storage.StorageOptions())
+
+            data_bytes = data_file.stat().st_size
+            backup_bytes = Path(f"{data_file}.bak").stat().st_size
+
+    return {
+        "file_bytes": data_bytes,
+        "written_bytes": data_bytes + backup_bytes,
+        "fsync_ms": statistics.mean(fsync_durations) * 1000,
+        "fsync_per_save_ms": sum(fsync_durations) / repeat * 1000,
+        "save_ms": statistics.median(save_durations) * 1000,
+        "load_ms": load_duration * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000, help="任务数量")
+    parser.add_argument("--repeat", type=int, default=5, help="每种格式的保存次数")
+    args = parser.parse_args()
+
+    todos = build_todos(args.count)
+    print(f"{args.count} 条任务，每种格式保存 {args.repeat} 次（每次保存写入主文件与备份）")
+    print(
+        f"{'格式':<9}{'主文件字节':>12}{'每次写入字节':>14}"
+        f"{'单次fsync ms':>14}{'每次保存fsync ms':>18}{'保存中位数 ms':>15}{'加载 ms':>10}"
+    )
+    for data_format in FORMATS:
+        result = measure(data_format, todos, args.repeat)
+        print(
+            f"{data_format:<9}{result['file_bytes']:>12,}{result['written_bytes']:>14,}"
+            f"{result['fsync_ms']:>14.2f}{result['fsync_per_save_ms']:>18.2f}"
+            f"{result['save_ms']:>15.1f}{result['load_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,14 @@
 from __future__ import annotations
 
 import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, call, patch
 
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
-from PySide6.QtCore import QByteArray  # noqa: E402
+from PySide6.QtCore import QByteArray, QSettings  # noqa: E402
 from PySide6.QtWidgets import QApplication  # noqa: E402
 
 from todo_app.constants import (  # noqa: E402
@@ -27,7 +28,7 @@ class ApplicationIdentityTest(unittest.TestCase):
 
     def test_visible_identity_targets_v2_without_changing_settings_namespace(self) -> None:
         self.assertEqual(APP_NAME, "桌面待办事项")
-        self.assertEqual(APP_VERSION, "2.1.3")
+        self.assertEqual(APP_VERSION, "4.0.0")
         self.assertNotIn("v1", APP_NAME)
         self.assertEqual(SETTINGS_ORGANIZATION, "MyProductiveApp")
         self.assertEqual(SETTINGS_APPLICATION, "桌面待办事项 v1")
@@ -54,6 +55,71 @@ class ApplicationIdentityTest(unittest.TestCase):
         fake_app.setApplicationVersion.assert_called_once_with(APP_VERSION)
         fake_app.setOrganizationName.assert_called_once_with(SETTINGS_ORGANIZATION)
 
+    def test_startup_applies_storage_settings_before_creating_window(self) -> None:
+        from todo_app import app as app_module
+        from todo_app.storage import StorageOptions
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        settings = QSettings(
+            os.path.join(temp_dir.name, "settings.ini"), QSettings.Format.IniFormat
+        )
+        settings.setValue("storage/backend", "sqlite")
+        settings.setValue("storage/dataFormat", "gzip")
+        settings.setValue("storage/journalEnabled", True)
+        settings.setValue("storage/archiveAfterDays", 7)
+        settings.sync()
+        fake_app = MagicMock()
+        fake_app.exec.return_value = 0
+        app_class = MagicMock()
+        app_class.instance.return_value = fake_app
+        events: list[object] = []
+
+        with (
+            patch.object(app_module, "QApplication", app_class),
+            patch.object(app_module, "QSettings", return_value=settings),
+            patch.object(app_module, "apply_application_font"),
+            patch.object(app_module, "get_icon"),
+            patch.object(app_module, "configure_storage", side_effect=events.append),
+            patch.object(
+                app_module,
+                "ModernTodoAppWindow",
+                side_effect=lambda: events.append("window") or MagicMock(),
+            ),
+            self.assertRaises(SystemExit),
+        ):
+            app_module.run()
+
+        self.assertEqual(
+            events,
+            [
+                StorageOptions(
+                    backend="sqlite",
+                    data_format="gzip",
+                    journal_enabled=True,
+                    archive_after_days=7.0,
+                ),
+                "window",
+            ],
+        )
+
+    def test_invalid_storage_settings_fall_back_to_defaults(self) -> None:
+        from todo_app import app as app_module
+
+        settings = MagicMock()
+        settings.value.side_effect = lambda key, default=None, **_: (
+            "xml" if key == "storage/dataFormat" else default
+        )
+        with (
+            patch.object(app_module, "QSettings", return_value=settings),
+            patch.object(app_module, "configure_storage", side_effect=ValueError("格式")) as configure,
+            patch("builtins.print") as print_mock,
+        ):
+            app_module._configure_storage_from_settings()
+
+        self.assertEqual(configure.call_args.args[0].data_format, "xml")
+        print_mock.assert_called_once()
+
     def test_main_window_reads_legacy_settings_and_shows_current_identity(self) -> None:
         legacy_geometry = QByteArray(b"legacy-geometry")
         legacy_window_state = QByteArray(b"legacy-window-state")
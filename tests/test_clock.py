@@ -0,0 +1,98 @@
+"""全局时钟服务的边界对齐、唤醒合并与暂停测试。"""
+from __future__ import annotations
+
+import os
+import unittest
+
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, Qt  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from todo_app.clock import (  # noqa: E402
+    MINUTE_PRECISION_MS,
+    SECOND_PRECISION_MS,
+    ClockService,
+)
+
+
+class ClockServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self.now_ms = 59_250
+        self.service = ClockService(lambda: self.now_ms)
+
+    def _wake_at(self, now_ms: int) -> None:
+        self.now_ms = now_ms
+        self.service._timer.timeout.emit()
+
+    def test_subscribers_share_wakeups_aligned_to_wall_clock_boundaries(self) -> None:
+        fired: list[tuple[str, int]] = []
+        seconds = self.service.subscribe(SECOND_PRECISION_MS)
+        minutes = self.service.subscribe(MINUTE_PRECISION_MS)
+        seconds.timeout.connect(lambda: fired.append(("秒", self.now_ms)))
+        minutes.timeout.connect(lambda: fired.append(("分", self.now_ms)))
+        self.addCleanup(seconds.stop)
+        self.addCleanup(minutes.stop)
+        seconds.start()
+        minutes.start()
+
+        # 下一个整秒在 750ms 后，分钟订阅与秒订阅都落在 60s 边界。
+        self.assertTrue(self.service.is_running())
+        self.assertEqual(self.service._timer.timerType(), Qt.TimerType.CoarseTimer)
+        self.assertGreaterEqual(self.service._timer.interval(), 750)
+        self.assertLess(self.service._timer.interval(), 1000)
+
+        self._wake_at(59_990)
+        self.assertEqual(fired, [])
+        self._wake_at(60_040)
+        self._wake_at(61_030)
+
+        self.assertEqual(fired, [("秒", 60_040), ("分", 60_040), ("秒", 61_030)])
+        self.assertEqual(self.service.wakeup_count(), 3)
+
+        seconds.stop()
+        # 只剩分钟订阅时改用极粗粒度计时器，且不会在下一个整分之前触发。
+        self.assertEqual(self.service._timer.timerType(), Qt.TimerType.VeryCoarseTimer)
+        self.assertGreaterEqual(self.service._timer.interval(), 120_000 - 61_030)
+
+    def test_service_stops_when_subscriptions_stop_or_owner_is_deleted(self) -> None:
+        owner = QObject()
+        owned = self.service.subscribe(SECOND_PRECISION_MS, owner)
+        standalone = self.service.subscribe(MINUTE_PRECISION_MS)
+        owned.start()
+        standalone.start()
+        self.assertEqual(self.service.active_subscription_count(), 2)
+
+        standalone.stop()
+        self.assertFalse(standalone.isActive())
+        self.assertTrue(self.service.is_running())
+
+        owner.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        self.assertEqual(self.service.active_subscription_count(), 0)
+        # 订阅随所有者析构时，服务在下一次唤醒后停下。
+        self._wake_at(60_030)
+
+        self.assertFalse(self.service.is_running())
+
+    def test_clock_moving_back_realigns_pending_boundaries(self) -> None:
+        fired: list[int] = []
+        minutes = self.service.subscribe(MINUTE_PRECISION_MS)
+        minutes.timeout.connect(lambda: fired.append(self.now_ms))
+        self.addCleanup(minutes.stop)
+        minutes.start()
+
+        self._wake_at(3 * MINUTE_PRECISION_MS + 10)
+        self._wake_at(MINUTE_PRECISION_MS + 10)
+        self._wake_at(2 * MINUTE_PRECISION_MS + 10)
+
+        self.assertEqual(fired, [3 * MINUTE_PRECISION_MS + 10, 2 * MINUTE_PRECISION_MS + 10])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""列式待办快照编解码测试，不需要 QApplication。"""
+from __future__ import annotations
+
+import unittest
+
+from todo_app.columnar import (
+    NULL_VALUE,
+    OVERRIDDEN_VALUE,
+    ColumnarSnapshot,
+    encode_columnar_snapshot,
+    timestamp_to_us,
+)
+
+
+def _todo(todo_id: int, **overrides: object) -> dict[str, object]:
+    todo: dict[str, object] = {
+        "id": todo_id,
+        "text": f"任务 {todo_id} ✅",
+        "createdAt": "2026-07-31T00:00:00.123456+00:00",
+        "completed": todo_id % 2 == 0,
+        "priority": ("高", "中", "低")[todo_id % 3],
+        "dueDate": None,
+        "reminderOffset": 900,
+        "snoozeUntil": None,
+        "lastNotifiedAt": None,
+        "notifiedForReminder": False,
+        "notifiedForDue": False,
+    }
+    todo.update(overrides)
+    return todo
+
+
+class ColumnarSnapshotTest(unittest.TestCase):
+    def test_records_round_trip_through_columns(self) -> None:
+        todos = [_todo(todo_id) for todo_id in range(1, 20)]
+        todos[4]["dueDate"] = "2026-08-02T09:00:00+00:00"
+
+        snapshot = ColumnarSnapshot(encode_columnar_snapshot(todos, 1))
+
+        self.assertEqual(snapshot.schema_version, 1)
+        self.assertEqual(snapshot.count, len(todos))
+        self.assertEqual(snapshot.records(), todos)
+        self.assertEqual(snapshot.record(4), todos[4])
+        self.assertEqual(snapshot.int64("dueDate")[4], timestamp_to_us(todos[4]["dueDate"]))
+        self.assertEqual(snapshot.int64("dueDate")[0], NULL_VALUE)
+        self.assertEqual(ColumnarSnapshot(encode_columnar_snapshot([], 1)).records(), [])
+
+    def test_values_that_columns_cannot_hold_are_kept_per_row(self) -> None:
+        todos = [
+            _todo(1, dueDate="2026-08-02T09:00:00Z", extra={"标签": ["工作"]}),
+            _todo(2, completed=None, priority="紧急", text=5),
+            _todo(3, id="abc", reminderOffset=-(2**63)),
+            _todo(4),
+        ]
+        del todos[3]["snoozeUntil"]
+        del todos[3]["priority"]
+
+        snapshot = ColumnarSnapshot(encode_columnar_snapshot(todos, 1))
+
+        self.assertEqual(snapshot.records(), todos)
+        self.assertEqual([snapshot.record(row) for row in range(4)], todos)
+        self.assertEqual(snapshot.int64("dueDate")[0], OVERRIDDEN_VALUE)
+        self.assertEqual(snapshot.values("priority"), ["中", "紧急", "高", None])
+        self.assertEqual(snapshot.values("extra"), [{"标签": ["工作"]}, None, None, None])
+
+    def test_single_column_is_read_without_decoding_other_fields(self) -> None:
+        todos = [_todo(todo_id, text="x" * todo_id) for todo_id in range(1, 12)]
+        content = bytearray(encode_columnar_snapshot(todos, 1))
+        # 破坏正文区：只读 completed/dueDate 列不应受影响。
+        text_start = content.index(b"x" * 11)
+        content[text_start : text_start + 11] = b"\xff" * 11
+
+        snapshot = ColumnarSnapshot(bytes(content))
+
+        self.assertEqual(
+            [snapshot.flag("completed", row) for row in range(snapshot.count)],
+            [todo["completed"] for todo in todos],
+        )
+        self.assertEqual(snapshot.values("dueDate"), [None] * len(todos))
+        with self.assertRaises(UnicodeDecodeError):
+            snapshot.records()
+
+    def test_snapshot_without_optional_column_reads_rows_without_that_field(self) -> None:
+        todos = [_todo(1), _todo(2, completedAt="2026-08-01T00:00:00+00:00")]
+        content = encode_columnar_snapshot(todos, 1)
+        entry_start = content.index(b'"completedAt":[')
+        entry_end = content.index(b"],", entry_start) + 2
+        # 用空白覆盖列目录项，模拟新增该列之前写出的快照。
+        content = content[:entry_start] + b" " * (entry_end - entry_start) + content[entry_end:]
+
+        snapshot = ColumnarSnapshot(content)
+
+        self.assertEqual(snapshot.records(), [_todo(1), _todo(2)])
+        self.assertEqual(snapshot.values("completedAt"), [None, None])
+
+    def test_malformed_snapshot_is_rejected(self) -> None:
+        content = encode_columnar_snapshot([_todo(1)], 1)
+        for damaged in (content[:-8], b"TODOCOL\x01" + b"\x00" * 8, b"[]"):
+            with self.subTest(length=len(damaged)):
+                with self.assertRaises(ValueError):
+                    ColumnarSnapshot(damaged)
+
+
+if __name__ == "__main__":
+    unittest.main()
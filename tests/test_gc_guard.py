@@ -0,0 +1,50 @@
+"""GUI 线程循环回收守卫的计数与释放测试。"""
+from __future__ import annotations
+
+import gc
+import os
+import unittest
+
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from todo_app.gc_guard import GuiThreadGarbageCollector  # noqa: E402
+
+
+class GuiThreadGarbageCollectorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_automatic_collection_stays_off_until_last_guard_stops(self) -> None:
+        first = GuiThreadGarbageCollector()
+        second = GuiThreadGarbageCollector()
+        self.addCleanup(first.stop)
+        self.addCleanup(second.stop)
+
+        self.assertFalse(gc.isenabled())
+        first.stop()
+        self.assertFalse(gc.isenabled())
+        second.stop()
+        second.stop()
+        self.assertTrue(gc.isenabled())
+
+    def test_guard_is_released_when_its_owner_is_deleted_without_stop(self) -> None:
+        owner = QObject()
+        guard = GuiThreadGarbageCollector(parent=owner)
+        self.assertFalse(gc.isenabled())
+
+        owner.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+        self.assertTrue(gc.isenabled())
+        # 析构后再调用 stop 不得重复释放或触碰已删除的计时器。
+        del guard
+        self.assertTrue(gc.isenabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
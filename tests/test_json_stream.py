@@ -0,0 +1,95 @@
+"""待办 JSON 文档增量解析测试，不需要 QApplication。"""
+from __future__ import annotations
+
+import io
+import json
+import unittest
+
+from todo_app.json_stream import TodoDocumentStream
+
+
+def _parse(raw: bytes, chunk_size: int) -> tuple[list[object], dict[str, object], bool]:
+    stream = TodoDocumentStream(io.BytesIO(raw), chunk_size=chunk_size)
+    stream.open()
+    items = list(stream.items())
+    return items, stream.header, stream.is_list
+
+
+class _RecordingReader(io.BytesIO):
+    def __init__(self, raw: bytes, read_sizes: list[int]):
+        super().__init__(raw)
+        self._read_sizes = read_sizes
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        self._read_sizes.append(len(chunk))
+        return chunk
+
+
+class TodoDocumentStreamTest(unittest.TestCase):
+    def test_items_match_full_parse_across_chunk_boundaries(self) -> None:
+        todos = [
+            {"id": 1, "text": "中文与 emoji 🎯 跨越读取块", "nested": {"list": [1, 2.5, None]}},
+            12345678901234567890,
+            -0.125e3,
+            "字符串 \"转义\" \\n",
+            True,
+            None,
+            [],
+            {"id": 2, "text": "x" * 300},
+        ]
+        documents = {
+            "列表": todos,
+            "文档": {"schemaVersion": 1, "todos": todos, "extra": {"a": [1]}},
+        }
+        for label, document in documents.items():
+            raw = json.dumps(document, ensure_ascii=False, indent=4).encode("utf-8")
+            for chunk_size in (1, 2, 3, 7, 64, 1 << 20):
+                with self.subTest(document=label, chunk_size=chunk_size):
+                    items, header, is_list = _parse(raw, chunk_size)
+                    self.assertEqual(items, todos)
+                    self.assertEqual(is_list, label == "列表")
+                    if not is_list:
+                        self.assertEqual(header, {"schemaVersion": 1, "extra": {"a": [1]}})
+
+    def test_header_before_todos_is_available_after_open(self) -> None:
+        raw = b'{"schemaVersion": 1, "todos": [{"id": 1}], "after": 2}'
+        stream = TodoDocumentStream(io.BytesIO(raw), chunk_size=4)
+
+        stream.open()
+        self.assertEqual(stream.header, {"schemaVersion": 1})
+        self.assertEqual(list(stream.items()), [{"id": 1}])
+        self.assertEqual(stream.header, {"schemaVersion": 1, "after": 2})
+
+    def test_reads_are_bounded_by_chunk_size_for_small_items(self) -> None:
+        todos = [{"id": index, "text": f"任务{index}"} for index in range(2000)]
+        raw = json.dumps(todos, ensure_ascii=False).encode("utf-8")
+        read_sizes: list[int] = []
+        stream = TodoDocumentStream(_RecordingReader(raw, read_sizes), chunk_size=4096)
+
+        stream.open()
+        self.assertEqual(list(stream.items()), todos)
+        self.assertLessEqual(max(read_sizes), 4096 * 2)
+        self.assertEqual(sum(read_sizes), len(raw))
+
+    def test_invalid_documents_raise_value_error(self) -> None:
+        invalid = {
+            "截断": b'[{"id": 1}, {"id": 2',
+            "数字被截断": b"[1, 2",
+            "多余内容": b"[1] [2]",
+            "缺少 todos": b'{"schemaVersion": 1}',
+            "todos 不是列表": b'{"todos": {}}',
+            "重复 todos": b'{"todos": [], "todos": []}',
+            "顶层字符串": b'"todos"',
+            "不完整的 UTF-8": b'["\xe4\xb8',
+            "空文件": b"",
+        }
+        for label, raw in invalid.items():
+            for chunk_size in (1, 1024):
+                with self.subTest(case=label, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError):
+                        _parse(raw, chunk_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,6 +21,7 @@ from todo_app.layout import (
     TaskCardLayoutInput,
     TaskDetailsWidthInput,
     calculate_task_card_layout,
+    calculate_task_card_layouts,
     calculate_task_details_width,
 )
 
@@ -79,6 +80,33 @@ class TaskCardLayoutTest(unittest.TestCase):
         self.assertEqual(layout.content_height, 75)
         self.assertEqual(layout.card_height, 101)
 
+    def test_batch_layout_uses_shared_viewport_and_memoized_results(self) -> None:
+        measurements = [
+            self._card_values(viewport_width=0, logical_line_count=count)
+            for count in (1, 3, 1)
+        ]
+
+        layouts = calculate_task_card_layouts(
+            measurements,
+            viewport_width=306,
+            list_spacing=TASK_CARD_LIST_GAP // 2,
+        )
+
+        self.assertEqual(
+            layouts,
+            [
+                calculate_task_card_layout(
+                    self._card_values(viewport_width=306, logical_line_count=count)
+                )
+                for count in (1, 3, 1)
+            ],
+        )
+        self.assertIs(layouts[0], layouts[2])
+        self.assertEqual(
+            [layout.card_height for layout in layouts],
+            [TASK_CARD_MINIMUM_HEIGHT, 101, TASK_CARD_MINIMUM_HEIGHT],
+        )
+
     def test_details_popup_width_is_capped(self) -> None:
         layout = calculate_task_details_width(
             TaskDetailsWidthInput(
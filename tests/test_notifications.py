@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+import time
 import unittest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
@@ -21,6 +22,7 @@ from PySide6.QtWidgets import (  # noqa: E402
     QToolButton,
 )
 
+from todo_app.clock import MINUTE_PRECISION_MS, SECOND_PRECISION_MS, ClockService  # noqa: E402
 from todo_app.dialogs import NotificationDialog  # noqa: E402
 from todo_app.main_window import ModernTodoAppWindow  # noqa: E402
 
@@ -303,6 +305,7 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             window.update_list_widget()
 
             window.tick_update()
+            window._save_worker.flush()
 
             self.assertEqual(len(FakeNotificationDialog.instances), 1)
             dialog = FakeNotificationDialog.instances[0]
@@ -315,9 +318,10 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
 
             fourth = make_todo(4, "任务4")
             fourth["dueDate"] = due_date
-            window.todos.append(fourth)
+            window.todos = [*window.todos, fourth]
             window.update_list_widget()
             window.tick_update()
+            window._save_worker.flush()
 
             self.assertEqual(len(FakeNotificationDialog.instances), 1)
             self.assertEqual(dialog.task_ids(), [1, 2, 3, 4])
@@ -362,14 +366,12 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             window = ModernTodoAppWindow()
             window.master_timer.stop()
             self.addCleanup(self._close_window, window)
-            cards = [
-                window.list_widget.itemWidget(window.list_widget.item(index))
-                for index in range(window.list_widget.count())
-            ]
-            self.assertEqual(len(cards), 100)
-            for card in cards:
-                card.update_text_display = MagicMock()
-                card._update_frame_background = MagicMock()
+            self.assertEqual(window.todo_model.rowCount(), 100)
+            window.list_widget.set_hovered_row(0)
+            card = window.list_widget.hovered_card()
+            card.update_text_display = MagicMock()
+            card._update_frame_background = MagicMock()
+            window.list_widget.update = MagicMock()
             window._sync_todo_card_sizes = MagicMock()
             window.update_list_widget = MagicMock()
 
@@ -380,9 +382,67 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             get_icon_mock.assert_not_called()
             window._sync_todo_card_sizes.assert_not_called()
             window.update_list_widget.assert_not_called()
-            for card in cards:
-                card.update_text_display.assert_not_called()
-                card._update_frame_background.assert_not_called()
+            window.list_widget.update.assert_not_called()
+            card.update_text_display.assert_not_called()
+            card._update_frame_background.assert_not_called()
+
+    def test_reminder_timer_waits_for_earliest_deadline_and_idle_tick_skips_checks(self) -> None:
+        now = datetime.now(timezone.utc)
+        tasks = [make_todo(todo_id, f"未来任务{todo_id}") for todo_id in range(1, 101)]
+        for offset_hours, task in enumerate(tasks, start=1):
+            task["dueDate"] = (now + timedelta(hours=offset_hours)).isoformat()
+            task["reminderOffset"] = 0
+        tasks[-1]["dueDate"] = (now + timedelta(seconds=30)).isoformat()
+
+        with (
+            patch("todo_app.main_window.load_todos", return_value=tasks),
+            patch("todo_app.main_window.save_todos") as save_mock,
+        ):
+            window = ModernTodoAppWindow()
+            window.master_timer.stop()
+            self.addCleanup(self._close_window, window)
+
+            self.assertTrue(window._reminder_timer.isActive())
+            self.assertTrue(window._reminder_timer.isSingleShot())
+            self.assertLessEqual(window._reminder_timer.remainingTime(), 30_000)
+            self.assertGreater(window._reminder_timer.remainingTime(), 25_000)
+
+            with patch.object(
+                window, "_check_for_notification", wraps=window._check_for_notification
+            ) as check_mock:
+                window.tick_update()
+            check_mock.assert_not_called()
+            save_mock.assert_not_called()
+
+            window.toggle_complete_todo(100)
+            self.assertGreater(window._reminder_timer.remainingTime(), 30 * 60 * 1000)
+
+    def test_reminder_timer_delivers_due_task_without_master_tick(self) -> None:
+        task = make_todo(1, "定时提醒")
+        task["dueDate"] = (datetime.now(timezone.utc) + timedelta(milliseconds=50)).isoformat()
+        FakeNotificationDialog.instances = []
+        with (
+            patch("todo_app.main_window.load_todos", return_value=[task]),
+            patch("todo_app.main_window.save_todos") as save_mock,
+            patch("todo_app.main_window.play_sound_effect"),
+            patch("todo_app.main_window.NotificationDialog", FakeNotificationDialog),
+        ):
+            window = ModernTodoAppWindow()
+            window.master_timer.stop()
+            window._ensure_window_visible_for_notification = MagicMock()
+            self.addCleanup(self._close_window, window)
+
+            deadline = time.monotonic() + 2
+            while not FakeNotificationDialog.instances and time.monotonic() < deadline:
+                self.app.processEvents()
+                time.sleep(0.01)
+
+            self.assertEqual(len(FakeNotificationDialog.instances), 1)
+            self.assertEqual(FakeNotificationDialog.instances[0].task_ids(), [1])
+            self.assertTrue(task["notifiedForDue"])
+            window._save_worker.flush()
+            self.assertEqual(save_mock.call_count, 1)
+            self.assertFalse(window._reminder_timer.isActive())
 
     def test_closed_notification_dialog_is_deleted_from_parent(self) -> None:
         task = make_todo(1, "关闭后释放")
@@ -481,6 +541,80 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             self.assertEqual(dialog.show_count, 2)
             self.assertTrue(dialog.visible)
 
+    def test_hidden_window_pauses_refresh_but_keeps_reminder_deadline(self) -> None:
+        task = make_todo(1, "托盘期间提醒")
+        task["dueDate"] = (datetime.now(timezone.utc) + timedelta(hours=2)).isoformat()
+        clock = ClockService()
+        with (
+            patch("todo_app.clock._CLOCK_SERVICE", clock),
+            patch("todo_app.main_window.load_todos", return_value=[task]),
+            patch("todo_app.main_window.save_todos"),
+        ):
+            window = ModernTodoAppWindow()
+            self.addCleanup(self._close_window, window)
+            dialog = NotificationDialog([(make_todo(2, "已弹出"), True)], window)
+            window._notification_dialog = dialog
+            dialog.show()
+            window.show()
+            self.app.processEvents()
+
+            window.toggle_window_visibility()
+
+            self.assertTrue(window.isHidden())
+            self.assertFalse(window.master_timer.isActive())
+            self.assertFalse(dialog._relative_time_timer.isActive())
+            self.assertTrue(window._reminder_timer.isActive())
+            # 隐藏期间不再有秒级唤醒：时钟只剩整点归档，回收检查放缓到分钟级。
+            self.assertGreaterEqual(clock.finest_interval(), MINUTE_PRECISION_MS)
+            self.assertGreaterEqual(
+                window._garbage_collector._timer.interval(), MINUTE_PRECISION_MS
+            )
+
+            with (
+                patch.object(window, "tick_update") as tick,
+                patch.object(dialog, "_refresh_relative_times") as refresh,
+            ):
+                window.toggle_window_visibility()
+
+            # 重新显示时各补一次刷新，再恢复逐秒计时。
+            tick.assert_called_once_with()
+            refresh.assert_called_once_with()
+            self.assertTrue(window.master_timer.isActive())
+            self.assertTrue(dialog._relative_time_timer.isActive())
+            self.assertEqual(clock.finest_interval(), SECOND_PRECISION_MS)
+            self.assertEqual(window._garbage_collector._timer.interval(), 1000)
+
+    def test_hidden_window_caps_reminder_timer_and_catches_up_on_show(self) -> None:
+        task = make_todo(1, "托盘期间到期")
+        task["dueDate"] = (datetime.now(timezone.utc) + timedelta(hours=2)).isoformat()
+        task["reminderOffset"] = 0
+        with (
+            patch("todo_app.main_window.load_todos", return_value=[task]),
+            patch("todo_app.main_window.save_todos"),
+        ):
+            window = ModernTodoAppWindow()
+            self.addCleanup(self._close_window, window)
+            window.show()
+            self.app.processEvents()
+            self.assertGreater(window._reminder_timer.remainingTime(), 30 * 60 * 1000)
+
+            window.toggle_window_visibility()
+
+            # 隐藏期间没有逐秒刷新兜底，截止计时器最多一分钟后重新校正。
+            self.assertTrue(window._reminder_timer.isActive())
+            self.assertLessEqual(window._reminder_timer.remainingTime(), 60 * 1000)
+
+            # 模拟隐藏期间系统休眠越过截止时刻：重新显示时立即补发提醒。
+            window._store.update(
+                1, {"dueDate": (datetime.now(timezone.utc) - timedelta(minutes=5)).isoformat()}
+            )
+            window._reschedule_reminders([window._store.get(1)])
+            with patch.object(window, "_show_notification_batch") as show_batch:
+                window.toggle_window_visibility()
+
+            show_batch.assert_called_once()
+            self.assertEqual(show_batch.call_args.args[0][0][0]["id"], 1)
+
     def test_requested_actions_update_only_requested_tasks_once(self) -> None:
         tasks = [make_todo(todo_id, f"任务{todo_id}") for todo_id in (1, 2, 3)]
         FakeNotificationDialog.instances = []
@@ -498,6 +632,7 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             window._notification_dialog = dialog
 
             window._handle_notification_complete([1, 2])
+            window._save_worker.flush()
 
             self.assertTrue(tasks[0]["completed"])
             self.assertTrue(tasks[1]["completed"])
@@ -528,6 +663,7 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             window._notification_dialog = dialog
 
             window._handle_notification_snooze([2], timedelta(minutes=15))
+            window._save_worker.flush()
 
             self.assertEqual(first, first_before)
             self.assertIsNotNone(second["snoozeUntil"])
@@ -552,8 +688,10 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             window._notification_dialog = dialog
 
             window._handle_notification_snooze([1], timedelta(minutes=15))
+            window._save_worker.flush()
             first_after_snooze = first.copy()
             window._handle_notification_snooze([2], timedelta(hours=1))
+            window._save_worker.flush()
 
             self.assertEqual(first, first_after_snooze)
             first_until = datetime.fromisoformat(first["snoozeUntil"])
@@ -589,6 +727,7 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             window._notification_dialog = dialog
 
             window._handle_notification_ignore([1])
+            window._save_worker.flush()
 
             self.assertIsNone(task["dueDate"])
             self.assertIsNone(task["snoozeUntil"])
@@ -603,6 +742,7 @@ class NotificationBatchIntegrationTest(unittest.TestCase):
             self.assertEqual(window.update_list_widget.call_count, 1)
 
             window.tick_update()
+            window._save_worker.flush()
 
             window._show_notification_batch.assert_not_called()
             self.assertEqual(save_mock.call_count, 1)
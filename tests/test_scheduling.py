@@ -1,10 +1,13 @@
 """提醒与编辑调度规则测试。"""
 from __future__ import annotations
 
+import os
+import time
 import unittest
 import importlib.util
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 
 SCHEDULING_PATH = Path(__file__).resolve().parents[1] / "todo_app" / "scheduling.py"
@@ -16,6 +19,13 @@ SPEC.loader.exec_module(scheduling)
 
 build_edit_update_fields = scheduling.build_edit_update_fields
 build_snooze_update_fields = scheduling.build_snooze_update_fields
+claim_notification = scheduling.claim_notification
+next_reminder_deadline = scheduling.next_reminder_deadline
+release_expired_snooze = scheduling.release_expired_snooze
+DeadlineQueue = scheduling.DeadlineQueue
+timestamp_cache_stats = scheduling.timestamp_cache_stats
+timestamp_datetime = scheduling.timestamp_datetime
+timestamp_us = scheduling.timestamp_us
 
 
 class SchedulingRulesTest(unittest.TestCase):
@@ -158,5 +168,158 @@ class SchedulingRulesTest(unittest.TestCase):
         self.assertIsNone(updated["lastNotifiedAt"])
 
 
+class ReminderDeadlineTest(unittest.TestCase):
+    def test_deadline_is_earliest_pending_reminder_or_due_time(self) -> None:
+        due = datetime(2026, 5, 10, 13, 0, tzinfo=timezone.utc)
+        todo = {
+            "dueDate": due.isoformat(),
+            "reminderOffset": 900,
+            "notifiedForReminder": False,
+            "notifiedForDue": False,
+        }
+
+        self.assertEqual(next_reminder_deadline(todo), due - timedelta(minutes=15))
+        todo["notifiedForReminder"] = True
+        self.assertEqual(next_reminder_deadline(todo), due)
+        todo["notifiedForDue"] = True
+        self.assertIsNone(next_reminder_deadline(todo))
+        todo.update({"notifiedForDue": False, "completed": True})
+        self.assertIsNone(next_reminder_deadline(todo))
+        self.assertIsNone(next_reminder_deadline({"dueDate": "无效"}))
+
+    def test_snoozed_task_is_rechecked_when_snooze_expires(self) -> None:
+        snooze_until = datetime(2026, 5, 10, 12, 45, tzinfo=timezone.utc)
+        todo = {
+            "dueDate": snooze_until.isoformat(),
+            "reminderOffset": 0,
+            "snoozeUntil": snooze_until.isoformat(),
+            "notifiedForReminder": False,
+            "notifiedForDue": False,
+        }
+
+        self.assertEqual(next_reminder_deadline(todo), snooze_until)
+        self.assertIsNone(claim_notification(todo, snooze_until - timedelta(seconds=1)))
+        self.assertTrue(release_expired_snooze(todo, snooze_until))
+        self.assertTrue(claim_notification(todo, snooze_until))
+        self.assertTrue(todo["notifiedForDue"])
+        self.assertIsNone(next_reminder_deadline(todo))
+
+    def test_claim_matches_reminder_window_before_due_time(self) -> None:
+        due = datetime(2026, 5, 10, 13, 0, tzinfo=timezone.utc)
+        todo = {"dueDate": due.isoformat(), "reminderOffset": 600}
+
+        self.assertIsNone(claim_notification(todo, due - timedelta(minutes=11)))
+        self.assertFalse(claim_notification(todo, due - timedelta(minutes=10)))
+        self.assertIsNone(claim_notification(todo, due - timedelta(minutes=5)))
+        self.assertTrue(claim_notification(todo, due))
+        self.assertIsNone(claim_notification(todo, due + timedelta(minutes=1)))
+
+
+class DeadlineQueueTest(unittest.TestCase):
+    def test_pop_due_returns_only_latest_deadlines_in_order(self) -> None:
+        queue = DeadlineQueue()
+        queue.schedule(1, 300, "a")
+        queue.schedule(2, 100, "b")
+        queue.schedule(3, 200, "c")
+        queue.schedule(1, 50, "a2")
+        queue.schedule(2, None, "b")
+
+        self.assertEqual(len(queue), 2)
+        self.assertNotIn(2, queue)
+        self.assertEqual(queue.next_deadline(), 50)
+        self.assertEqual(queue.pop_due(250), ["a2", "c"])
+        self.assertIsNone(queue.next_deadline())
+        self.assertEqual(queue.pop_due(10_000), [])
+
+    def test_repeated_rescheduling_keeps_heap_bounded(self) -> None:
+        queue = DeadlineQueue()
+        for deadline in range(10_000):
+            queue.schedule("task", deadline, deadline)
+
+        self.assertLessEqual(len(queue._heap), 64)
+        self.assertEqual(queue.pop_due(10_000), [9_999])
+
+
+
+class TimestampCacheTest(unittest.TestCase):
+    def test_each_raw_string_is_parsed_once_until_the_field_changes(self) -> None:
+        scheduling.clear_timestamp_cache()
+        due = datetime(2026, 8, 1, 9, 30, 0, 123456, tzinfo=timezone.utc)
+        todo = {"id": 7, "dueDate": due.isoformat(), "createdAt": "2026-07-31T00:00:00Z"}
+        parses = timestamp_cache_stats().parses
+
+        for _ in range(5):
+            self.assertEqual(timestamp_datetime(todo, "dueDate"), due)
+            claim_notification(todo, due - timedelta(days=1))
+        self.assertEqual(
+            timestamp_us(todo, "createdAt"),
+            int(datetime(2026, 7, 31, tzinfo=timezone.utc).timestamp()) * 1_000_000,
+        )
+        # 行副本与原任务的字符串相同，共用一次解析。
+        self.assertEqual(timestamp_datetime(dict(todo), "dueDate"), due)
+        self.assertEqual(timestamp_cache_stats(), (parses + 2, 2))
+
+        todo["dueDate"] = (due + timedelta(hours=1)).isoformat()
+        self.assertEqual(timestamp_datetime(todo, "dueDate"), due + timedelta(hours=1))
+        todo["dueDate"] = "无效时间"
+        self.assertIsNone(timestamp_us(todo, "dueDate"))
+        self.assertIsNone(timestamp_us(todo, "dueDate"))
+        self.assertIsNone(timestamp_datetime({"id": 7}, "dueDate"))
+        self.assertIsNone(timestamp_datetime({"dueDate": ["2026-08-01"]}, "dueDate"))
+        self.assertEqual(timestamp_cache_stats().parses, parses + 4)
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "需要可切换进程时区的平台")
+    def test_naive_strings_are_cached_separately_per_reading(self) -> None:
+        original_tz = os.environ.get("TZ")
+
+        def restore_tz() -> None:
+            if original_tz is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = original_tz
+            time.tzset()
+
+        os.environ["TZ"] = "Asia/Shanghai"
+        time.tzset()
+        self.addCleanup(restore_tz)
+        scheduling.clear_timestamp_cache()
+        todo = {"dueDate": "2026-08-01T09:30:00", "createdAt": "2026-08-01T09:30:00+08:00"}
+        parses = timestamp_cache_stats().parses
+
+        for _ in range(3):
+            self.assertEqual(
+                timestamp_datetime(todo, "dueDate"),
+                datetime(2026, 8, 1, 9, 30, tzinfo=timezone.utc),
+            )
+            self.assertEqual(
+                timestamp_datetime(todo, "dueDate", naive_local=True),
+                datetime(2026, 8, 1, 1, 30, tzinfo=timezone.utc),
+            )
+        # 带时区的值两种解读结果相同，但仍各自缓存一次。
+        self.assertEqual(
+            timestamp_us(todo, "createdAt"),
+            timestamp_us(todo, "createdAt", naive_local=True),
+        )
+        self.assertEqual(timestamp_cache_stats(), (parses + 4, 4))
+
+    def test_full_cache_evicts_least_recently_used_strings_only(self) -> None:
+        scheduling.clear_timestamp_cache()
+        self.addCleanup(scheduling.clear_timestamp_cache)
+        hot = {"dueDate": "2026-08-01T09:30:00+00:00"}
+        capacity = 8
+
+        with patch.object(scheduling, "_TIMESTAMP_CACHE_CAPACITY", capacity):
+            timestamp_us(hot, "dueDate")
+            parses = timestamp_cache_stats().parses
+            for minute in range(capacity * 3):
+                timestamp_us({"dueDate": f"2026-08-02T00:{minute:02d}:00+00:00"}, "dueDate")
+                timestamp_us(hot, "dueDate")
+                timestamp_us({"dueDate": None}, "dueDate")
+
+            # 每轮都用到的值始终留在缓存中，只有冷门值被逐个淘汰。
+            self.assertEqual(timestamp_cache_stats(), (parses + capacity * 3, capacity))
+            timestamp_us({"dueDate": "2026-08-02T00:00:00+00:00"}, "dueDate")
+            self.assertEqual(timestamp_cache_stats().parses, parses + capacity * 3 + 1)
+
 if __name__ == "__main__":
     unittest.main()
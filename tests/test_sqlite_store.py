@@ -0,0 +1,233 @@
+"""SQLite 存储后端、一次性迁移与筛选排序下推测试。"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from todo_app import storage
+from todo_app.main_window import ModernTodoAppWindow
+from todo_app.scheduling import clear_timestamp_cache
+from todo_app.sqlite_store import SqliteTodoStore
+
+
+FILTER_OPTIONS = ["全部", "未完成", "已完成", "今天到期", "高优先级"]
+SORT_OPTIONS = [
+    "创建时间 (新->旧)",
+    "创建时间 (旧->新)",
+    "截止日期 (近->远)",
+    "截止日期 (远->近)",
+    "优先级 (高->低)",
+]
+
+
+def _todo(todo_id: int, text: str, **fields: object) -> dict[str, object]:
+    todo: dict[str, object] = {
+        "id": todo_id,
+        "text": text,
+        "createdAt": "2026-07-31T00:00:00+00:00",
+        "completed": False,
+        "priority": "中",
+        "dueDate": None,
+        "reminderOffset": 0,
+        "snoozeUntil": None,
+        "lastNotifiedAt": None,
+        "notifiedForReminder": False,
+        "notifiedForDue": False,
+    }
+    todo.update(fields)
+    return todo
+
+
+class SqliteStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_file = Path(self.temp_dir.name) / "todos.json"
+        self.database_file = Path(self.temp_dir.name) / "todos.sqlite3"
+        self.data_file_patcher = patch.object(storage, "DATA_FILE", self.data_file)
+        self.data_file_patcher.start()
+        storage.configure_storage(storage.StorageOptions(backend="sqlite"))
+
+    def tearDown(self) -> None:
+        storage.configure_storage(storage.StorageOptions())
+        self.data_file_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_first_load_migrates_json_once_and_keeps_source_file(self) -> None:
+        legacy = [{"id": "7", "text": "旧格式"}, _todo(8, "完整任务")]
+        self.data_file.write_text(json.dumps(legacy, ensure_ascii=False), encoding="utf-8")
+
+        loaded = storage.load_todos()
+
+        self.assertEqual([todo["id"] for todo in loaded], [7, 8])
+        self.assertEqual(loaded[0]["priority"], "中")
+        self.assertTrue(self.database_file.exists())
+        self.assertEqual(json.loads(self.data_file.read_text(encoding="utf-8")), legacy)
+
+        loaded[0]["completed"] = True
+        storage.save_todos(loaded)
+        storage.configure_storage(storage.StorageOptions(backend="sqlite"))
+        self.assertEqual(storage.load_todos(), loaded)
+
+    def test_save_writes_only_changed_rows(self) -> None:
+        store = SqliteTodoStore(self.database_file)
+        self.addCleanup(store.close)
+        todos = [_todo(todo_id, f"任务{todo_id}") for todo_id in range(100)]
+        self.assertEqual(store.save(todos), 100)
+
+        todos[40]["completed"] = True
+        self.assertEqual(store.save(todos), 1)
+        del todos[10]
+        todos.append(_todo(500, "末尾追加"))
+        self.assertEqual(store.save(todos), 2)
+        self.assertEqual(store.save(todos), 0)
+
+        reopened = SqliteTodoStore(self.database_file)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.load(), todos)
+
+    def test_pushdown_matches_in_memory_filter_and_sort(self) -> None:
+        rng = random.Random(20261017)
+        now = datetime.now(timezone.utc)
+        todos = []
+        for todo_id in range(120):
+            due_choice = rng.random()
+            if due_choice < 0.2:
+                due_date = None
+            elif due_choice < 0.25:
+                due_date = "无效时间"
+            else:
+                due_date = (now + timedelta(hours=rng.randint(-48, 48))).isoformat()
+            todos.append(
+                _todo(
+                    todo_id,
+                    f"任务{todo_id}",
+                    createdAt=(now - timedelta(minutes=rng.randint(0, 30))).isoformat(),
+                    completed=rng.random() < 0.3,
+                    priority=rng.choice(["高", "中", "低"]),
+                    dueDate=due_date,
+                )
+            )
+        storage.save_todos(todos)
+
+        for filter_name in FILTER_OPTIONS:
+            for sort_name in SORT_OPTIONS:
+                with self.subTest(filter_name=filter_name, sort_name=sort_name):
+                    window = SimpleNamespace(
+                        filter_combo=MagicMock(currentText=MagicMock(return_value=filter_name)),
+                        sort_combo=MagicMock(currentText=MagicMock(return_value=sort_name)),
+                    )
+                    expected = ModernTodoAppWindow._sort_todos(
+                        window, ModernTodoAppWindow._filter_todos(window, list(todos))
+                    )
+                    self.assertEqual(
+                        storage.query_todo_ids(filter_name, sort_name, todos),
+                        [todo["id"] for todo in expected],
+                    )
+
+    def _use_time_zone(self, name: str) -> None:
+        original_tz = os.environ.get("TZ")
+
+        def restore_tz() -> None:
+            if original_tz is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = original_tz
+            time.tzset()
+            # 缓存中按本地时间解读的结果随时区失效。
+            clear_timestamp_cache()
+
+        os.environ["TZ"] = name
+        time.tzset()
+        self.addCleanup(restore_tz)
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "需要可切换进程时区的平台")
+    def test_pushdown_reads_naive_timestamps_as_local_time_like_memory_path(self) -> None:
+        self._use_time_zone("Asia/Shanghai")
+        local_now = datetime.now().replace(microsecond=0)
+        todos = []
+        for todo_id, hours in enumerate(range(-30, 31, 3)):
+            due = local_now + timedelta(hours=hours)
+            # 交替使用不带时区与带时区的写法，两者在本地解读下应可互相比较。
+            due_text = due.isoformat() if todo_id % 2 else due.astimezone().isoformat()
+            todos.append(
+                _todo(
+                    todo_id,
+                    f"任务{todo_id}",
+                    createdAt=(local_now - timedelta(hours=hours)).isoformat(),
+                    dueDate=due_text,
+                    priority="高" if todo_id % 3 == 0 else "中",
+                )
+            )
+        storage.save_todos(todos)
+
+        for filter_name in ("全部", "今天到期"):
+            for sort_name in SORT_OPTIONS:
+                with self.subTest(filter_name=filter_name, sort_name=sort_name):
+                    window = SimpleNamespace(
+                        filter_combo=MagicMock(currentText=MagicMock(return_value=filter_name)),
+                        sort_combo=MagicMock(currentText=MagicMock(return_value=sort_name)),
+                    )
+                    expected = ModernTodoAppWindow._sort_todos(
+                        window, ModernTodoAppWindow._filter_todos(window, list(todos))
+                    )
+                    self.assertEqual(
+                        storage.query_todo_ids(filter_name, sort_name, todos),
+                        [todo["id"] for todo in expected],
+                    )
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "需要可切换进程时区的平台")
+    def test_older_database_recomputes_naive_due_columns_on_open(self) -> None:
+        self._use_time_zone("Asia/Shanghai")
+        store = SqliteTodoStore(self.database_file)
+        store.save([_todo(1, "本地时间", dueDate="2026-08-06T20:00:00")])
+        connection = store._connect()
+        with connection:
+            # 模拟版本 1 按 UTC 写入的派生列。
+            connection.execute("UPDATE todos SET due_date_us = 0")
+            connection.execute("UPDATE meta SET value = '1' WHERE key = 'schemaVersion'")
+        store.close()
+
+        reopened = SqliteTodoStore(self.database_file)
+        self.addCleanup(reopened.close)
+        today = datetime(2026, 8, 6).date()
+        self.assertEqual(reopened.query_ids("今天到期", SORT_OPTIONS[0], today), [1])
+
+    def test_pushdown_is_disabled_for_unsaved_or_failed_saves(self) -> None:
+        todos = [_todo(1, "已保存")]
+        self.assertTrue(storage.save_todos(todos))
+
+        self.assertEqual(storage.query_todo_ids("全部", SORT_OPTIONS[0], todos), [1])
+        todos.append(_todo(2, "未保存"))
+        self.assertIsNone(storage.query_todo_ids("全部", SORT_OPTIONS[0], todos))
+
+        todos.append(_todo(2, "重复 ID"))
+        with self.assertLogs("todo_app.storage", level="ERROR"):
+            self.assertFalse(storage.save_todos(todos))
+        self.assertIsNone(storage.query_todo_ids("全部", SORT_OPTIONS[0], todos[:1]))
+
+    def test_unreadable_database_falls_back_to_json_and_refuses_saves(self) -> None:
+        self.data_file.write_text(
+            json.dumps([_todo(1, "JSON 数据")], ensure_ascii=False), encoding="utf-8"
+        )
+        damaged_content = b"not a sqlite database" * 8
+        self.database_file.write_bytes(damaged_content)
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            loaded = storage.load_todos()
+        self.assertEqual(loaded, [_todo(1, "JSON 数据")])
+
+        with self.assertLogs("todo_app.storage", level="ERROR"):
+            storage.save_todos(loaded)
+        self.assertEqual(self.database_file.read_bytes(), damaged_content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 """待办数据原子写入与损坏恢复测试。"""
 from __future__ import annotations
 
+import gzip
 import json
 import os
 import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import patch
 
@@ -27,6 +29,12 @@ def _todo(todo_id: int, text: str) -> dict[str, object]:
     }
 
 
+def _read_saved_todos(path: Path) -> list[object]:
+    document = json.loads(path.read_text(encoding="utf-8"))
+    assert document["schemaVersion"] == storage.DATA_SCHEMA_VERSION
+    return document["todos"]
+
+
 class StorageTest(unittest.TestCase):
     def setUp(self) -> None:
         self.temp_dir = tempfile.TemporaryDirectory()
@@ -53,7 +61,7 @@ class StorageTest(unittest.TestCase):
 
         storage.save_todos(todos)
 
-        self.assertEqual(json.loads(self.data_file.read_text(encoding="utf-8")), todos)
+        self.assertEqual(_read_saved_todos(self.data_file), todos)
         self.assertFalse(self.backup_file.exists())
         self.assertEqual(self._temp_files(), [])
 
@@ -71,7 +79,7 @@ class StorageTest(unittest.TestCase):
 
         storage.save_todos(replacement)
 
-        self.assertEqual(json.loads(self.data_file.read_text(encoding="utf-8")), replacement)
+        self.assertEqual(_read_saved_todos(self.data_file), replacement)
         self.assertEqual(json.loads(self.backup_file.read_text(encoding="utf-8")), original)
         self.assertEqual(self._temp_files(), [])
 
@@ -162,6 +170,409 @@ class StorageTest(unittest.TestCase):
         self.assertFalse(self.backup_file.exists())
         self.assertEqual(self._temp_files(), [])
 
+    def test_repeated_saves_skip_reparsing_main_file_written_by_storage(self) -> None:
+        first = [_todo(1, "第一次")]
+        storage.save_todos(first)
+        first_content = self.data_file.read_bytes()
+
+        with patch.object(
+            storage, "_validate_todo_document", wraps=storage._validate_todo_document
+        ) as decode_mock:
+            storage.save_todos([_todo(1, "第二次")])
+
+        decode_mock.assert_not_called()
+        self.assertEqual(self.backup_file.read_bytes(), first_content)
+
+    def test_external_rewrite_with_same_stat_is_still_validated(self) -> None:
+        storage.save_todos([_todo(1, "原始内容")])
+        original_stat = self.data_file.stat()
+        damaged_content = b"[" + b" " * (original_stat.st_size - 1)
+        self.data_file.write_bytes(damaged_content)
+        os.utime(self.data_file, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+
+        with self.assertLogs("todo_app.storage", level="ERROR"):
+            self.assertFalse(storage.save_todos([_todo(1, "不会覆盖")]))
+
+        self.assertEqual(self.data_file.read_bytes(), damaged_content)
+
+    def test_legacy_list_migrates_in_one_pass_and_is_stamped_on_save(self) -> None:
+        legacy = [{"text": f"无 ID 任务{index}"} for index in range(2000)]
+        legacy.insert(1000, _todo(5, "已有 ID"))
+        self._write_json(self.data_file, legacy)
+
+        loaded = storage.load_todos()
+
+        ids = [todo["id"] for todo in loaded]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids[1000], 5)
+        self.assertEqual(ids[1001:], list(range(ids[1001], ids[1001] + 1000)))
+        self.assertEqual(
+            storage.get_last_migration_stats(),
+            storage.MigrationStats(
+                schema_version=0,
+                total=2001,
+                unchanged=1,
+                migrated=2000,
+                regenerated_ids=2000,
+            ),
+        )
+
+        storage.save_todos(loaded)
+        self.assertEqual(_read_saved_todos(self.data_file), loaded)
+        with patch.object(
+            storage,
+            "_migrate_and_validate_todo_item",
+            wraps=storage._migrate_and_validate_todo_item,
+        ) as migrate_mock:
+            self.assertEqual(storage.load_todos(), loaded)
+
+        migrate_mock.assert_not_called()
+        self.assertFalse(storage.get_last_migration_stats().changed)
+
+    def test_current_schema_still_migrates_items_that_fail_type_check(self) -> None:
+        incomplete = {"id": "7", "text": "缺少字段"}
+        self._write_json(
+            self.data_file,
+            {"schemaVersion": storage.DATA_SCHEMA_VERSION, "todos": [_todo(1, "完整"), incomplete]},
+        )
+
+        loaded = storage.load_todos()
+
+        self.assertEqual(loaded[0], _todo(1, "完整"))
+        self.assertEqual(loaded[1]["id"], 7)
+        self.assertFalse(loaded[1]["completed"])
+        stats = storage.get_last_migration_stats()
+        self.assertEqual((stats.unchanged, stats.migrated), (1, 1))
+
+    def test_load_streams_main_file_and_skips_non_dict_items(self) -> None:
+        self._write_json(
+            self.data_file,
+            {"schemaVersion": storage.DATA_SCHEMA_VERSION, "todos": [_todo(1, "保留"), "坏项", 3]},
+        )
+
+        with (
+            patch.object(Path, "read_bytes", side_effect=AssertionError("不应整文件读取")),
+            self.assertLogs("todo_app.storage", level="WARNING") as logs,
+        ):
+            loaded = storage.load_todos()
+
+        self.assertEqual(loaded, [_todo(1, "保留")])
+        self.assertEqual(
+            sum("非字典类型的任务项" in message for message in logs.output), 2
+        )
+        self.assertEqual(storage.get_last_migration_stats().skipped, 2)
+
+    def test_newer_schema_version_is_treated_as_unusable(self) -> None:
+        newer = {"schemaVersion": storage.DATA_SCHEMA_VERSION + 1, "todos": []}
+        self._write_json(self.data_file, newer)
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            self.assertEqual(storage.load_todos(), [])
+        with self.assertLogs("todo_app.storage", level="ERROR"):
+            self.assertFalse(storage.save_todos([_todo(1, "不会覆盖新版本文件")]))
+
+        self.assertEqual(json.loads(self.data_file.read_text(encoding="utf-8")), newer)
+
+
+class DataFormatStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_file = Path(self.temp_dir.name) / "todos.json"
+        self.backup_file = Path(f"{self.data_file}.bak")
+        self.data_file_patcher = patch.object(storage, "DATA_FILE", self.data_file)
+        self.data_file_patcher.start()
+
+    def tearDown(self) -> None:
+        storage.configure_storage(storage.StorageOptions())
+        self.data_file_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_formats_round_trip_and_switching_keeps_older_files_readable(self) -> None:
+        todos = [_todo(todo_id, f"任务{todo_id}") for todo_id in range(1, 40)]
+        sizes: dict[str, int] = {}
+        for data_format in ("columnar", "pretty", "compact", "gzip"):
+            with self.subTest(data_format=data_format):
+                storage.configure_storage(storage.StorageOptions(data_format=data_format))
+                previous = self.data_file.read_bytes() if self.data_file.exists() else None
+
+                self.assertTrue(storage.save_todos(todos))
+
+                content = self.data_file.read_bytes()
+                sizes[data_format] = len(content)
+                self.assertEqual(content.startswith(b"\x1f\x8b"), data_format == "gzip")
+                if previous is not None:
+                    self.assertEqual(self.backup_file.read_bytes(), previous)
+                self.assertEqual(storage.load_todos(), todos)
+
+        self.assertNotIn(b"\n", gzip.decompress(self.data_file.read_bytes()))
+        self.assertLess(sizes["compact"], sizes["pretty"])
+        self.assertLess(sizes["gzip"], sizes["compact"])
+        self.assertLess(sizes["columnar"], sizes["compact"])
+
+    def test_damaged_columnar_main_file_recovers_from_backup(self) -> None:
+        storage.configure_storage(storage.StorageOptions(data_format="columnar"))
+        storage.save_todos([_todo(1, "备份中的任务")])
+        storage.save_todos([_todo(1, "主文件中的任务")])
+        damaged_content = self.data_file.read_bytes()[:-9]
+        self.data_file.write_bytes(damaged_content)
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            self.assertEqual(storage.load_todos(), [_todo(1, "备份中的任务")])
+        with self.assertLogs("todo_app.storage", level="ERROR"):
+            self.assertFalse(storage.save_todos([_todo(1, "不会覆盖")]))
+
+        self.assertEqual(self.data_file.read_bytes(), damaged_content)
+
+    def test_truncated_gzip_main_file_recovers_from_backup_and_is_not_overwritten(self) -> None:
+        storage.configure_storage(storage.StorageOptions(data_format="gzip"))
+        storage.save_todos([_todo(1, "备份中的任务")])
+        storage.save_todos([_todo(1, "主文件中的任务")])
+        damaged_content = self.data_file.read_bytes()[:-6]
+        self.data_file.write_bytes(damaged_content)
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            self.assertEqual(storage.load_todos(), [_todo(1, "备份中的任务")])
+        with self.assertLogs("todo_app.storage", level="ERROR"):
+            self.assertFalse(storage.save_todos([_todo(1, "不会覆盖")]))
+
+        self.assertEqual(self.data_file.read_bytes(), damaged_content)
+
+    def test_unknown_format_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            storage.configure_storage(storage.StorageOptions(data_format="xml"))
+
+
+class ArchiveStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_file = Path(self.temp_dir.name) / "todos.json"
+        self.archive_file = Path(self.temp_dir.name) / "todos.archive.jsonl"
+        self.data_file_patcher = patch.object(storage, "DATA_FILE", self.data_file)
+        self.data_file_patcher.start()
+        storage.configure_storage(storage.StorageOptions(archive_after_days=7))
+        self.now = datetime(2026, 8, 31, tzinfo=timezone.utc)
+
+    def tearDown(self) -> None:
+        storage.configure_storage(storage.StorageOptions())
+        self.data_file_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def _completed(self, todo_id: int, days_ago: float | None) -> dict[str, object]:
+        todo = {**_todo(todo_id, f"已完成{todo_id}"), "completed": True}
+        if days_ago is not None:
+            todo["completedAt"] = (self.now - timedelta(days=days_ago)).isoformat()
+        return todo
+
+    def test_old_completed_tasks_move_to_append_only_archive(self) -> None:
+        todos = [
+            _todo(1, "进行中"),
+            self._completed(2, days_ago=30),
+            self._completed(3, days_ago=1),
+            self._completed(4, days_ago=None),
+            self._completed(5, days_ago=8),
+        ]
+        cold = [dict(todos[1]), dict(todos[4])]
+
+        stats = storage.archive_completed_todos(todos, now=self.now)
+
+        self.assertEqual(stats, storage.ArchiveStats(archived=2, stamped=1))
+        self.assertEqual([todo["id"] for todo in todos], [1, 3, 4])
+        self.assertEqual(todos[2]["completedAt"], self.now.isoformat())
+        first_archive = self.archive_file.read_bytes()
+
+        todos.append(self._completed(6, days_ago=10))
+        storage.archive_completed_todos(todos, now=self.now)
+        storage.save_todos(todos)
+
+        self.assertTrue(self.archive_file.read_bytes().startswith(first_archive))
+        self.assertEqual([todo["id"] for todo in storage.load_todos()], [1, 3, 4])
+        self.assertEqual(
+            storage.load_archived_todos(), [*cold, self._completed(6, days_ago=10)]
+        )
+
+    def test_archive_is_read_only_when_requested_and_tolerates_torn_tail(self) -> None:
+        todos = [self._completed(1, days_ago=30), self._completed(2, days_ago=30)]
+        storage.archive_completed_todos(todos, now=self.now)
+        with self.archive_file.open("ab") as fp:
+            fp.write(b'{"op":"put","todo":{"id":9')
+
+        with patch.object(Path, "read_bytes", side_effect=AssertionError):
+            storage.archive_completed_todos([self._completed(3, days_ago=30)], now=self.now)
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            removed = storage.remove_archived_todo(1)
+        self.assertEqual(removed, self._completed(1, days_ago=30))
+        self.assertIsNone(storage.remove_archived_todo(1))
+        updated = {**self._completed(2, days_ago=30), "text": "改过的归档任务"}
+        self.assertTrue(storage.update_archived_todo(updated))
+        self.assertEqual(
+            storage.load_archived_todos(), [updated, self._completed(3, days_ago=30)]
+        )
+
+        storage.configure_storage(storage.StorageOptions(archive_after_days=7))
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            reloaded = storage.load_archived_todos()
+        self.assertEqual(reloaded, [updated, self._completed(3, days_ago=30)])
+
+    def test_archiving_is_off_by_default(self) -> None:
+        storage.configure_storage(storage.StorageOptions())
+        todos = [self._completed(1, days_ago=365)]
+
+        self.assertFalse(storage.archive_completed_todos(todos, now=self.now).changed)
+
+        self.assertEqual(todos, [self._completed(1, days_ago=365)])
+        self.assertFalse(self.archive_file.exists())
+
+    def test_archiving_can_be_disabled(self) -> None:
+        storage.configure_storage(storage.StorageOptions(archive_after_days=None))
+        todos = [self._completed(1, days_ago=365)]
+
+        self.assertFalse(storage.archive_completed_todos(todos, now=self.now).changed)
+
+        self.assertEqual(len(todos), 1)
+        self.assertFalse(self.archive_file.exists())
+        with self.assertRaises(ValueError):
+            storage.configure_storage(storage.StorageOptions(archive_after_days=-1))
+
+
+class JournalStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_file = Path(self.temp_dir.name) / "todos.json"
+        self.journal_file = Path(self.temp_dir.name) / "todos.journal"
+        self.data_file_patcher = patch.object(storage, "DATA_FILE", self.data_file)
+        self.data_file_patcher.start()
+        storage.configure_storage(storage.StorageOptions(journal_enabled=True))
+
+    def tearDown(self) -> None:
+        storage.configure_storage(storage.StorageOptions())
+        self.data_file_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def _journal_lines(self) -> list[dict[str, object]]:
+        return [
+            json.loads(line)
+            for line in self.journal_file.read_text(encoding="utf-8").splitlines()
+        ]
+
+    def test_small_change_appends_record_without_rewriting_main_file(self) -> None:
+        todos = [_todo(todo_id, f"任务{todo_id}") for todo_id in range(1, 51)]
+        storage.save_todos(todos)
+        main_content = self.data_file.read_bytes()
+
+        todos[10]["completed"] = True
+        storage.save_todos(todos)
+        todos.append(_todo(99, "追加任务"))
+        del todos[0]
+        storage.save_todos(todos)
+
+        self.assertEqual(self.data_file.read_bytes(), main_content)
+        records = self._journal_lines()[1:]
+        self.assertEqual([record["op"] for record in records], ["put", "put", "del"])
+        self.assertEqual(records[0]["todo"]["id"], 11)
+        self.assertEqual(storage.load_todos(), todos)
+
+    def test_torn_journal_tail_is_dropped_and_later_appends_remain_readable(self) -> None:
+        todos = [_todo(1, "原任务"), _todo(2, "第二项")]
+        storage.save_todos(todos)
+        todos[0]["text"] = "已记录"
+        storage.save_todos(todos)
+        with self.journal_file.open("ab") as fp:
+            fp.write(b'{"op":"put","todo":{"id":2,"text":"\xe6')
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            loaded = storage.load_todos()
+        self.assertEqual(loaded, todos)
+
+        loaded[1]["completed"] = True
+        storage.save_todos(loaded)
+        self.assertEqual(storage.load_todos(), loaded)
+
+    def test_compaction_folds_journal_into_main_file_and_keeps_backup(self) -> None:
+        storage.configure_storage(
+            storage.StorageOptions(journal_enabled=True, journal_compact_records=3)
+        )
+        todos = [_todo(1, "任务")]
+        storage.save_todos(todos)
+        for revision in range(3):
+            todos[0]["text"] = f"修订{revision}"
+            storage.save_todos(todos)
+        storage.flush_storage()
+
+        self.assertEqual(_read_saved_todos(self.data_file), todos)
+        self.assertEqual(len(self._journal_lines()), 1)
+        self.assertTrue(Path(f"{self.data_file}.bak").exists())
+        self.assertEqual(storage.load_todos(), todos)
+
+    def test_snapshot_in_journal_mode_writes_backup_once(self) -> None:
+        storage.save_todos([_todo(1, "旧快照")])
+        todos = [_todo(2, "插到前面"), _todo(1, "旧快照")]
+
+        with patch.object(storage, "_write_backup", wraps=storage._write_backup) as backup:
+            self.assertTrue(storage.save_todos(todos))
+
+        self.assertEqual(len(backup.call_args_list), 1)
+        self.assertEqual(
+            Path(f"{self.data_file}.bak").read_bytes(), self.data_file.read_bytes()
+        )
+        self.assertEqual(len(self._journal_lines()), 1)
+
+    def test_stale_journal_from_previous_snapshot_is_ignored(self) -> None:
+        storage.save_todos([_todo(1, "旧快照")])
+        storage.save_todos([_todo(1, "日志中的修改")])
+        self.data_file.write_text(
+            json.dumps([_todo(2, "外部替换")], ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+        self.assertEqual(storage.load_todos(), [_todo(2, "外部替换")])
+
+    def test_damaged_main_file_recovers_backup_with_journal_replayed(self) -> None:
+        todos = [_todo(todo_id, f"任务{todo_id}") for todo_id in range(1, 4)]
+        storage.save_todos(todos)
+        for todo_id in range(4, 14):
+            todos.append(_todo(todo_id, f"任务{todo_id}"))
+            storage.save_todos(todos)
+        todos[0]["completed"] = True
+        storage.save_todos(todos)
+        self.assertGreater(len(self._journal_lines()), 1)
+        damaged_content = '[{"id": 1,'
+        self.data_file.write_text(damaged_content, encoding="utf-8")
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            loaded = storage.load_todos()
+
+        self.assertEqual(loaded, todos)
+        self.assertEqual(self.data_file.read_text(encoding="utf-8"), damaged_content)
+
+    def test_compacted_journal_is_recoverable_from_backup(self) -> None:
+        storage.configure_storage(
+            storage.StorageOptions(journal_enabled=True, journal_compact_records=3)
+        )
+        todos = [_todo(1, "任务")]
+        storage.save_todos(todos)
+        for todo_id in range(2, 6):
+            todos.append(_todo(todo_id, f"任务{todo_id}"))
+            storage.save_todos(todos)
+            storage.flush_storage()
+        self.data_file.write_text("", encoding="utf-8")
+
+        with self.assertLogs("todo_app.storage", level="WARNING"):
+            self.assertEqual(storage.load_todos(), todos)
+
+    def test_journal_mode_still_refuses_to_overwrite_damaged_main_file(self) -> None:
+        todos = [_todo(1, "原任务")]
+        storage.save_todos(todos)
+        storage.load_todos()
+        damaged_content = '[{"id": 1,'
+        self.data_file.write_text(damaged_content, encoding="utf-8")
+
+        todos[0]["completed"] = True
+        with self.assertLogs("todo_app.storage", level="ERROR"):
+            storage.save_todos(todos)
+
+        self.assertEqual(self.data_file.read_text(encoding="utf-8"), damaged_content)
+
 
 if __name__ == "__main__":
     unittest.main()
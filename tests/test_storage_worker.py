@@ -0,0 +1,163 @@
+"""后台写后保存工作器的合并、快照与失败通知测试。"""
+from __future__ import annotations
+
+import gc
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from todo_app.clock import ClockService  # noqa: E402
+from todo_app.main_window import ModernTodoAppWindow  # noqa: E402
+from todo_app.storage_worker import TodoSaveWorker  # noqa: E402
+
+
+class TodoSaveWorkerTest(unittest.TestCase):
+    _TODO = {
+        "id": 1,
+        "text": "退出前保存",
+        "completed": False,
+        "priority": "中",
+        "createdAt": "2026-07-12T05:00:00+00:00",
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _create_worker(self, todos: list[dict], save_function) -> TodoSaveWorker:
+        worker = TodoSaveWorker(lambda: todos, save_function, coalesce_ms=10_000)
+        self.addCleanup(worker.shutdown)
+        return worker
+
+    def test_burst_of_requests_is_written_once_with_latest_state(self) -> None:
+        todos = [{"id": 1, "completed": False}]
+        written: list[list[dict]] = []
+        worker = self._create_worker(todos, lambda snapshot: written.append(snapshot) or True)
+
+        for completed in (True, False, True):
+            todos[0]["completed"] = completed
+            worker.request_save()
+        self.assertTrue(worker.has_pending())
+        self.assertEqual(written, [])
+
+        self.assertTrue(worker.flush())
+
+        self.assertEqual(written, [[{"id": 1, "completed": True}]])
+        self.assertFalse(worker.has_pending())
+
+    def test_snapshot_is_detached_from_later_mutations(self) -> None:
+        todos = [{"id": 1, "text": "写入前"}]
+        release = threading.Event()
+        written: list[list[dict]] = []
+
+        def slow_save(snapshot: list[dict]) -> bool:
+            release.wait(5)
+            written.append(snapshot)
+            return True
+
+        worker = self._create_worker(todos, slow_save)
+        worker.request_save()
+        worker._coalesce_timer.stop()
+        worker._submit_snapshot()
+        todos[0]["text"] = "写入后"
+        release.set()
+        worker.flush()
+
+        self.assertEqual(written, [[{"id": 1, "text": "写入前"}]])
+
+    def test_failed_write_is_reported_through_signal(self) -> None:
+        worker = self._create_worker([], MagicMock(return_value=False))
+        results: list[bool] = []
+        worker.save_finished.connect(results.append)
+
+        worker.request_save()
+        self.assertFalse(worker.flush())
+        self.app.processEvents()
+
+        self.assertEqual(results, [False])
+
+    def test_window_warns_once_until_a_save_succeeds(self) -> None:
+        with (
+            patch("todo_app.main_window.load_todos", return_value=[]),
+            patch("todo_app.main_window.save_todos", return_value=False),
+            patch("todo_app.main_window.QMessageBox.warning") as warning_mock,
+        ):
+            window = ModernTodoAppWindow()
+            window.master_timer.stop()
+            self.addCleanup(self._close_window, window)
+
+            for _ in range(2):
+                window._save_worker.request_save()
+                window._save_worker.flush()
+                self.app.processEvents()
+            self.assertEqual(warning_mock.call_count, 1)
+
+            window._on_save_finished(True)
+            window._on_save_finished(False)
+            self.assertEqual(warning_mock.call_count, 2)
+
+    def test_quit_flushes_final_state_synchronously(self) -> None:
+        with (
+            patch("todo_app.main_window.load_todos", return_value=[dict(self._TODO)]),
+            patch("todo_app.main_window.save_todos", return_value=True) as save_mock,
+            patch("todo_app.main_window.QApplication.quit"),
+        ):
+            window = ModernTodoAppWindow()
+            window.master_timer.stop()
+            self.addCleanup(self._close_window, window)
+            window.todos[0]["completed"] = True
+            window._save_worker.request_save()
+
+            window.quit_application()
+
+            save_mock.assert_called_once_with([{**self._TODO, "completed": True}])
+
+    def test_failed_shutdown_still_restores_automatic_collection(self) -> None:
+        with (
+            patch("todo_app.main_window.load_todos", return_value=[]),
+            patch("todo_app.main_window.flush_storage", side_effect=OSError("磁盘已满")),
+        ):
+            window = ModernTodoAppWindow()
+            self.addCleanup(self._close_window, window)
+            self.assertFalse(gc.isenabled())
+
+            with self.assertRaises(OSError):
+                window.quit_application()
+
+        self.assertFalse(window._garbage_collector.is_active())
+        self.assertTrue(gc.isenabled())
+
+    def test_clock_stops_when_views_stop_while_gc_guard_keeps_running(self) -> None:
+        clock = ClockService()
+        with (
+            patch("todo_app.clock._CLOCK_SERVICE", clock),
+            patch("todo_app.main_window.load_todos", return_value=[]),
+            patch("todo_app.main_window.save_todos"),
+        ):
+            window = ModernTodoAppWindow()
+            self.addCleanup(self._close_window, window)
+            self.assertTrue(clock.is_running())
+
+            window.master_timer.stop()
+            window._archive_timer.stop()
+
+            # 回收检查有自己的粗粒度计时器，不会让时钟服务为它常驻唤醒。
+            self.assertEqual(clock.active_subscription_count(), 0)
+            self.assertFalse(clock.is_running())
+            self.assertTrue(window._garbage_collector._timer.isActive())
+
+    def _close_window(self, window: ModernTodoAppWindow) -> None:
+        window.master_timer.stop()
+        window._quitting_app = True
+        window.tray_icon.hide()
+        window.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
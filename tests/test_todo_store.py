@@ -0,0 +1,150 @@
+"""待办列表持有者的 ID 查找、增量二级索引与 ID 分配测试，不需要 QApplication。"""
+from __future__ import annotations
+
+import os
+import time
+import unittest
+from datetime import datetime, timezone
+
+from todo_app.scheduling import clear_timestamp_cache
+from todo_app.todo_store import TodoStore
+
+
+def _todo(todo_id: object, **overrides: object) -> dict[str, object]:
+    todo: dict[str, object] = {
+        "id": todo_id,
+        "text": f"任务 {todo_id}",
+        "completed": False,
+        "priority": "中",
+        "dueDate": None,
+    }
+    todo.update(overrides)
+    return todo
+
+
+def _local_noon(year: int, month: int, day: int) -> str:
+    return datetime(year, month, day, 12).astimezone().isoformat()
+
+
+class TodoStoreTest(unittest.TestCase):
+    def test_mutations_keep_lookup_and_secondary_indexes_in_sync(self) -> None:
+        todos = [
+            _todo(1, priority="高", dueDate=_local_noon(2026, 8, 6)),
+            _todo(2, completed=True),
+            "损坏的条目",
+            _todo(3, priority="高"),
+        ]
+        store = TodoStore(todos)
+
+        self.assertIs(store.todos, todos)
+        self.assertEqual(len(store), 3)
+        self.assertIs(store.get(3), todos[3])
+        self.assertEqual(store.ids_with_completed(False), {1, 3})
+        self.assertEqual(store.ids_with_priority("高"), {1, 3})
+        self.assertEqual(store.ids_due_on(datetime(2026, 8, 6).date()), {1})
+
+        store.update(1, {"completed": True, "priority": "低", "dueDate": None})
+        store.add(_todo(4, priority="高", dueDate=_local_noon(2026, 8, 6)))
+        removed = store.remove(3)
+
+        self.assertEqual(removed["id"], 3)
+        self.assertNotIn(3, store)
+        self.assertEqual(
+            [todo if isinstance(todo, str) else todo["id"] for todo in todos],
+            [1, 2, "损坏的条目", 4],
+        )
+        self.assertEqual(store.ids_with_completed(True), {1, 2})
+        self.assertEqual(store.ids_with_priority("高"), {4})
+        self.assertEqual(store.ids_with_priority("低"), {1})
+        self.assertEqual(store.ids_due_on(datetime(2026, 8, 6).date()), {4})
+        self.assertIsNone(store.update(3, {"completed": True}))
+        self.assertIsNone(store.remove(3))
+
+    def test_records_follow_list_order_and_rebuild_picks_up_in_place_edits(self) -> None:
+        todos = [_todo(todo_id) for todo_id in (5, 1, 9, 3)]
+        store = TodoStore(todos)
+
+        self.assertEqual([todo["id"] for todo in store.records({3, 9, 5, 42})], [5, 9, 3])
+        self.assertEqual([todo["id"] for todo in store.records()], [5, 1, 9, 3])
+
+        # 归档等流程直接改写列表后，需要整体重建索引。
+        todos[:] = todos[2:]
+        todos[0]["priority"] = "高"
+        store.rebuild()
+
+        self.assertEqual([todo["id"] for todo in store.records()], [9, 3])
+        self.assertEqual(store.ids_with_priority("高"), {9})
+        self.assertNotIn(5, store)
+
+    def test_allocated_ids_exceed_running_maximum_even_after_removal(self) -> None:
+        store = TodoStore([_todo(7), _todo("外部导入"), _todo(1_000)])
+
+        self.assertEqual(store.allocate_id(10), 1_001)
+        self.assertEqual(store.allocate_id(5_000), 5_000)
+
+        store.remove(1_000)
+        self.assertEqual(store.allocate_id(10), 1_001)
+
+        store.add(_todo(2_000))
+        self.assertEqual(store.allocate_id(10), 2_001)
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "需要可切换进程时区的平台")
+    def test_naive_due_dates_are_indexed_by_local_day(self) -> None:
+        original_tz = os.environ.get("TZ")
+
+        def restore_tz() -> None:
+            if original_tz is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = original_tz
+            time.tzset()
+            # 缓存中按本地时间解读的结果随时区失效。
+            clear_timestamp_cache()
+
+        os.environ["TZ"] = "Asia/Shanghai"
+        time.tzset()
+        self.addCleanup(restore_tz)
+        # 按 UTC 解读会落到本地次日凌晨，与“今天到期”筛选的本地解读不一致。
+        store = TodoStore([_todo(1, dueDate="2026-08-06T20:00:00")])
+
+        self.assertEqual(store.ids_due_on(datetime(2026, 8, 6).date()), {1})
+        self.assertEqual(store.ids_due_on(datetime(2026, 8, 7).date()), frozenset())
+
+    def test_non_list_input_and_duplicate_ids_keep_first_record(self) -> None:
+        first, duplicate = _todo(1, text="首个"), _todo(1, text="重复")
+        store = TodoStore([first, duplicate])
+
+        self.assertIs(store.get(1), first)
+        self.assertEqual(len(store), 1)
+        store.remove(1)
+        self.assertEqual(store.todos, [])
+
+        store.replace(None)  # type: ignore[arg-type]
+        self.assertEqual(store.todos, [])
+        self.assertEqual(store.records(), [])
+        self.assertEqual(
+            store.ids_due_on(datetime.now(timezone.utc).date()),
+            frozenset(),
+        )
+
+    def test_records_keep_tasks_without_id_or_with_duplicate_id_visible(self) -> None:
+        first, duplicate = _todo(1, text="首个"), _todo(1, text="重复")
+        missing_id = {"text": "没有 ID", "completed": False}
+        todos = [first, missing_id, "不是字典", duplicate, _todo(2)]
+        store = TodoStore(todos)  # type: ignore[arg-type]
+
+        self.assertTrue(store.has_unindexed())
+        self.assertEqual(store.records(), [first, missing_id, duplicate, _todo(2)])
+        self.assertEqual(store.records({1, 2}), [first, _todo(2)])
+        self.assertEqual(len(store), 2)
+
+        store.remove(1)
+        self.assertEqual(store.records(), [missing_id, _todo(2)])
+        store.todos.remove(missing_id)
+        store.rebuild()
+        self.assertFalse(store.has_unindexed())
+        self.assertEqual(store.records(), [_todo(2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,7 @@ from PySide6.QtGui import QColor, QEnterEvent, QWheelEvent  # noqa: E402
 from PySide6.QtWidgets import (  # noqa: E402
     QAbstractItemView,
     QApplication,
+    QMessageBox,
     QSizePolicy,
     QStyle,
     QStyleOptionComboBox,
@@ -21,10 +22,17 @@ from PySide6.QtWidgets import (  # noqa: E402
     QWidget,
 )
 
-from todo_app.constants import DARK_THEME_COLORS, LIGHT_THEME_COLORS  # noqa: E402
+from todo_app.constants import (  # noqa: E402
+    DARK_THEME_COLORS,
+    LIGHT_THEME_COLORS,
+    TASK_CARD_MINIMUM_HEIGHT,
+)
 from todo_app.fonts import apply_application_font  # noqa: E402
 from todo_app.main_window import ModernTodoAppWindow  # noqa: E402
-from todo_app.widgets import TodoItemWidget  # noqa: E402
+from todo_app.theme import get_theme_manager  # noqa: E402
+from todo_app.todo_list import TodoCardPool, TodoListModel  # noqa: E402
+from todo_app.utils import clear_icon_cache, icon_cache_stats  # noqa: E402
+from todo_app.widgets import TodoItemWidget, timer_presentation  # noqa: E402
 
 
 class TodoItemWidgetLayoutTest(unittest.TestCase):
@@ -74,6 +82,63 @@ class TodoItemWidgetLayoutTest(unittest.TestCase):
         self.assertEqual(widget.task_text_label.geometry(), idle_task_geometry)
         self.assertEqual(widget.timer_display_label.geometry(), idle_timer_geometry)
 
+    def test_hover_overlays_are_created_on_first_hover(self) -> None:
+        widget = TodoItemWidget(
+            {"id": 1, "text": "短任务", "priority": "中", "completed": False, "dueDate": None}
+        )
+        widget.resize(240, 110)
+        self.addCleanup(widget.close)
+
+        def overlays() -> list[QWidget]:
+            return [
+                child
+                for name in ("TodoActionsContainer", "TodoTaskDetailsPopup")
+                for child in widget.findChildren(QWidget, name)
+            ]
+
+        widget.apply_palette(DARK_THEME_COLORS)
+        widget.leaveEvent(QEvent(QEvent.Type.Leave))
+        self.assertEqual(overlays(), [])
+
+        widget.enterEvent(QEnterEvent(QPointF(1, 1), QPointF(1, 1), QPointF(1, 1)))
+        self.assertEqual([child.objectName() for child in overlays()], ["TodoActionsContainer"])
+        self.assertTrue(widget.edit_button.isVisibleTo(widget))
+        self.assertFalse(widget.edit_button.icon().isNull())
+        self.assertIs(widget.task_details_popup.parentWidget(), widget)
+        self.assertIn(DARK_THEME_COLORS.primary_item_bg, widget.task_details_popup.styleSheet())
+
+    def test_card_icons_come_from_shared_cache_after_warm_up(self) -> None:
+        clear_icon_cache()
+
+        def hovered_card(todo_id: int) -> TodoItemWidget:
+            card = TodoItemWidget(
+                {"id": todo_id, "text": "任务", "priority": "中", "completed": todo_id % 2 == 0}
+            )
+            self.addCleanup(card.close)
+            card.enterEvent(QEnterEvent(QPointF(1, 1), QPointF(1, 1), QPointF(1, 1)))
+            return card
+
+        first, second = hovered_card(1), hovered_card(2)
+        warmed = icon_cache_stats()
+        self.assertEqual(warmed.size, 4)
+
+        third, fourth = hovered_card(3), hovered_card(4)
+        stats = icon_cache_stats()
+        self.assertEqual(stats.misses, warmed.misses)
+        self.assertGreaterEqual(stats.hits, warmed.hits + 6)
+        self.assertEqual(
+            third.edit_button.icon().cacheKey(),
+            first.edit_button.icon().cacheKey(),
+        )
+        self.assertEqual(
+            fourth.complete_button.icon().cacheKey(),
+            second.complete_button.icon().cacheKey(),
+        )
+
+        manager = get_theme_manager()
+        manager.theme_changed.emit(manager.current_palette)
+        self.assertEqual(icon_cache_stats().size, 0)
+
     def test_task_text_preserves_line_breaks_and_elides_each_logical_line(self) -> None:
         original_text = (
             "第一行很长的中文任务内容需要独立省略" * 3
@@ -111,6 +176,83 @@ class TodoItemWidgetLayoutTest(unittest.TestCase):
         self.assertTrue(widget.task_text_label.needs_details())
         self._assert_each_logical_line_fits(widget)
 
+    def test_cached_line_elision_follows_text_and_font_changes(self) -> None:
+        widget = TodoItemWidget(
+            {"id": 1, "text": "第一行很长的任务内容需要省略" * 3 + "\n第二行", "priority": "中"}
+        )
+        widget.setFixedWidth(260)
+        widget.show()
+        self.addCleanup(widget.close)
+        self.app.processEvents()
+        label = widget.task_text_label
+
+        lines = label.logical_lines()
+        self.assertIs(label.logical_lines(), lines)
+        label.setText("新的第一行\r\n新的第二行\n第三行")
+        self.assertEqual(label.logical_lines(), ["新的第一行", "新的第二行", "第三行"])
+
+        label.setText("切换字号后仍需独立省略的很长很长的任务内容" * 2)
+        for point_size in (9, 14, 9):
+            with self.subTest(point_size=point_size):
+                font = label.font()
+                font.setPointSize(point_size)
+                label.setFont(font)
+                label.set_layout_available_width(120)
+                self.assertEqual(
+                    label.displayed_lines(),
+                    [
+                        label.fontMetrics().elidedText(
+                            line, Qt.TextElideMode.ElideRight, 120
+                        )
+                        for line in label.logical_lines()
+                    ],
+                )
+
+    def test_task_lines_are_pre_laid_out_until_text_or_width_changes(self) -> None:
+        widget = TodoItemWidget(
+            {"id": 1, "text": "预排版的第一行任务内容会被省略" * 3 + "\n第二行", "priority": "中"}
+        )
+        widget.setFixedWidth(260)
+        widget.show()
+        self.addCleanup(widget.close)
+        self.app.processEvents()
+        label = widget.task_text_label
+
+        prepared = label._prepared_static_lines()
+        label.repaint()
+        self.assertIs(label._prepared_static_lines(), prepared)
+        self.assertEqual([line.text() for line in prepared], label.displayed_lines())
+
+        label.set_layout_available_width(80)
+        narrowed = label._prepared_static_lines()
+        self.assertIsNot(narrowed, prepared)
+        self.assertEqual([line.text() for line in narrowed], label.displayed_lines())
+
+        label.setText("换行后\n重新排版")
+        self.assertEqual(
+            [line.text() for line in label._prepared_static_lines()],
+            label.displayed_lines(),
+        )
+
+    def test_layout_measurements_survive_resizes_until_content_changes(self) -> None:
+        widget = TodoItemWidget({"id": 1, "text": "单行任务", "priority": "中"})
+        widget.resize(320, widget.requiredHeight())
+        widget.show()
+        self.addCleanup(widget.close)
+        self.app.processEvents()
+
+        measured = widget.layout_measurements()
+        for width in (300, 260, 420):
+            widget.resize(width, widget.height())
+            self.app.processEvents()
+        self.assertIs(widget.layout_measurements(), measured)
+
+        widget.bind({"id": 2, "text": "第一行\n第二行\n第三行", "priority": "高"})
+        remeasured = widget.layout_measurements()
+        self.assertIsNot(remeasured, measured)
+        self.assertEqual(remeasured.logical_line_count, 3)
+        self.assertGreater(widget.requiredHeight(), TASK_CARD_MINIMUM_HEIGHT)
+
     def test_task_details_popup_preserves_plain_text_without_stealing_focus(self) -> None:
         original_text = (
             "第一行包含 <b>标签</b>、& 符号和引号 \"内容\""
@@ -603,6 +745,38 @@ class TodoItemWidgetLayoutTest(unittest.TestCase):
         )
 
 
+class TodoListModelTest(unittest.TestCase):
+    def test_reconcile_applies_keyed_row_changes_without_reset(self) -> None:
+        model = TodoListModel()
+        model.reconcile([{"id": todo_id, "text": f"任务{todo_id}"} for todo_id in range(1, 5)])
+        rows_before = list(model.todos())
+        events: list[str] = []
+        model.modelReset.connect(lambda: events.append("reset"))
+        model.rowsRemoved.connect(lambda *_: events.append("removed"))
+        model.rowsInserted.connect(lambda *_: events.append("inserted"))
+        model.rowsMoved.connect(lambda *_: events.append("moved"))
+        model.dataChanged.connect(lambda *_: events.append("changed"))
+
+        source = [
+            {"id": 4, "text": "任务4"},
+            {"id": 1, "text": "任务1"},
+            {"id": 3, "text": "已修改"},
+            {"id": 5, "text": "任务5"},
+        ]
+        changed = model.reconcile(source)
+
+        self.assertEqual(changed, 1)
+        self.assertEqual(model.todos(), source)
+        self.assertIs(model.todo_at(0), rows_before[3])
+        self.assertIs(model.todo_at(1), rows_before[0])
+        self.assertIsNot(model.todo_at(2), source[2])
+        self.assertEqual(sorted(events), ["changed", "inserted", "moved", "removed"])
+
+        model.reconcile(list(reversed(source)) * 2)
+        self.assertEqual(events[-1], "reset")
+        self.assertEqual(model.rowCount(), 8)
+
+
 class TodoListCardIntegrationTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -613,7 +787,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
         from todo_app.constants import APP_FONT_FAMILY
 
         window = self._create_window()
-        card = window.list_widget.itemWidget(window.list_widget.item(0))
+        card = self._hover_card(window, 0)
         representative_widgets = (
             window.filter_label,
             window.filter_combo,
@@ -635,13 +809,12 @@ class TodoListCardIntegrationTest(unittest.TestCase):
         window.show()
         self.app.processEvents()
 
-        item = window.list_widget.item(0)
-        card = window.list_widget.itemWidget(item)
+        card = self._hover_card(window, 0)
         viewport = window.list_widget.viewport()
 
         self.assertLessEqual(card.width(), viewport.width())
         self.assertLessEqual(
-            window.list_widget.visualItemRect(item).right(),
+            self._row_rect(window, 0).right(),
             viewport.rect().right(),
         )
         self.assertEqual(card.task_text_label.minimumWidth(), 150)
@@ -690,6 +863,282 @@ class TodoListCardIntegrationTest(unittest.TestCase):
             QAbstractItemView.SelectionMode.NoSelection,
         )
 
+    def test_only_hovered_row_owns_a_real_card_widget(self) -> None:
+        window = self._create_window(todo_count=20)
+        window.resize(320, 640)
+        window.show()
+        self._settle_list_layout(window)
+        list_view = window.list_widget
+
+        self.assertEqual(window.todo_model.rowCount(), 20)
+        self.assertEqual(
+            [row for row in range(20) if list_view.card_widget(row) is not None],
+            [],
+        )
+        # 委托只保留一张隐藏的模板卡片用于绘制。
+        self.assertEqual(
+            [card for card in list_view.findChildren(TodoItemWidget) if card.isVisible()],
+            [],
+        )
+
+        for row in (3, 5):
+            list_view.set_hovered_row(row)
+            self.app.processEvents()
+            self.assertEqual(
+                [row for row in range(20) if list_view.card_widget(row) is not None],
+                [list_view.hovered_row()],
+            )
+            self.assertEqual(
+                list_view.card_widget(row).geometry(),
+                self._row_rect(window, row),
+            )
+
+        list_view.set_hovered_row(-1)
+        self.app.processEvents()
+        self.assertIsNone(list_view.hovered_card())
+
+    def test_hover_cards_are_recycled_across_rows_and_filters(self) -> None:
+        window = self._create_window(todo_count=20)
+        window.resize(320, 640)
+        window.show()
+        self._settle_list_layout(window)
+        list_view = window.list_widget
+        pool = window.todo_delegate.card_pool
+
+        first_card = self._hover_card(window, 2)
+        for row in (4, 6, 2):
+            self.assertIs(self._hover_card(window, row), first_card)
+            self.assertIs(first_card.todo_item, window.todo_model.todo_at(row))
+            self.assertEqual(first_card.original_text, window.todo_model.todo_at(row)["text"])
+
+        # 切换筛选会移除悬停行，卡片回到池中后仍被下一次悬停复用。
+        window.filter_combo.setCurrentText("未完成")
+        self.app.processEvents()
+        self.assertIs(self._hover_card(window, 1), first_card)
+
+        window.todo_delegate.apply_palette(DARK_THEME_COLORS)
+        list_view.set_hovered_row(-1)
+        self.assertIs(self._hover_card(window, 3), first_card)
+        self.assertEqual(first_card._palette, DARK_THEME_COLORS)
+
+        stats = pool.stats()
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.hits, 5)
+        self.assertEqual(stats.evictions, 0)
+        self.assertEqual(stats.idle, 0)
+
+        small_pool = TodoCardPool(
+            lambda todo, parent: TodoItemWidget(todo, parent, palette=LIGHT_THEME_COLORS),
+            capacity=1,
+        )
+        cards = [
+            small_pool.acquire({"id": n, "text": f"卡片{n}"}, list_view.viewport(), LIGHT_THEME_COLORS)
+            for n in (1, 2)
+        ]
+        for card in cards:
+            small_pool.release(card)
+        self.assertEqual(small_pool.stats().evictions, 1)
+        self.assertIs(
+            small_pool.acquire({"id": 3, "text": "卡片3"}, list_view.viewport(), LIGHT_THEME_COLORS),
+            cards[1],
+        )
+
+    def test_resize_requests_coalesce_and_estimated_rows_settle_to_measured_heights(self) -> None:
+        base = {
+            "priority": "中",
+            "completed": False,
+            "dueDate": None,
+            "createdAt": "2026-07-17T00:00:00+00:00",
+            "snoozeUntil": None,
+        }
+        todos = [
+            {**base, "id": index + 1, "text": "\n".join(f"第{line}行" for line in range(index % 3 + 1))}
+            for index in range(40)
+        ]
+        with patch("todo_app.todo_list.TodoCardDelegate._estimated_height", return_value=None):
+            measured_window = self._create_window(todos=todos)
+            measured_window.resize(320, 640)
+            measured_window.show()
+            self._settle_list_layout(measured_window)
+        window = self._create_window(todos=todos)
+        window.resize(320, 640)
+        window.show()
+        self.app.processEvents()
+        delegate = window.todo_delegate
+
+        with patch.object(
+            delegate,
+            "set_viewport_geometry",
+            wraps=delegate.set_viewport_geometry,
+        ) as set_viewport_geometry:
+            for _ in range(3):
+                window.update_list_widget()
+            # 同一轮内的多次刷新只排队一次同步。
+            self.assertEqual(set_viewport_geometry.call_count, 0)
+            self.assertTrue(window._card_size_sync_timer.isActive())
+            self.app.processEvents()
+            self.assertEqual(set_viewport_geometry.call_count, 1)
+
+        for _ in range(20):
+            self.app.processEvents()
+        self.assertEqual(self._card_heights(window), self._card_heights(measured_window))
+        self.assertGreater(len(set(self._card_heights(window))), 1)
+
+    def test_tick_syncs_only_rows_near_viewport_until_others_scroll_in(self) -> None:
+        window = self._create_window(todo_count=60)
+        window.master_timer.stop()
+        window.resize(320, 640)
+        window.show()
+        self._settle_list_layout(window)
+        model = window.todo_model
+        visible_rows = window.list_widget.visible_rows()
+        self.assertLess(visible_rows.stop, 40)
+
+        for todo in window.todos:
+            todo["priority"] = "高"
+        window.tick_update()
+
+        near_rows = window.list_widget.visible_rows(2)
+        self.assertEqual(near_rows.stop, visible_rows.stop + 2)
+        self.assertEqual(
+            [row for row in range(60) if model.todo_at(row)["priority"] == "高"],
+            list(near_rows),
+        )
+
+        window.list_widget.scrollToBottom()
+        self._settle_list_layout(window)
+        window.list_widget.viewport().repaint()
+        self.assertEqual(model.todo_at(59)["priority"], "高")
+
+    def test_far_due_timers_are_recomputed_only_when_their_text_changes(self) -> None:
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        due = now + timedelta(days=3, minutes=30)
+        todos = [
+            {
+                "id": index + 1,
+                "text": f"三天后到期{index}",
+                "priority": "中",
+                "completed": False,
+                "dueDate": due.isoformat(),
+                "createdAt": now.isoformat(),
+                "snoozeUntil": None,
+            }
+            for index in range(3)
+        ]
+        window = self._create_window(todos=todos)
+        window.master_timer.stop()
+        window.resize(320, 640)
+        window.show()
+        self._settle_list_layout(window)
+        window.list_widget.viewport().repaint()
+        card = self._hover_card(window, 0)
+        card.update_timer_display(now)
+        self._settle_list_layout(window)
+        self.assertEqual(card.timer_display_label.full_text, "剩余: 3天")
+        # 文本只显示天与时，下一次变化在剩余时长跌破整点时。
+        next_change = due - timedelta(days=3)
+        self.assertEqual(
+            timer_presentation(todos[0], now, window._palette).next_change,
+            next_change,
+        )
+
+        with (
+            patch("todo_app.todo_list.timer_presentation", wraps=timer_presentation) as rows,
+            patch("todo_app.widgets.timer_presentation", wraps=timer_presentation) as cards,
+            patch.object(window.list_widget, "update") as repaint_row,
+        ):
+            for seconds in (1, 60, 29 * 60):
+                window.todo_delegate.refresh_timers(window.list_widget, now + timedelta(seconds=seconds))
+                card.update_timer_display(now + timedelta(seconds=seconds))
+            self.assertEqual((rows.call_count, cards.call_count), (0, 0))
+            repaint_row.assert_not_called()
+
+            after_change = next_change + timedelta(seconds=1)
+            window.todo_delegate.refresh_timers(window.list_widget, after_change)
+            card.update_timer_display(after_change)
+            self.assertEqual(repaint_row.call_count, 3)
+            self.assertEqual(cards.call_count, 1)
+        self.assertEqual(card.timer_display_label.full_text, "剩余: 2天 23时")
+
+    def test_toggling_one_task_updates_its_row_in_place(self) -> None:
+        save_patcher = patch("todo_app.main_window.save_todos")
+        save_patcher.start()
+        self.addCleanup(save_patcher.stop)
+        window = self._create_window(todo_count=5)
+        window.resize(320, 640)
+        window.show()
+        self._settle_list_layout(window)
+        card = self._hover_card(window, 3)
+        rows_before = list(window.todo_model.todos())
+        resets: list[bool] = []
+        window.todo_model.modelReset.connect(lambda: resets.append(True))
+
+        window.toggle_complete_todo(rows_before[1]["id"])
+        self.app.processEvents()
+
+        self.assertEqual(resets, [])
+        self.assertIs(window.list_widget.hovered_card(), card)
+        self.assertTrue(window.todo_model.todo_at(1)["completed"])
+        for row in (0, 2, 3, 4):
+            self.assertIs(window.todo_model.todo_at(row), rows_before[row])
+
+    def test_repaint_reuses_row_pixmaps_until_row_content_changes(self) -> None:
+        save_patcher = patch("todo_app.main_window.save_todos")
+        save_patcher.start()
+        self.addCleanup(save_patcher.stop)
+        window = self._create_window(todo_count=5)
+        window.master_timer.stop()
+        window.resize(320, 640)
+        window.show()
+        self._settle_list_layout(window)
+        window.list_widget.set_hovered_row(-1)
+        viewport = window.list_widget.viewport()
+        viewport.repaint()
+        delegate = window.todo_delegate
+        toggled_id = window.todo_model.todo_at(1)["id"]
+        deleted_id = window.todo_model.todo_at(4)["id"]
+
+        with patch.object(delegate, "_render_row", wraps=delegate._render_row) as render:
+            viewport.repaint()
+            self.assertEqual(render.call_count, 0)
+
+            window.toggle_complete_todo(toggled_id)
+            self.app.processEvents()
+            viewport.repaint()
+            self.assertEqual(
+                [call.args[0]["id"] for call in render.call_args_list], [toggled_id]
+            )
+
+        with patch(
+            "todo_app.main_window.QMessageBox.question",
+            return_value=QMessageBox.StandardButton.Yes,
+        ):
+            window.handle_delete_request(deleted_id)
+        self.app.processEvents()
+        self.assertNotIn(deleted_id, delegate._painted_rows)
+
+    def test_row_pixmap_cache_stays_bounded_while_scrolling_long_list(self) -> None:
+        window = self._create_window(todo_count=120)
+        window.master_timer.stop()
+        window.resize(320, 640)
+        window.show()
+        self._settle_list_layout(window)
+        window.list_widget.set_hovered_row(-1)
+        list_widget = window.list_widget
+        scrollbar = list_widget.verticalScrollBar()
+        delegate = window.todo_delegate
+        bound = max(16, 2 * len(list_widget.visible_rows()))
+        self.assertLess(bound, window.todo_model.rowCount())
+
+        for value in range(0, scrollbar.maximum() + 1, max(scrollbar.pageStep() // 2, 1)):
+            scrollbar.setValue(value)
+            list_widget.viewport().repaint()
+            self.assertLessEqual(len(delegate._painted_rows), bound)
+            visible_ids = {
+                window.todo_model.todo_at(row)["id"] for row in list_widget.visible_rows()
+            }
+            self.assertLessEqual(visible_ids, set(delegate._painted_rows))
+
     def test_narrow_timer_elides_from_right_and_preserves_status_prefix(self) -> None:
         now = datetime.now(timezone.utc)
         todos = [
@@ -719,8 +1168,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
 
         for index, prefix in enumerate(("剩余", "已到期")):
             with self.subTest(prefix=prefix):
-                item = window.list_widget.item(index)
-                card = window.list_widget.itemWidget(item)
+                card = self._hover_card(window, index)
                 displayed_text = card.timer_display_label.text()
                 available_width = card.timer_display_label.contentsRect().width()
 
@@ -753,8 +1201,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
         window.show()
         self._settle_list_layout(window)
 
-        item = window.list_widget.item(0)
-        card = window.list_widget.itemWidget(item)
+        card = self._hover_card(window, 0)
         card.update_timer_display(now)
         self._settle_list_layout(window)
 
@@ -772,21 +1219,19 @@ class TodoListCardIntegrationTest(unittest.TestCase):
         window.show()
         self.app.processEvents()
 
-        first_item = window.list_widget.item(0)
-        second_item = window.list_widget.item(1)
-        first_card = window.list_widget.itemWidget(first_item)
-        second_card = window.list_widget.itemWidget(second_item)
-        card_gap = second_card.geometry().top() - first_card.geometry().bottom() - 1
+        first_rect = self._row_rect(window, 0)
+        second_rect = self._row_rect(window, 1)
+        card_gap = second_rect.top() - first_rect.bottom() - 1
 
         self.assertEqual(card_gap, window.list_widget.spacing() * 2)
         self.assertEqual(card_gap, 8)
-        self.assertGreaterEqual(first_item.sizeHint().height(), first_card.minimumHeight())
-        self.assertGreaterEqual(second_item.sizeHint().height(), second_card.minimumHeight())
+        self.assertGreaterEqual(first_rect.height(), TASK_CARD_MINIMUM_HEIGHT)
+        self.assertGreaterEqual(second_rect.height(), TASK_CARD_MINIMUM_HEIGHT)
 
         viewport_image = window.list_widget.viewport().grab().toImage()
-        sample_x = first_card.geometry().center().x()
-        card_y = first_card.geometry().top() + 5
-        gap_y = first_card.geometry().bottom() + 1 + card_gap // 2
+        sample_x = first_rect.center().x()
+        card_y = first_rect.top() + 5
+        gap_y = first_rect.bottom() + 1 + card_gap // 2
         self.assertNotEqual(
             viewport_image.pixelColor(sample_x, card_y).rgba(),
             viewport_image.pixelColor(sample_x, gap_y).rgba(),
@@ -898,7 +1343,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
             for text in expected_texts
         ]
         for index, logical_lines in enumerate(expected_logical_lines):
-            card = window.list_widget.itemWidget(window.list_widget.item(index))
+            card = self._hover_card(window, index)
             self.assertEqual(card.task_text_label.displayed_lines(), logical_lines)
             self.assertEqual(card.task_text_label.toolTip(), "")
 
@@ -909,8 +1354,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
 
         for index, original_text in enumerate(expected_texts):
             with self.subTest(index=index):
-                item = window.list_widget.item(index)
-                card = window.list_widget.itemWidget(item)
+                card = self._hover_card(window, index)
                 label = card.task_text_label
                 self.assertLessEqual(card.width(), window.list_widget.viewport().width())
                 self.assertEqual(label.text(), original_text)
@@ -924,7 +1368,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
                         label.fontMetrics().horizontalAdvance(displayed_line),
                         label.contentsRect().width(),
                     )
-                self.assertEqual(item.sizeHint().height(), card.height())
+                self.assertEqual(self._row_rect(window, index).height(), card.height())
                 self.assertFalse(window.list_widget.horizontalScrollBar().isVisible())
                 required_height = label.heightForWidth(label.contentsRect().width())
                 self.assertGreaterEqual(label.contentsRect().height(), required_height)
@@ -934,7 +1378,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
         self.assertEqual(narrow_heights[1], narrow_heights[3])
         self.assertEqual(narrow_heights[2], narrow_heights[3])
         for index in range(3):
-            card = window.list_widget.itemWidget(window.list_widget.item(index))
+            card = self._hover_card(window, index)
             self.assertTrue(
                 any(line.endswith("…") for line in card.task_text_label.displayed_lines())
             )
@@ -942,7 +1386,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
             self.assertTrue(card.task_text_label.needs_details())
         self._assert_card_gaps(window)
 
-        first_card = window.list_widget.itemWidget(window.list_widget.item(0))
+        first_card = self._hover_card(window, 0)
         idle_task_geometry = first_card.task_text_label.geometry()
         idle_timer_geometry = first_card.timer_display_label.geometry()
         first_card.enterEvent(
@@ -958,7 +1402,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
         self._settle_list_layout(window)
         self.assertEqual(self._card_heights(window), wide_heights)
         for index, logical_lines in enumerate(expected_logical_lines):
-            card = window.list_widget.itemWidget(window.list_widget.item(index))
+            card = self._hover_card(window, index)
             self.assertEqual(card.task_text_label.displayed_lines(), logical_lines)
             self.assertEqual(card.task_text_label.toolTip(), "")
             self.assertEqual(
@@ -1158,8 +1602,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
             central_widget.width() - add_button_right,
         )
 
-        item = window.list_widget.item(0)
-        card = window.list_widget.itemWidget(item)
+        card = self._hover_card(window, 0)
         left_margin, right_margin = self._card_outer_margins(window)
         self.assertLessEqual(abs(left_margin - right_margin), 1)
         self.assertLessEqual(card.width(), window.list_widget.viewport().width())
@@ -1168,6 +1611,129 @@ class TodoListCardIntegrationTest(unittest.TestCase):
             Qt.ScrollBarPolicy.ScrollBarAlwaysOff,
         )
 
+    def test_completed_filter_reads_archive_and_reopening_restores_task(self) -> None:
+        archived = {
+            "id": 2,
+            "text": "归档中的任务",
+            "priority": "中",
+            "completed": True,
+            "completedAt": "2026-01-01T00:00:00+00:00",
+            "dueDate": None,
+            "createdAt": "2025-12-01T00:00:00+00:00",
+            "snoozeUntil": None,
+        }
+        mocks = {}
+        for target, kwargs in (
+            ("save_todos", {}),
+            ("load_archived_todos", {"return_value": [archived]}),
+            ("remove_archived_todo", {"return_value": dict(archived)}),
+        ):
+            patcher = patch(f"todo_app.main_window.{target}", **kwargs)
+            mocks[target] = patcher.start()
+            self.addCleanup(patcher.stop)
+        window = self._create_window()
+
+        mocks["load_archived_todos"].assert_not_called()
+        window.filter_combo.setCurrentText("已完成")
+        self.assertEqual(window.todo_model.todo_at(0)["id"], 2)
+
+        window.toggle_complete_todo(2)
+
+        mocks["remove_archived_todo"].assert_called_once_with(2)
+        restored = next(todo for todo in window.todos if todo["id"] == 2)
+        self.assertFalse(restored["completed"])
+        self.assertIsNone(restored["completedAt"])
+        window._save_worker.flush()
+        mocks["save_todos"].assert_called()
+
+    def test_filtered_list_keeps_tasks_with_duplicate_ids(self) -> None:
+        first = {
+            "id": 1,
+            "text": "首个任务",
+            "priority": "高",
+            "completed": False,
+            "dueDate": None,
+            "createdAt": "2026-07-17T00:00:00+00:00",
+            "snoozeUntil": None,
+        }
+        duplicate = {**first, "text": "同 ID 的任务"}
+        window = self._create_window(todos=[first, duplicate])
+
+        for filter_text in ("全部", "未完成", "高优先级"):
+            window.filter_combo.setCurrentText(filter_text)
+            model = window.todo_model
+            self.assertEqual(
+                [model.todo_at(row)["text"] for row in range(model.rowCount())],
+                ["首个任务", "同 ID 的任务"],
+                filter_text,
+            )
+
+    def test_reopening_archived_task_saves_main_file_before_dropping_archive_record(
+        self,
+    ) -> None:
+        archived = {
+            "id": 2,
+            "text": "归档中的任务",
+            "priority": "中",
+            "completed": True,
+            "completedAt": "2026-01-01T00:00:00+00:00",
+            "dueDate": None,
+            "createdAt": "2025-12-01T00:00:00+00:00",
+            "snoozeUntil": None,
+        }
+        saved_ids: list[list[object]] = []
+
+        class SimulatedCrash(Exception):
+            pass
+
+        def save(snapshot: list[dict]) -> bool:
+            saved_ids.append([todo["id"] for todo in snapshot])
+            return True
+
+        for target, kwargs in (
+            ("save_todos", {"side_effect": save}),
+            ("load_archived_todos", {"return_value": [archived]}),
+            ("remove_archived_todo", {"side_effect": SimulatedCrash}),
+        ):
+            patcher = patch(f"todo_app.main_window.{target}", **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        window = self._create_window()
+
+        # 追加归档删除记录时进程中断：主文件此前必须已写入重新打开的任务。
+        with self.assertRaises(SimulatedCrash):
+            window.toggle_complete_todo(2)
+
+        self.assertIn(2, saved_ids[-1])
+
+    def test_failed_main_save_keeps_reopened_task_in_archive(self) -> None:
+        archived = {
+            "id": 2,
+            "text": "归档中的任务",
+            "priority": "中",
+            "completed": True,
+            "completedAt": "2026-01-01T00:00:00+00:00",
+            "dueDate": None,
+            "createdAt": "2025-12-01T00:00:00+00:00",
+            "snoozeUntil": None,
+        }
+        mocks = {}
+        for target, kwargs in (
+            ("save_todos", {"return_value": False}),
+            ("load_archived_todos", {"return_value": [archived]}),
+            ("remove_archived_todo", {}),
+        ):
+            patcher = patch(f"todo_app.main_window.{target}", **kwargs)
+            mocks[target] = patcher.start()
+            self.addCleanup(patcher.stop)
+        window = self._create_window()
+
+        window.toggle_complete_todo(2)
+
+        mocks["save_todos"].assert_called()
+        mocks["remove_archived_todo"].assert_not_called()
+        self.assertIn(2, window._store)
+
     def test_visible_task_details_hide_when_list_scrolls_card(self) -> None:
         common_fields = {
             "priority": "中",
@@ -1192,8 +1758,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
 
         scrollbar = window.list_widget.verticalScrollBar()
         self.assertGreater(scrollbar.maximum(), scrollbar.minimum())
-        item = window.list_widget.item(2)
-        card = window.list_widget.itemWidget(item)
+        card = self._hover_card(window, 2)
         card.task_text_label.enterEvent(
             QEnterEvent(QPointF(1, 1), QPointF(1, 1), QPointF(1, 1))
         )
@@ -1229,33 +1794,45 @@ class TodoListCardIntegrationTest(unittest.TestCase):
                 break
             previous_geometry = current_geometry
 
+    @classmethod
+    def _hover_card(cls, window: ModernTodoAppWindow, row: int) -> TodoItemWidget:
+        """模拟鼠标移到该行，返回视图为其打开的真实卡片。"""
+
+        window.list_widget.set_hovered_row(row)
+        cls.app.processEvents()
+        card = window.list_widget.card_widget(row)
+        assert card is not None
+        return card
+
     @staticmethod
-    def _card_heights(window: ModernTodoAppWindow) -> list[int]:
+    def _row_rect(window: ModernTodoAppWindow, row: int) -> QRect:
+        return window.list_widget.visualRect(window.todo_model.index(row, 0))
+
+    @classmethod
+    def _card_heights(cls, window: ModernTodoAppWindow) -> list[int]:
         return [
-            window.list_widget.itemWidget(window.list_widget.item(index)).height()
-            for index in range(window.list_widget.count())
+            cls._row_rect(window, row).height()
+            for row in range(window.todo_model.rowCount())
         ]
 
     def _assert_card_gaps(self, window: ModernTodoAppWindow) -> None:
-        for index in range(window.list_widget.count() - 1):
-            current = window.list_widget.itemWidget(window.list_widget.item(index))
-            following = window.list_widget.itemWidget(window.list_widget.item(index + 1))
-            self.assertEqual(
-                following.geometry().top() - current.geometry().bottom() - 1,
-                8,
-            )
+        for row in range(window.todo_model.rowCount() - 1):
+            current = self._row_rect(window, row)
+            following = self._row_rect(window, row + 1)
+            self.assertEqual(following.top() - current.bottom() - 1, 8)
 
-    @staticmethod
+    @classmethod
     def _card_outer_margins(
+        cls,
         window: ModernTodoAppWindow,
         index: int = 0,
     ) -> tuple[int, int]:
-        item = window.list_widget.item(index)
-        card = window.list_widget.itemWidget(item)
+        card_rect = cls._row_rect(window, index)
+        viewport = window.list_widget.viewport()
         central_widget = window.centralWidget()
-        left_margin = card.mapTo(central_widget, QPoint(0, 0)).x()
-        right_margin = central_widget.width() - card.mapTo(
-            central_widget, QPoint(card.width(), 0)
+        left_margin = viewport.mapTo(central_widget, card_rect.topLeft()).x()
+        right_margin = central_widget.width() - viewport.mapTo(
+            central_widget, QPoint(card_rect.right() + 1, 0)
         ).x()
         return left_margin, right_margin
 
@@ -1320,6 +1897,7 @@ class TodoListCardIntegrationTest(unittest.TestCase):
         self.addCleanup(load_patcher.stop)
         window = ModernTodoAppWindow()
         window.master_timer.stop()
+        window._reminder_timer.stop()
         self.addCleanup(self._close_window, window)
         return window
 
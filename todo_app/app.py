@@ -3,17 +3,19 @@ from __future__ import annotations
 
 import sys
 
-from PySide6.QtCore import QMessageLogContext, QtMsgType, qInstallMessageHandler
+from PySide6.QtCore import QMessageLogContext, QSettings, QtMsgType, qInstallMessageHandler
 from PySide6.QtWidgets import QApplication
 
 from .constants import (
     APP_ICON_PATH,
     APP_NAME,
     APP_VERSION,
+    SETTINGS_APPLICATION,
     SETTINGS_ORGANIZATION,
 )
 from .fonts import apply_application_font
 from .main_window import ModernTodoAppWindow
+from .storage import StorageOptions, configure_storage
 from .utils import get_icon
 
 
@@ -35,6 +37,33 @@ def _filter_qt_messages(mode: QtMsgType, context: QMessageLogContext, message: s
 _original_qt_message_handler = qInstallMessageHandler(_filter_qt_messages)
 
 
+def _storage_options_from_settings(settings: QSettings) -> StorageOptions:
+    """读取 ``storage/`` 分组的存储配置，缺省项沿用 ``StorageOptions`` 的默认值。"""
+
+    defaults = StorageOptions()
+    archive_after_days = settings.value("storage/archiveAfterDays", defaults.archive_after_days)
+    return StorageOptions(
+        backend=str(settings.value("storage/backend", defaults.backend)),
+        data_format=str(settings.value("storage/dataFormat", defaults.data_format)),
+        journal_enabled=settings.value(
+            "storage/journalEnabled", defaults.journal_enabled, type=bool
+        ),
+        archive_after_days=(
+            None if archive_after_days in (None, "") else float(archive_after_days)
+        ),
+    )
+
+
+def _configure_storage_from_settings() -> None:
+    """在加载数据前应用用户设置中的存储配置；设置无效时保留默认配置。"""
+
+    settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+    try:
+        configure_storage(_storage_options_from_settings(settings))
+    except ValueError as exc:
+        print(f"警告: 存储设置无效，将使用默认配置: {exc}")
+
+
 def run() -> None:
     """启动桌面应用。"""
     app = QApplication.instance() or QApplication(sys.argv)
@@ -44,6 +73,7 @@ def run() -> None:
     app.setWindowIcon(get_icon(APP_ICON_PATH, "TD"))
     app.setQuitOnLastWindowClosed(False)
     apply_application_font()
+    _configure_storage_from_settings()
 
     main_window = ModernTodoAppWindow()
     if main_window.isMinimized() or main_window.isHidden():
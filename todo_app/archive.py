@@ -0,0 +1,105 @@
+"""已完成任务归档文件的记录格式、筛选与重放规则。"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .journal import apply_journal_records
+
+
+ARCHIVE_FORMAT_VERSION = 1
+_SEPARATORS = (",", ":")
+
+
+@dataclass(frozen=True)
+class ArchiveReplay:
+    """归档重放结果；``skipped`` 为无法解析而被忽略的行数（通常是断电留下的半行）。"""
+
+    todos: dict[int, dict[str, Any]]
+    record_count: int
+    skipped: int = 0
+
+
+def archive_path(data_file: Path) -> Path:
+    return data_file.with_name(f"{data_file.stem}.archive.jsonl")
+
+
+def encode_archive_header() -> bytes:
+    return json.dumps({"archive": ARCHIVE_FORMAT_VERSION}, separators=_SEPARATORS).encode() + b"\n"
+
+
+def completed_at(todo: dict[str, Any]) -> datetime | None:
+    """返回任务的完成时刻；未完成、缺少或无法解析 ``completedAt`` 时返回 None。"""
+
+    if not todo.get("completed", False):
+        return None
+    value = todo.get("completedAt")
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def split_archivable(
+    todos: list[Any], cutoff: datetime
+) -> tuple[list[Any], list[dict[str, Any]]]:
+    """按原顺序拆分为留在主文件的任务与完成时刻早于 ``cutoff`` 的任务。"""
+
+    hot: list[Any] = []
+    cold: list[dict[str, Any]] = []
+    for todo in todos:
+        finished = completed_at(todo) if isinstance(todo, dict) else None
+        if (
+            finished is not None
+            and finished < cutoff
+            and type(todo.get("id")) is int
+        ):
+            cold.append(todo)
+        else:
+            hot.append(todo)
+    return hot, cold
+
+
+def replay_archive(raw_archive: bytes) -> ArchiveReplay:
+    """按追加顺序重放 put/del 记录；损坏的行被跳过，后续记录仍然生效。"""
+
+    header_end = raw_archive.find(b"\n")
+    try:
+        header = json.loads(raw_archive[:header_end]) if header_end >= 0 else None
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("archive") != ARCHIVE_FORMAT_VERSION:
+        raise ValueError("归档文件缺少有效的文件头")
+
+    todos: dict[int, dict[str, Any]] = {}
+    record_count = skipped = 0
+    for line in raw_archive[header_end + 1 :].split(b"\n"):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line.decode("utf-8"))
+            apply_journal_records(todos, [record])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            skipped += 1
+            continue
+        record_count += 1
+    return ArchiveReplay(todos, record_count, skipped)
+
+
+__all__ = [
+    "ARCHIVE_FORMAT_VERSION",
+    "ArchiveReplay",
+    "archive_path",
+    "completed_at",
+    "encode_archive_header",
+    "replay_archive",
+    "split_archivable",
+]
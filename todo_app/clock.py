@@ -0,0 +1,201 @@
+"""进程级时钟服务：所有周期性唤醒共用一个按墙钟边界对齐的计时器。"""
+from __future__ import annotations
+
+import time
+from functools import partial
+from typing import Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+SECOND_PRECISION_MS = 1000
+MINUTE_PRECISION_MS = 60 * 1000
+HOUR_PRECISION_MS = 60 * 60 * 1000
+
+# 计时器只会按粒度提前或推后触发，目标时刻略晚于边界可避免“差几毫秒”的补触发。
+_COARSE_MARGIN_MS = 50
+_VERY_COARSE_MARGIN_MS = 500
+
+
+def _wall_clock_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class ClockSubscription(QObject):
+    """订阅者持有的计时句柄，用法与 QTimer 的常用子集一致。
+
+    ``interval`` 是订阅者需要的刷新精度，触发时刻对齐到墙钟的整倍数边界；
+    停止后不再占用服务的唤醒，全部订阅停止时服务自身也停止计时。
+    """
+
+    timeout = Signal()
+
+    def __init__(
+        self,
+        service: "ClockService",
+        interval_ms: int,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._service = service
+        self._interval_ms = max(1, int(interval_ms))
+        self._next_due_ms = 0
+        self._active = False
+        # 父对象析构会连带删除句柄，借 destroyed 让服务丢弃失效订阅；
+        # 析构期间不碰计时器，服务最多再空转一次唤醒后自行停下。
+        self.destroyed.connect(partial(service._forget, id(self)))
+
+    def interval(self) -> int:
+        return self._interval_ms
+
+    def setInterval(self, interval_ms: int) -> None:  # noqa: N802 - 与 QTimer 保持一致
+        self._interval_ms = max(1, int(interval_ms))
+        if self._active:
+            self._service._attach(self)
+
+    def isActive(self) -> bool:  # noqa: N802 - 与 QTimer 保持一致
+        return self._active
+
+    def start(self, interval_ms: Optional[int] = None) -> None:
+        if interval_ms is not None:
+            self._interval_ms = max(1, int(interval_ms))
+        self._active = True
+        self._service._attach(self)
+
+    def stop(self) -> None:
+        if not self._active:
+            return
+        self._active = False
+        self._service._discard(id(self))
+
+
+class ClockService(QObject):
+    """合并所有周期刷新的唤醒，并在没有活动订阅时完全停止。
+
+    每个活动订阅记录下一个对齐边界；服务只挂一个单次计时器指向最近的边界，
+    同一边界到期的订阅在一次唤醒里依次发出 ``timeout``。分钟及以上精度的唤醒
+    使用 ``VeryCoarseTimer``，秒级唤醒使用 ``CoarseTimer``。
+    """
+
+    def __init__(
+        self,
+        now_ms: Callable[[], int] = _wall_clock_ms,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._now_ms = now_ms
+        self._subscriptions: Dict[int, ClockSubscription] = {}
+        self._wakeups = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def subscribe(
+        self,
+        interval_ms: int = SECOND_PRECISION_MS,
+        parent: Optional[QObject] = None,
+    ) -> ClockSubscription:
+        """创建未启动的订阅句柄；调用其 ``start`` 后才开始占用唤醒。"""
+
+        return ClockSubscription(self, interval_ms, parent)
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def active_subscription_count(self) -> int:
+        return len(self._subscriptions)
+
+    def finest_interval(self) -> Optional[int]:
+        """返回活动订阅中最细的精度，没有活动订阅时为 None。"""
+
+        return min(
+            (subscription._interval_ms for subscription in self._subscriptions.values()),
+            default=None,
+        )
+
+    def wakeup_count(self) -> int:
+        """返回累计唤醒次数，用于度量合并效果。"""
+
+        return self._wakeups
+
+    def _next_boundary(self, now_ms: int, interval_ms: int) -> int:
+        return (now_ms // interval_ms + 1) * interval_ms
+
+    def _attach(self, subscription: ClockSubscription) -> None:
+        subscription._next_due_ms = self._next_boundary(
+            self._now_ms(), subscription._interval_ms
+        )
+        self._subscriptions[id(subscription)] = subscription
+        self._reschedule()
+
+    def _discard(self, key: int) -> None:
+        if self._subscriptions.pop(key, None) is not None:
+            self._reschedule()
+
+    def _forget(self, key: int) -> None:
+        self._subscriptions.pop(key, None)
+
+    def _reschedule(self) -> None:
+        if not self._subscriptions:
+            self._timer.stop()
+            return
+        now_ms = self._now_ms()
+        subscriptions = self._subscriptions.values()
+        for subscription in subscriptions:
+            interval_ms = subscription._interval_ms
+            if subscription._next_due_ms - now_ms > interval_ms:
+                # 系统时间回拨后重新对齐，避免订阅被推迟到旧边界。
+                subscription._next_due_ms = self._next_boundary(now_ms, interval_ms)
+        next_due_ms = min(subscription._next_due_ms for subscription in subscriptions)
+        coarsest_due = all(
+            subscription._interval_ms >= MINUTE_PRECISION_MS
+            for subscription in subscriptions
+            if subscription._next_due_ms == next_due_ms
+        )
+        delay_ms = max(0, next_due_ms - now_ms)
+        if coarsest_due and delay_ms >= 2 * SECOND_PRECISION_MS:
+            self._timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+            delay_ms += _VERY_COARSE_MARGIN_MS
+        else:
+            self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+            delay_ms += _COARSE_MARGIN_MS
+        self._timer.start(delay_ms)
+
+    def _on_timeout(self) -> None:
+        self._wakeups += 1
+        now_ms = self._now_ms()
+        due = [
+            subscription
+            for subscription in self._subscriptions.values()
+            if subscription._next_due_ms <= now_ms
+        ]
+        for subscription in due:
+            subscription._next_due_ms = self._next_boundary(
+                now_ms, subscription._interval_ms
+            )
+        for subscription in due:
+            # 前一个订阅者的槽可能停止或删除了后面的订阅。
+            if subscription._active and id(subscription) in self._subscriptions:
+                subscription.timeout.emit()
+        self._reschedule()
+
+
+_CLOCK_SERVICE: Optional[ClockService] = None
+
+
+def get_clock_service() -> ClockService:
+    """获取全局时钟服务实例。"""
+
+    global _CLOCK_SERVICE
+    if _CLOCK_SERVICE is None:
+        _CLOCK_SERVICE = ClockService()
+    return _CLOCK_SERVICE
+
+
+__all__ = [
+    "ClockService",
+    "ClockSubscription",
+    "HOUR_PRECISION_MS",
+    "MINUTE_PRECISION_MS",
+    "SECOND_PRECISION_MS",
+    "get_clock_service",
+]
@@ -0,0 +1,453 @@
+"""列式二进制待办快照：按字段分列存储，支持 mmap 按需读取单列。"""
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from typing import Any, Iterable
+
+
+COLUMNAR_MAGIC = b"TODOCOL\x01"
+_PREFIX_SIZE = len(COLUMNAR_MAGIC) + 8
+_ALIGNMENT = 8
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# int64 列的保留值；真实取值落入保留区间时改存到逐行覆盖表。
+NULL_VALUE = -(2**63)
+OVERRIDDEN_VALUE = NULL_VALUE + 1
+MISSING_VALUE = NULL_VALUE + 2
+_MIN_PLAIN_INT = NULL_VALUE + 3
+_MAX_PLAIN_INT = 2**63 - 1
+
+TIMESTAMP_FIELDS = ("createdAt", "dueDate", "snoozeUntil", "lastNotifiedAt", "completedAt")
+INT_FIELDS = ("id", "reminderOffset")
+FLAG_FIELDS = ("completed", "notifiedForReminder", "notifiedForDue")
+PRIORITY_CODES = ("高", "中", "低")
+_PRIORITY_OVERRIDDEN = 255
+_PRIORITY_LOOKUP = PRIORITY_CODES + (None,) * (256 - len(PRIORITY_CODES))
+_PRIORITY_CODE_SET = frozenset((*range(len(PRIORITY_CODES)), _PRIORITY_OVERRIDDEN))
+_BITS = tuple(tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256))
+_FIELD_ORDER = (
+    "id",
+    "text",
+    "createdAt",
+    "completed",
+    "completedAt",
+    "priority",
+    "dueDate",
+    "reminderOffset",
+    "snoozeUntil",
+    "lastNotifiedAt",
+    "notifiedForReminder",
+    "notifiedForDue",
+)
+_COLUMN_FIELDS = frozenset(_FIELD_ORDER)
+# 后续版本新增的列；旧快照缺少这些列时视为所有行都没有该字段。
+_OPTIONAL_COLUMNS = frozenset({"completedAt"})
+# 解码时标记“该行没有此字段”，组装记录时删除对应键。
+_MISSING = object()
+_TIMESTAMP_SENTINELS = {NULL_VALUE: None, OVERRIDDEN_VALUE: None, MISSING_VALUE: _MISSING}
+
+
+def is_columnar_snapshot(prefix: bytes) -> bool:
+    return prefix[: len(COLUMNAR_MAGIC)] == COLUMNAR_MAGIC
+
+
+def timestamp_to_us(value: Any) -> int | None:
+    """UTC ``isoformat`` 字符串转为纪元微秒；无法无损还原原字符串时返回 None。"""
+
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.utcoffset() != timedelta(0):
+        return None
+    epoch_us = (parsed - _EPOCH) // _ONE_MICROSECOND
+    if not _MIN_PLAIN_INT <= epoch_us <= _MAX_PLAIN_INT or us_to_timestamp(epoch_us) != value:
+        return None
+    return epoch_us
+
+
+def us_to_timestamp(epoch_us: int) -> str:
+    return (_EPOCH + timedelta(microseconds=epoch_us)).isoformat()
+
+
+def _plain_int(value: Any) -> int | None:
+    if type(value) is int and _MIN_PLAIN_INT <= value <= _MAX_PLAIN_INT:
+        return value
+    return None
+
+
+def _little_endian_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def encode_columnar_snapshot(todos: Iterable[dict[str, Any]], schema_version: int) -> bytes:
+    """把任务列表编码为列式快照；列无法无损表达的字段按行记录在头部覆盖表中。"""
+
+    int64_columns = {name: array("q") for name in (*INT_FIELDS, *TIMESTAMP_FIELDS)}
+    flag_columns = {name: bytearray() for name in FLAG_FIELDS}
+    priorities = bytearray()
+    text_offsets = array("q", [0])
+    text_parts: list[bytes] = []
+    text_length = 0
+    overrides: dict[str, dict[str, Any]] = {}
+    count = 0
+
+    for row, todo in enumerate(todos):
+        count += 1
+        override_set: dict[str, Any] = {}
+        override_unset: list[str] = []
+
+        for name in INT_FIELDS:
+            value = todo.get(name, None)
+            encoded = _plain_int(value)
+            if encoded is None:
+                encoded = OVERRIDDEN_VALUE
+                if name in todo:
+                    override_set[name] = value
+                else:
+                    override_unset.append(name)
+            int64_columns[name].append(encoded)
+
+        for name in TIMESTAMP_FIELDS:
+            value = todo.get(name, None)
+            if name not in todo:
+                encoded = MISSING_VALUE
+            elif value is None:
+                encoded = NULL_VALUE
+            else:
+                encoded = timestamp_to_us(value)
+                if encoded is None:
+                    encoded = OVERRIDDEN_VALUE
+                    override_set[name] = value
+            int64_columns[name].append(encoded)
+
+        if row % 8 == 0:
+            for column in flag_columns.values():
+                column.append(0)
+        for name in FLAG_FIELDS:
+            value = todo.get(name, None)
+            if type(value) is bool:
+                if value:
+                    flag_columns[name][row >> 3] |= 1 << (row & 7)
+            elif name in todo:
+                override_set[name] = value
+            else:
+                override_unset.append(name)
+
+        priority = todo.get("priority", None)
+        if isinstance(priority, str) and priority in PRIORITY_CODES:
+            priorities.append(PRIORITY_CODES.index(priority))
+        else:
+            priorities.append(_PRIORITY_OVERRIDDEN)
+            if "priority" in todo:
+                override_set["priority"] = priority
+            else:
+                override_unset.append("priority")
+
+        text = todo.get("text", None)
+        if isinstance(text, str):
+            encoded_text = text.encode("utf-8")
+            text_parts.append(encoded_text)
+            text_length += len(encoded_text)
+        elif "text" in todo:
+            override_set["text"] = text
+        else:
+            override_unset.append("text")
+        text_offsets.append(text_length)
+
+        for name, value in todo.items():
+            if name not in _COLUMN_FIELDS:
+                override_set[name] = value
+        if override_set or override_unset:
+            override: dict[str, Any] = {}
+            if override_set:
+                override["set"] = override_set
+            if override_unset:
+                override["unset"] = override_unset
+            overrides[str(row)] = override
+
+    blocks: list[tuple[str, str, bytes]] = [
+        *((name, "int64", _little_endian_bytes(values)) for name, values in int64_columns.items()),
+        *((name, "bitset", bytes(values)) for name, values in flag_columns.items()),
+        ("priority", "uint8", bytes(priorities)),
+        ("textOffsets", "int64", _little_endian_bytes(text_offsets)),
+        ("text", "utf8", b"".join(text_parts)),
+    ]
+    columns: dict[str, list[Any]] = {}
+    offset = 0
+    for name, kind, data in blocks:
+        columns[name] = [kind, offset, len(data)]
+        offset += -(-len(data) // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps(
+        {
+            "schemaVersion": schema_version,
+            "count": count,
+            "columns": columns,
+            "overrides": overrides,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header += b" " * (-(_PREFIX_SIZE + len(header)) % _ALIGNMENT)
+
+    parts = [
+        COLUMNAR_MAGIC,
+        len(header).to_bytes(4, "little"),
+        bytes(4),
+        header,
+    ]
+    for _name, _kind, data in blocks:
+        parts.append(data)
+        parts.append(bytes(-len(data) % _ALIGNMENT))
+    return b"".join(parts)
+
+
+class ColumnarSnapshot:
+    """在 bytes 或 mmap 之上按需解码的列式快照。
+
+    构造时只解析头部并校验各列长度；``int64``/``flags``/``priority_codes`` 返回零拷贝视图，
+    ``values`` 只解码单个字段，``records`` 才构建完整的任务字典。
+    """
+
+    def __init__(self, buffer: Any):
+        self._view = memoryview(buffer).cast("B")
+        self._int64_cache: dict[str, Any] = {}
+        self._overrides: dict[int, dict[str, Any]] = {}
+        try:
+            self._parse_header()
+        except Exception:
+            # 构造失败时也要归还缓冲区引用，否则调用方无法关闭 mmap。
+            self.release()
+            raise
+
+    def _parse_header(self) -> None:
+        if not is_columnar_snapshot(bytes(self._view[: len(COLUMNAR_MAGIC)])):
+            raise ValueError("不是列式待办快照")
+        length_start = len(COLUMNAR_MAGIC)
+        header_length = int.from_bytes(self._view[length_start : length_start + 4], "little")
+        header_end = _PREFIX_SIZE + header_length
+        if header_end > len(self._view):
+            raise ValueError("列式快照头部不完整")
+        header = json.loads(bytes(self._view[_PREFIX_SIZE:header_end]).decode("utf-8"))
+        if not isinstance(header, dict):
+            raise ValueError("列式快照头部不是对象")
+        self.schema_version = header.get("schemaVersion")
+        self.count = header.get("count")
+        if type(self.count) is not int or self.count < 0:
+            raise ValueError(f"列式快照记录数无效: {self.count!r}")
+        self._data_start = header_end
+        self._columns = self._checked_columns(header.get("columns"))
+        offsets = self.int64("textOffsets")
+        if offsets[0] != 0 or offsets[-1] != self._columns["text"][2]:
+            raise ValueError("列式快照的正文偏移与正文长度不符")
+        overrides = header.get("overrides", {})
+        if not isinstance(overrides, dict):
+            raise ValueError("列式快照覆盖表不是对象")
+        self._overrides = {}
+        for row, override in overrides.items():
+            row_index = int(row)
+            if not 0 <= row_index < self.count or not isinstance(override, dict):
+                raise ValueError(f"列式快照覆盖表第 {row!r} 行无效")
+            self._overrides[row_index] = override
+
+    def _checked_columns(self, columns: Any) -> dict[str, tuple[str, int, int]]:
+        if not isinstance(columns, dict):
+            raise ValueError("列式快照缺少列目录")
+        expected_kinds = {
+            **{name: "int64" for name in (*INT_FIELDS, *TIMESTAMP_FIELDS, "textOffsets")},
+            **{name: "bitset" for name in FLAG_FIELDS},
+            "priority": "uint8",
+            "text": "utf8",
+        }
+        checked: dict[str, tuple[str, int, int]] = {}
+        for name, kind in expected_kinds.items():
+            entry = columns.get(name)
+            if entry is None and name in _OPTIONAL_COLUMNS:
+                continue
+            if not isinstance(entry, list) or len(entry) != 3 or entry[0] != kind:
+                raise ValueError(f"列式快照缺少列 {name}")
+            _kind, offset, length = entry
+            expected_length = {
+                "int64": (self.count + (name == "textOffsets")) * 8,
+                "bitset": (self.count + 7) // 8,
+                "uint8": self.count,
+            }.get(kind, length)
+            if (
+                type(offset) is not int
+                or type(length) is not int
+                or offset < 0
+                or length != expected_length
+                or self._data_start + offset + length > len(self._view)
+            ):
+                raise ValueError(f"列式快照的列 {name} 越界或长度不符")
+            checked[name] = (kind, self._data_start + offset, length)
+        return checked
+
+    def _raw(self, name: str) -> memoryview:
+        _kind, start, length = self._columns[name]
+        return self._view[start : start + length]
+
+    def int64(self, name: str) -> Any:
+        """返回 int64 列（ID、时间戳微秒等）的只读序列，小端机器上为零拷贝视图。"""
+
+        cached = self._int64_cache.get(name)
+        if cached is None:
+            raw = self._raw(name)
+            if sys.byteorder == "big":
+                cached = array("q", raw.tobytes())
+                cached.byteswap()
+            else:
+                cached = raw.cast("q")
+            self._int64_cache[name] = cached
+        return cached
+
+    def flag(self, name: str, row: int) -> bool:
+        return bool(self._raw(name)[row >> 3] >> (row & 7) & 1)
+
+    def priority_codes(self) -> memoryview:
+        return self._raw("priority")
+
+    def text(self, row: int) -> str:
+        offsets = self.int64("textOffsets")
+        return bytes(self._raw("text")[offsets[row] : offsets[row + 1]]).decode("utf-8")
+
+    def override(self, row: int) -> dict[str, Any] | None:
+        """该行无法用列表达的字段：``set`` 为原值，``unset`` 为缺失的字段名。"""
+
+        return self._overrides.get(row)
+
+    def _column_value(self, name: str, row: int) -> Any:
+        if name in INT_FIELDS:
+            return self.int64(name)[row]
+        if name in TIMESTAMP_FIELDS:
+            if name not in self._columns:
+                return _MISSING
+            value = self.int64(name)[row]
+            if value <= MISSING_VALUE:
+                return _TIMESTAMP_SENTINELS[value]
+            return us_to_timestamp(value)
+        if name in FLAG_FIELDS:
+            return self.flag(name, row)
+        if name == "priority":
+            return PRIORITY_CODES[self.priority_codes()[row]]
+        return self.text(row)
+
+    def _decode_column(self, name: str) -> list[Any]:
+        """整列解码；被覆盖的行得到占位值，由调用方替换。"""
+
+        if name in INT_FIELDS:
+            return self.int64(name).tolist()
+        if name in TIMESTAMP_FIELDS:
+            if name not in self._columns:
+                return [_MISSING] * self.count
+            return [
+                _TIMESTAMP_SENTINELS[value] if value <= MISSING_VALUE else us_to_timestamp(value)
+                for value in self.int64(name).tolist()
+            ]
+        if name in FLAG_FIELDS:
+            bits = chain.from_iterable(map(_BITS.__getitem__, self._raw(name)))
+            return list(islice(bits, self.count))
+        if name == "priority":
+            codes = self.priority_codes()
+            if not set(codes.tobytes()) <= _PRIORITY_CODE_SET:
+                raise ValueError("列式快照包含未知的优先级编码")
+            return [_PRIORITY_LOOKUP[code] for code in codes]
+        blob = self._raw("text").tobytes()
+        offsets = self.int64("textOffsets").tolist()
+        return [blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def values(self, name: str) -> list[Any]:
+        """只解码单个字段；缺失该字段的行返回 None。"""
+
+        result = self._decode_column(name) if name in _COLUMN_FIELDS else [None] * self.count
+        if name in TIMESTAMP_FIELDS:
+            result = [None if value is _MISSING else value for value in result]
+        for row, override in self._overrides.items():
+            if name in override.get("set", ()):
+                result[row] = override["set"][name]
+            elif name in override.get("unset", ()):
+                result[row] = None
+        return result
+
+    @staticmethod
+    def _apply_override(columns: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+        override_set = override.get("set", {})
+        override_unset = override.get("unset", ())
+        record: dict[str, Any] = {}
+        for name in _FIELD_ORDER:
+            if name in override_set:
+                record[name] = override_set[name]
+            elif name not in override_unset and columns.get(name, _MISSING) is not _MISSING:
+                record[name] = columns[name]
+        for name, value in override_set.items():
+            record.setdefault(name, value)
+        return record
+
+    def record(self, row: int) -> dict[str, Any]:
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        override = self._overrides.get(row)
+        if override is None:
+            record = {name: self._column_value(name, row) for name in _FIELD_ORDER}
+            for name in TIMESTAMP_FIELDS:
+                if record[name] is _MISSING:
+                    del record[name]
+            return record
+        override_unset = override.get("unset", ())
+        override_set = override.get("set", {})
+        columns = {
+            name: self._column_value(name, row)
+            for name in _FIELD_ORDER
+            if name not in override_set and name not in override_unset
+        }
+        return self._apply_override(columns, override)
+
+    def records(self) -> list[dict[str, Any]]:
+        """按列整体解码后组装全部任务，比逐行 ``record`` 少了大量单值访问。"""
+
+        columns = [self._decode_column(name) for name in _FIELD_ORDER]
+        records = [dict(zip(_FIELD_ORDER, values)) for values in zip(*columns)]
+        for name, column in zip(_FIELD_ORDER, columns):
+            if name in TIMESTAMP_FIELDS and _MISSING in column:
+                for record, value in zip(records, column):
+                    if value is _MISSING:
+                        del record[name]
+        for row, override in self._overrides.items():
+            records[row] = self._apply_override(records[row], override)
+        return records
+
+    def release(self) -> None:
+        """释放对底层缓冲区的引用，之后才能关闭 mmap。"""
+
+        for cached in self._int64_cache.values():
+            if isinstance(cached, memoryview):
+                cached.release()
+        self._int64_cache.clear()
+        self._view.release()
+
+
+__all__ = [
+    "COLUMNAR_MAGIC",
+    "ColumnarSnapshot",
+    "FLAG_FIELDS",
+    "INT_FIELDS",
+    "MISSING_VALUE",
+    "NULL_VALUE",
+    "OVERRIDDEN_VALUE",
+    "PRIORITY_CODES",
+    "TIMESTAMP_FIELDS",
+    "encode_columnar_snapshot",
+    "is_columnar_snapshot",
+    "timestamp_to_us",
+    "us_to_timestamp",
+]
@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, time, timezone
 from typing import Optional
 
-from PySide6.QtCore import QDateTime, QTime, QTimer, Qt, Signal, Slot
+from PySide6.QtCore import QDateTime, QEvent, QTime, Qt, Signal, Slot
 from PySide6.QtWidgets import (
     QDateEdit,
     QDialog,
@@ -22,6 +22,7 @@ from PySide6.QtWidgets import (
     QTimeEdit,
 )
 
+from .clock import SECOND_PRECISION_MS, get_clock_service
 from .constants import (
     APP_ICON_PATH,
     REMINDER_OPTIONS_MAP,
@@ -29,6 +30,7 @@ from .constants import (
 )
 from .utils import get_icon
 from .theme import ThemeColors, get_theme_manager
+from .scheduling import timestamp_datetime
 
 
 def _default_due_datetime(now_qdt: QDateTime) -> QDateTime:
@@ -53,8 +55,7 @@ class NotificationDialog(QDialog):
         self._build_ui()
         self.add_or_update_tasks(requests)
         self._apply_palette(self._palette)
-        self._relative_time_timer = QTimer(self)
-        self._relative_time_timer.setInterval(1000)
+        self._relative_time_timer = get_clock_service().subscribe(SECOND_PRECISION_MS, self)
         self._relative_time_timer.timeout.connect(self._refresh_relative_times)
         self._relative_time_timer.start()
 
@@ -187,6 +188,18 @@ class NotificationDialog(QDialog):
         row["detail_label"].setText(self._format_due_text(todo_item))
         row["status_label"].setText("已到期" if row["is_due"] else "提前提醒")
 
+    def showEvent(self, event: QEvent) -> None:  # noqa: N802
+        super().showEvent(event)
+        if not self._relative_time_timer.isActive():
+            # 隐藏期间的相对时间一次补齐，再恢复逐秒刷新。
+            self._refresh_relative_times()
+            self._relative_time_timer.start()
+
+    def hideEvent(self, event: QEvent) -> None:  # noqa: N802
+        super().hideEvent(event)
+        # 随主窗口收进托盘时不再占用时钟唤醒。
+        self._relative_time_timer.stop()
+
     def _refresh_relative_times(self) -> None:
         current_time_utc = datetime.now(timezone.utc)
         for row in self._task_rows.values():
@@ -200,12 +213,10 @@ class NotificationDialog(QDialog):
         due_date_str = todo_item.get("dueDate")
         if not due_date_str:
             return "未设置截止时间"
-        try:
-            due_date = datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
-        except ValueError:
+        # 不带时区的截止时间按本地时间解读。
+        due_date = timestamp_datetime(todo_item, "dueDate", naive_local=True)
+        if due_date is None:
             return "截止时间格式错误"
-        if due_date.tzinfo is None:
-            due_date = due_date.astimezone()
         if current_time_utc is None:
             current_time_utc = datetime.now(timezone.utc)
         elif current_time_utc.tzinfo is None:
@@ -213,7 +224,7 @@ class NotificationDialog(QDialog):
         else:
             current_time_utc = current_time_utc.astimezone(timezone.utc)
 
-        diff = due_date.astimezone(timezone.utc) - current_time_utc
+        diff = due_date - current_time_utc
         duration_text = self._format_relative_duration(diff)
         if diff.total_seconds() < 0:
             relative_text = f"已超时 {duration_text}"
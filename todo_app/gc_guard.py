@@ -0,0 +1,113 @@
+"""把循环垃圾回收固定在 GUI 线程执行的守卫。"""
+from __future__ import annotations
+
+import gc
+import threading
+from typing import Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+
+class _GuardRegistry:
+    """进程内存活守卫的计数；最后一个释放时恢复自动回收。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._active += 1
+            gc.disable()
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            if self._active > 0:
+                return
+            try:
+                gc.collect()
+            finally:
+                gc.enable()
+
+
+_REGISTRY = _GuardRegistry()
+
+
+class _GuardToken:
+    """单个守卫的持有状态；所有者析构时经 ``destroyed`` 释放，不再触碰已删除的计时器。"""
+
+    def __init__(self) -> None:
+        self.active = True
+        _REGISTRY.acquire()
+
+    def release(self, *_args: object) -> bool:
+        if not self.active:
+            return False
+        self.active = False
+        _REGISTRY.release()
+        return True
+
+
+class GuiThreadGarbageCollector(QObject):
+    """把循环垃圾回收固定在 GUI 线程执行。
+
+    自动回收由恰好分配内存的线程触发；若后台保存线程回收到仍带 Qt 对象的引用环，
+    会在非 GUI 线程析构控件并导致崩溃。存活期间关闭全进程的自动回收（包括保存与
+    日志折叠线程），由 GUI 线程定时按原阈值补做；多个实例并存时，最后一个停止后才
+    恢复自动回收。``stop`` 之外，守卫随所有者析构时也会释放，不会让进程长期停在
+    手动回收状态。
+    """
+
+    def __init__(
+        self,
+        interval_ms: int = 1000,
+        parent: Optional[QObject] = None,
+        idle_interval_ms: int = 60 * 1000,
+    ):
+        super().__init__(parent)
+        self._interval_ms = interval_ms
+        self._idle_interval_ms = idle_interval_ms
+        self._thresholds = gc.get_threshold()
+        self._token = _GuardToken()
+        self.destroyed.connect(self._token.release)
+        # 回收检查与界面无关，不挂在时钟服务上，以免它为此常驻对齐唤醒。
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.collect_if_needed)
+        self._timer.start()
+
+    def is_active(self) -> bool:
+        return self._token.active
+
+    def collect_if_needed(self) -> None:
+        counts = gc.get_count()
+        for generation in (2, 1, 0):
+            if counts[generation] > self._thresholds[generation]:
+                gc.collect(generation)
+                return
+
+    def set_idle(self, idle: bool) -> None:
+        """窗口隐藏期间改为按空闲间隔检查，进入空闲前先按阈值补做一次。"""
+
+        if not self._token.active:
+            return
+        if idle:
+            self.collect_if_needed()
+            self._timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+            self._timer.start(self._idle_interval_ms)
+        else:
+            self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+            self._timer.start(self._interval_ms)
+
+    def stop(self) -> None:
+        """停止定时回收；没有其他实例时在当前（GUI）线程回收一次并恢复自动回收。"""
+
+        try:
+            self._timer.stop()
+        finally:
+            self._token.release()
+
+
+__all__ = ["GuiThreadGarbageCollector"]
@@ -0,0 +1,142 @@
+"""待办变更日志的记录格式、增量差异与重放规则。"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Hashable
+
+
+JOURNAL_FORMAT_VERSION = 1
+_SEPARATORS = (",", ":")
+
+
+@dataclass(frozen=True)
+class JournalReplay:
+    """日志重放结果；``valid_length`` 为最后一条完整记录之后的字节偏移。"""
+
+    todos: list[Any]
+    record_count: int
+    valid_length: int
+    stale: bool = False
+    truncated: bool = False
+
+
+def journal_path(data_file: Path) -> Path:
+    return data_file.with_name(f"{data_file.stem}.journal")
+
+
+def encode_journal_header(base_digest: str) -> bytes:
+    header = {"journal": JOURNAL_FORMAT_VERSION, "base": base_digest}
+    return json.dumps(header, separators=_SEPARATORS).encode("utf-8") + b"\n"
+
+
+def encode_journal_records(records: list[dict[str, Any]]) -> bytes:
+    return b"".join(
+        json.dumps(record, ensure_ascii=False, separators=_SEPARATORS).encode("utf-8") + b"\n"
+        for record in records
+    )
+
+
+def diff_todo_records(
+    previous: dict[int, dict[str, Any]], todos: list[Any]
+) -> list[dict[str, Any]] | None:
+    """计算从已落盘状态到当前列表的 put/del 记录。
+
+    日志只能表达“原位更新、末尾追加、删除”三种变化；出现缺失或重复 ID、
+    已有任务相对顺序改变或新任务插在旧任务之间时返回 None，由调用方改写完整快照。
+    """
+
+    current_ids: list[int] = []
+    for todo in todos:
+        todo_id = todo.get("id") if isinstance(todo, dict) else None
+        if not isinstance(todo_id, int) or isinstance(todo_id, bool):
+            return None
+        current_ids.append(todo_id)
+    current_id_set = set(current_ids)
+    if len(current_id_set) != len(current_ids):
+        return None
+
+    records: list[dict[str, Any]] = []
+    kept_previous = iter([todo_id for todo_id in previous if todo_id in current_id_set])
+    appending = False
+    for todo_id, todo in zip(current_ids, todos):
+        old = previous.get(todo_id)
+        if old is None:
+            appending = True
+            records.append({"op": "put", "todo": todo})
+            continue
+        if appending or next(kept_previous, None) != todo_id:
+            return None
+        if old != todo:
+            records.append({"op": "put", "todo": todo})
+
+    records.extend(
+        {"op": "del", "id": todo_id} for todo_id in previous if todo_id not in current_id_set
+    )
+    return records
+
+
+def apply_journal_records(ordered: dict[Hashable, Any], records: list[dict[str, Any]]) -> None:
+    """按日志语义更新以 ID 为键、保持列表顺序的任务映射。"""
+
+    for record in records:
+        if record.get("op") == "put":
+            todo = record["todo"]
+            ordered[todo["id"]] = todo
+        elif record.get("op") == "del":
+            ordered.pop(record["id"], None)
+        else:
+            raise ValueError(f"未知的日志操作 {record.get('op')!r}")
+
+
+def replay_journal(raw_journal: bytes, base_digest: str, todos: list[Any]) -> JournalReplay:
+    """在主文件内容之上重放日志；日志基准与主文件不一致时视为已折叠的旧日志。"""
+
+    header_end = raw_journal.find(b"\n")
+    try:
+        header = json.loads(raw_journal[:header_end]) if header_end >= 0 else None
+    except ValueError:
+        header = None
+    if (
+        not isinstance(header, dict)
+        or header.get("journal") != JOURNAL_FORMAT_VERSION
+        or header.get("base") != base_digest
+    ):
+        return JournalReplay(todos, 0, 0, stale=True)
+
+    ordered: dict[Hashable, Any] = {}
+    for position, todo in enumerate(todos):
+        todo_id = todo.get("id") if isinstance(todo, dict) else None
+        ordered[todo_id if isinstance(todo_id, int) else ("position", position)] = todo
+
+    record_count = 0
+    offset = header_end + 1
+    truncated = False
+    while offset < len(raw_journal):
+        line_end = raw_journal.find(b"\n", offset)
+        if line_end < 0:
+            truncated = True
+            break
+        try:
+            record = json.loads(raw_journal[offset:line_end].decode("utf-8"))
+            apply_journal_records(ordered, [record])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            truncated = True
+            break
+        record_count += 1
+        offset = line_end + 1
+
+    return JournalReplay(list(ordered.values()), record_count, offset, truncated=truncated)
+
+
+__all__ = [
+    "JOURNAL_FORMAT_VERSION",
+    "JournalReplay",
+    "apply_journal_records",
+    "diff_todo_records",
+    "encode_journal_header",
+    "encode_journal_records",
+    "journal_path",
+    "replay_journal",
+]
@@ -0,0 +1,131 @@
+"""待办 JSON 文档的增量解析：逐个产出任务项，避免整文件解码后再构建列表。"""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator
+
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class TodoDocumentStream:
+    """顺序读取顶层列表或 ``{"todos": [...]}`` 文档，按需向缓冲区补充数据。
+
+    先调用 ``open`` 定位到任务数组，此时 ``header`` 已包含 ``todos`` 之前的顶层键；
+    ``items`` 逐项产出任务并在结束时校验文档剩余部分，``header`` 随之补全。
+    缓冲区只保留尚未解析的文本，峰值内存约为已产出对象加上少量读取块。
+    """
+
+    def __init__(
+        self,
+        fp: BinaryIO,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.header: dict[str, Any] = {}
+        self.is_list = False
+
+    def open(self) -> None:
+        """解析到任务数组的起始方括号。"""
+
+        if self._expect("[{") == "[":
+            self.is_list = True
+            return
+        if self._peek() == "}":
+            raise ValueError("文档缺少 todos 列表")
+        while True:
+            key = self._member_key()
+            if key == "todos":
+                if self._peek() != "[":
+                    raise ValueError("文档的 todos 不是列表")
+                self._pos += 1
+                return
+            self.header[key] = self._decode_value()
+            if self._expect(",}") == "}":
+                raise ValueError("文档缺少 todos 列表")
+
+    def items(self) -> Iterator[Any]:
+        """逐项产出任务数组中的元素，随后校验文档直到文件末尾。"""
+
+        if self._peek() == "]":
+            self._pos += 1
+        else:
+            while True:
+                yield self._decode_value()
+                if self._expect(",]") == "]":
+                    break
+        if not self.is_list:
+            while self._expect(",}") == ",":
+                key = self._member_key()
+                if key == "todos":
+                    raise ValueError("文档包含重复的 todos 键")
+                self.header[key] = self._decode_value()
+        if self._peek():
+            raise ValueError(f"文档结束后仍有多余内容（偏移 {self._pos}）")
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """丢弃已解析的前缀并读取下一块；没有更多文本时返回 False。"""
+
+        if self._eof:
+            return False
+        raw = self._fp.read(max(self._chunk_size, min_size))
+        self._eof = not raw
+        text = self._text_decoder.decode(raw, final=self._eof)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return bool(raw or text)
+
+    def _peek(self) -> str:
+        """跳过空白并返回下一个字符；文件结束时返回空字符串。"""
+
+        while True:
+            buffer = self._buffer
+            self._pos = pos = _WHITESPACE.match(buffer, self._pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, choices: str) -> str:
+        char = self._peek()
+        if not char or char not in choices:
+            raise ValueError(f"预期 {choices!r} 之一，实际为 {char or '文件结尾'!r}")
+        self._pos += 1
+        return char
+
+    def _member_key(self) -> str:
+        if self._peek() != '"':
+            raise ValueError("对象键必须是字符串")
+        key = self._decode_value()
+        self._expect(":")
+        return key
+
+    def _decode_value(self) -> Any:
+        """解析一个完整 JSON 值；值恰好止于缓冲区末尾时补读，避免截断的数字被当作完整值。"""
+
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # 按未解析部分的长度补读，长任务项跨越多个块时重试次数保持对数级。
+                if not self._fill(len(self._buffer) - self._pos):
+                    raise
+                continue
+            if end == len(self._buffer) and self._fill(end - self._pos):
+                continue
+            self._pos = end
+            return value
+
+
+__all__ = ["DEFAULT_CHUNK_SIZE", "TodoDocumentStream"]
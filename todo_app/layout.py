@@ -5,8 +5,13 @@ Qt 边界负责提供字体、样式和屏幕几何的测量值；本模块只
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Literal, Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Iterable, Literal, Optional
+
+
+# 卡片布局结果的记忆上限；输入是不可变的测量值，相同卡片在不同视口宽度下各占一项。
+_TASK_CARD_LAYOUT_MEMO_SIZE = 2048
 
 
 @dataclass(frozen=True)
@@ -68,11 +73,13 @@ def calculate_card_width(viewport_width: int, list_spacing: int) -> int:
     return max(viewport_width - (max(list_spacing, 0) * 2), 0)
 
 
+@lru_cache(maxsize=_TASK_CARD_LAYOUT_MEMO_SIZE)
 def calculate_task_card_layout(values: TaskCardLayoutInput) -> TaskCardLayout:
     """按现有挤压优先级计算卡片区域尺寸。
 
     正文先让出超过其动态最小宽度的空间，计时区随后从自然宽度压缩到最小
-    宽度。viewport 再窄时仍保留两个区域的既有最小宽度。
+    宽度。viewport 再窄时仍保留两个区域的既有最小宽度。输入不可变，结果按
+    输入记忆。
     """
 
     card_width = calculate_card_width(values.viewport_width, values.list_spacing)
@@ -175,6 +182,28 @@ def calculate_task_card_layout(values: TaskCardLayoutInput) -> TaskCardLayout:
     )
 
 
+def calculate_task_card_layouts(
+    measurements: Iterable[TaskCardLayoutInput],
+    viewport_width: int,
+    list_spacing: int,
+) -> list[TaskCardLayout]:
+    """用同一 viewport 宽度与列表间距批量计算多张卡片的布局。
+
+    ``measurements`` 中的 viewport 字段会被替换，测量值相同的卡片共享一次计算。
+    """
+
+    return [
+        calculate_task_card_layout(
+            replace(
+                values,
+                viewport_width=viewport_width,
+                list_spacing=list_spacing,
+            )
+        )
+        for values in measurements
+    ]
+
+
 @dataclass(frozen=True)
 class TaskDetailsWidthInput:
     """详情浮层宽度计算所需的普通数值。"""
@@ -391,6 +420,7 @@ __all__ = [
     "TaskDetailsWidthInput",
     "calculate_card_width",
     "calculate_task_card_layout",
+    "calculate_task_card_layouts",
     "calculate_task_details_height",
     "calculate_task_details_placement",
     "calculate_task_details_width",
@@ -26,8 +26,6 @@ from PySide6.QtWidgets import (
     QDialog,
     QHBoxLayout,
     QLabel,
-    QListWidget,
-    QListWidgetItem,
     QMainWindow,
     QMenu,
     QMessageBox,
@@ -41,6 +39,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from .clock import HOUR_PRECISION_MS, SECOND_PRECISION_MS, get_clock_service
 from .constants import (
     APP_ICON_PATH,
     APP_NAME,
@@ -52,11 +51,32 @@ from .constants import (
     TASK_CARD_LIST_GAP,
 )
 from .dialogs import NotificationDialog, TaskEditDialog
+from .gc_guard import GuiThreadGarbageCollector
 from .layout import calculate_card_width
-from .scheduling import build_edit_update_fields, build_snooze_update_fields
-from .storage import load_todos, save_todos
+from .scheduling import (
+    DeadlineQueue,
+    build_edit_update_fields,
+    build_snooze_update_fields,
+    claim_notification,
+    next_reminder_deadline,
+    release_expired_snooze,
+    timestamp_us,
+    to_epoch_ms,
+)
+from .storage import (
+    archive_completed_todos,
+    flush_storage,
+    load_archived_todos,
+    load_todos,
+    query_todo_ids,
+    remove_archived_todo,
+    save_todos,
+    update_archived_todo,
+)
+from .storage_worker import TodoSaveWorker
 from .utils import get_icon, play_sound_effect
-from .widgets import TodoItemWidget
+from .todo_list import TodoCardDelegate, TodoListModel, TodoListView
+from .todo_store import TodoStore
 from .theme import ThemeColors, get_theme_manager
 
 
@@ -64,6 +84,25 @@ _MAIN_CONTENT_MARGIN = 15
 _LIST_SCROLLBAR_WIDTH = 8
 _LIST_RIGHT_MARGIN = _MAIN_CONTENT_MARGIN - _LIST_SCROLLBAR_WIDTH
 _SORT_COMBO_MIN_WIDTH = 76
+_REMINDER_TIMER_MAX_INTERVAL_MS = 60 * 60 * 1000
+# 托盘空闲时没有逐秒刷新兜底，截止计时器是唯一的提醒来源；间隔封顶到一分钟，
+# 系统休眠或时间跳变后提醒最多晚一分钟，与空闲回收检查的唤醒频率相当。
+_REMINDER_TIMER_IDLE_MAX_INTERVAL_MS = 60 * 1000
+_SAVE_COALESCE_INTERVAL_MS = 300
+# 每秒刷新时在可见行上下额外同步的行数，覆盖刚好滚入视口的卡片。
+_TICK_ROW_MARGIN = 2
+# 重新打开已完成任务时重置的字段，主列表与从归档恢复的任务共用。
+_REOPENED_FIELDS = {
+    "completed": False,
+    "completedAt": None,
+    "notifiedForReminder": False,
+    "notifiedForDue": False,
+    "lastNotifiedAt": None,
+}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+# 缺少或无法解析截止时间的任务排在最后，与 SQLite 下推排序使用同一哨兵值。
+_MISSING_DUE_US = (datetime.max.replace(tzinfo=timezone.utc) - _EPOCH) // _ONE_MICROSECOND
 
 
 class _ResponsiveComboBox(QComboBox):
@@ -174,10 +213,29 @@ class ModernTodoAppWindow(QMainWindow):
 
     def __init__(self):
         super().__init__()
-        self.todos: List[Dict] = load_todos()
+        self._quitting_app = False
+        # 隐藏到托盘或最小化期间不刷新卡片，截止计时器改用空闲封顶，见 _enter_tray_idle。
+        self._tray_idle = False
+        self._reminder_queue: DeadlineQueue[dict] = DeadlineQueue()
+        self._reminder_timer = QTimer(self)
+        self._reminder_timer.setSingleShot(True)
+        self._reminder_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._reminder_timer.timeout.connect(self._on_reminder_timer_timeout)
+        # 任务列表及其 ID 查找表、二级索引统一由 TodoStore 增量维护。
+        self._store = TodoStore()
+        self.todos = load_todos()
         self._notification_dialog: Optional[NotificationDialog] = None
         self.settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
-        self._quitting_app = False
+        self._garbage_collector = GuiThreadGarbageCollector(parent=self)
+        self._save_worker = TodoSaveWorker(
+            lambda: self.todos,
+            save_todos,
+            _SAVE_COALESCE_INTERVAL_MS,
+            self,
+        )
+        self._save_worker.save_finished.connect(self._on_save_finished)
+        self._save_failure_reported = False
+        self._archive_completed_todos()
 
         self.theme_manager = get_theme_manager()
         self._palette: ThemeColors = self.theme_manager.current_palette
@@ -189,24 +247,45 @@ class ModernTodoAppWindow(QMainWindow):
         self.due_sound.setVolume(0.8)
 
         self._add_task_dialog: Optional[TaskEditDialog] = None
-        self._empty_placeholder_item: Optional[QListWidgetItem] = None
-        self._empty_placeholder_widget: Optional[QWidget] = None
         self._empty_placeholder_label: Optional[QLabel] = None
         self._syncing_todo_card_sizes = False
+        # 窗口、viewport 与滚动条的尺寸变化在同一轮事件循环内合并为一次同步。
+        self._card_size_sync_timer = QTimer(self)
+        self._card_size_sync_timer.setSingleShot(True)
+        self._card_size_sync_timer.setInterval(0)
+        self._card_size_sync_timer.timeout.connect(self._sync_todo_card_sizes)
 
         self._build_ui()
         self._create_tray_icon()
         self.update_list_widget()
 
-        self.master_timer = QTimer(self)
+        # 逐秒刷新与定时归档都挂在全局时钟服务上，与其他订阅者共用对齐后的唤醒。
+        clock = get_clock_service()
+        self.master_timer = clock.subscribe(SECOND_PRECISION_MS, self)
         self.master_timer.timeout.connect(self.tick_update)
-        self.master_timer.start(1000)
+        self.master_timer.start()
+        self._archive_timer = clock.subscribe(HOUR_PRECISION_MS, self)
+        self._archive_timer.timeout.connect(self._on_archive_timer_timeout)
+        self._archive_timer.start()
         self.restore_geometry_and_state()
 
         self._on_top_restore_timer = QTimer(self)
         self._on_top_restore_timer.setSingleShot(True)
         self._on_top_restore_timer.timeout.connect(self._restore_window_stays_on_top_flag)
 
+    @property
+    def todos(self) -> List[Dict]:
+        """当前任务列表；增删改经由 ``_store``，以便同步维护索引。"""
+
+        return self._store.todos
+
+    @todos.setter
+    def todos(self, value: List[Dict]) -> None:
+        """整体替换任务列表时重建索引与提醒截止队列。"""
+
+        self._store.replace(value)
+        self._rebuild_reminder_schedule()
+
     # --- UI 初始化 ---
     def _build_ui(self) -> None:
         self.setWindowTitle(f"{APP_NAME} - v{APP_VERSION}")
@@ -261,11 +340,22 @@ class ModernTodoAppWindow(QMainWindow):
         list_header_layout.addWidget(self.add_button)
         main_layout.addLayout(list_header_layout)
 
-        self.list_widget = QListWidget()
+        self.list_widget = TodoListView()
+        self.todo_model = TodoListModel(self.list_widget)
+        self.todo_model.set_row_source(self._store.get)
+        self.todo_delegate = TodoCardDelegate(self._palette, self.list_widget)
+        self.todo_model.rows_invalidated.connect(self.todo_delegate.discard_rows)
+        self.todo_delegate.request_edit.connect(self.handle_edit_request)
+        self.todo_delegate.request_delete.connect(self.handle_delete_request)
+        self.todo_delegate.request_toggle_complete.connect(
+            self.handle_toggle_complete_request
+        )
+        self.list_widget.setModel(self.todo_model)
+        self.list_widget.setItemDelegate(self.todo_delegate)
         self.list_widget.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
         # QListView::spacing 会填充每个 item 四周，相邻卡片间距因此是该值的两倍。
         self.list_widget.setSpacing(TASK_CARD_LIST_GAP // 2)
-        self.list_widget.setVerticalScrollMode(QListWidget.ScrollPerPixel)
+        self.list_widget.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
         scrollbar = self.list_widget.verticalScrollBar()
         scrollbar.setFixedWidth(_LIST_SCROLLBAR_WIDTH)
         scrollbar.rangeChanged.connect(self._sync_list_scrollbar_gutter)
@@ -314,12 +404,12 @@ class ModernTodoAppWindow(QMainWindow):
         self.list_widget.setStyleSheet(
             dedent(
                 f"""
-                QListWidget {{
+                QListView {{
                     background-color: transparent;
                     border: none;
                     padding: 0px;
                 }}
-                QListWidget::item {{
+                QListView::item {{
                     border: none;
                     margin: 0px;
                     padding: 0px;
@@ -374,7 +464,7 @@ class ModernTodoAppWindow(QMainWindow):
             right_gutter,
             margins.bottom(),
         )
-        self._sync_todo_card_sizes()
+        self._schedule_todo_card_size_sync()
 
     @staticmethod
     def _build_add_icon(color: str) -> QIcon:
@@ -487,15 +577,13 @@ class ModernTodoAppWindow(QMainWindow):
         combo.updateGeometry()
 
     def _refresh_item_widgets_palette(self, palette: ThemeColors) -> None:
-        """遍历所有待办卡片并刷新其配色。"""
+        """刷新委托绘制用的模板卡片与悬停卡片的配色。"""
 
-        for index in range(self.list_widget.count()):
-            list_item = self.list_widget.item(index)
-            if not list_item:
-                continue
-            item_widget = self.list_widget.itemWidget(list_item)
-            if isinstance(item_widget, TodoItemWidget):
-                item_widget.apply_palette(palette)
+        self.todo_delegate.apply_palette(palette)
+        hovered_card = self.list_widget.hovered_card()
+        if hovered_card is not None:
+            hovered_card.apply_palette(palette)
+        self.list_widget.viewport().update()
 
     @Slot(ThemeColors)
     def _on_theme_changed(self, palette: ThemeColors) -> None:
@@ -507,48 +595,125 @@ class ModernTodoAppWindow(QMainWindow):
     # --- 主循环刷新 ---
     def tick_update(self) -> None:
         now_utc = datetime.now(timezone.utc)
+        self._process_due_reminders(now_utc)
+
+        # 只同步视口附近的行副本，其余行标记过期，滚入视口绘制时再同步。
+        self.todo_model.mark_stale()
+        self.todo_model.refresh_rows(self.list_widget.visible_rows(_TICK_ROW_MARGIN))
+        self.todo_model.refresh_rows((self.list_widget.hovered_row(),))
+        hovered_card = self.list_widget.hovered_card()
+        if hovered_card is not None:
+            hovered_card.update_timer_display(now_utc)
+        self.todo_delegate.refresh_timers(self.list_widget, now_utc)
+
+    # --- 提醒调度 ---
+    def _rebuild_reminder_schedule(self) -> None:
+        self._reminder_queue.clear()
+        for todo in self._store.todos:
+            if isinstance(todo, dict):
+                self._schedule_reminder(todo)
+        self._arm_reminder_timer()
+
+    def _schedule_reminder(self, todo: dict) -> None:
+        """按任务当前状态更新其在截止队列中的位置，不重新设定计时器。"""
+
+        todo_id = todo.get("id")
+        if todo_id is None:
+            return
+        deadline = next_reminder_deadline(todo)
+        deadline_ms = to_epoch_ms(deadline, round_up=True) if deadline is not None else None
+        self._reminder_queue.schedule(todo_id, deadline_ms, todo)
+
+    def _reschedule_reminders(self, todos: List[Dict]) -> None:
+        for todo in todos:
+            self._schedule_reminder(todo)
+        self._arm_reminder_timer()
+
+    def _arm_reminder_timer(self) -> None:
+        """只为最早的截止时刻设定单次计时器；间隔封顶以校正系统时间跳变。"""
+
+        deadline_ms = self._reminder_queue.next_deadline()
+        if deadline_ms is None or self._quitting_app:
+            self._reminder_timer.stop()
+            return
+        now_ms = to_epoch_ms(datetime.now(timezone.utc))
+        max_interval_ms = (
+            _REMINDER_TIMER_IDLE_MAX_INTERVAL_MS
+            if self._tray_idle
+            else _REMINDER_TIMER_MAX_INTERVAL_MS
+        )
+        delay_ms = min(max(deadline_ms - now_ms, 0), max_interval_ms)
+        self._reminder_timer.start(delay_ms)
+
+    def _on_reminder_timer_timeout(self) -> None:
+        self._process_due_reminders(datetime.now(timezone.utc))
+
+    def _process_due_reminders(self, now_utc: datetime) -> None:
+        """只处理截止时刻已到的任务，语义与逐项扫描完整列表一致。"""
+
+        if self._quitting_app:
+            return
+
+        due_todos = self._reminder_queue.pop_due(to_epoch_ms(now_utc))
+        if not due_todos:
+            self._arm_reminder_timer()
+            return
+
         items_changed = False
         notification_requests: list[tuple[dict, bool]] = []
-        for original_ref in self.todos:
-            snooze_until = original_ref.get("snoozeUntil")
-            if snooze_until:
-                try:
-                    if datetime.fromisoformat(snooze_until.replace("Z", "+00:00")) <= now_utc:
-                        original_ref.update(
-                            {
-                                "snoozeUntil": None,
-                                "notifiedForReminder": False,
-                                "notifiedForDue": False,
-                            }
-                        )
-                        items_changed = True
-                except ValueError:
-                    original_ref["snoozeUntil"] = None
-                    items_changed = True
+        for original_ref in due_todos:
+            if release_expired_snooze(original_ref, now_utc):
+                items_changed = True
             notification_request = self._check_for_notification(original_ref, now_utc)
             if notification_request:
                 notification_requests.append(notification_request)
                 items_changed = True
-
-        todos_by_id = {todo.get("id"): todo for todo in self.todos}
-        for index in range(self.list_widget.count()):
-            list_item = self.list_widget.item(index)
-            if not list_item:
-                continue
-            item_widget = self.list_widget.itemWidget(list_item)
-            if not isinstance(item_widget, TodoItemWidget):
-                continue
-            original_ref = todos_by_id.get(item_widget.todo_item.get("id"))
-            if original_ref:
-                item_widget.todo_item.update(original_ref)
-            item_widget.update_timer_display(now_utc)
+        self._reschedule_reminders(due_todos)
 
         if items_changed:
-            save_todos(self.todos)
+            self._save_worker.request_save()
             self.update_list_widget()
         if notification_requests:
             self._show_notification_batch(notification_requests)
 
+    # --- 持久化 ---
+    def _archive_completed_todos(self) -> bool:
+        """把完成已久的任务移入归档，主文件与每秒刷新只保留近期任务。"""
+
+        stats = archive_completed_todos(self.todos)
+        if not stats.changed:
+            return False
+        if stats.archived:
+            # 归档在列表上原地删除，索引随之整体重建。
+            self._store.rebuild()
+            self._rebuild_reminder_schedule()
+        self._save_worker.request_save()
+        return stats.archived > 0
+
+    def _on_archive_timer_timeout(self) -> None:
+        if self._archive_completed_todos():
+            self.update_list_widget()
+
+    def _find_archived_todo(self, todo_id: int) -> Optional[dict]:
+        """只在当前列表找不到任务时查询归档，按需触发归档文件的首次读取。"""
+
+        return next((t for t in load_archived_todos() if t.get("id") == todo_id), None)
+
+    def _on_save_finished(self, succeeded: bool) -> None:
+        """后台保存失败时提示一次，直到再次保存成功；内存中的修改会随下次保存重试。"""
+
+        if succeeded:
+            self._save_failure_reported = False
+            return
+        if self._save_failure_reported or self._quitting_app:
+            return
+        self._save_failure_reported = True
+        QMessageBox.warning(
+            self,
+            "保存失败",
+            "待办数据未能写入磁盘，最近的修改仍保留在当前窗口中，下次修改或退出时会重试。",
+        )
+
     # --- 通知逻辑 ---
     def _check_for_notification(
         self, todo: dict, current_time_utc: datetime
@@ -557,43 +722,10 @@ class ModernTodoAppWindow(QMainWindow):
             self._remove_notification_task(todo.get("id"))
             return None
 
-        due_date_str = todo.get("dueDate")
-        if not due_date_str:
-            return None
-
-        try:
-            due_date_dt = datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
-        except ValueError:
-            print(f"错误: 任务ID {todo.get('id', '未知')} 截止日期格式无效: {due_date_str}")
+        is_due = claim_notification(todo, current_time_utc)
+        if is_due is None:
             return None
-
-        snooze_until = todo.get("snoozeUntil")
-        if snooze_until:
-            try:
-                if datetime.fromisoformat(snooze_until.replace("Z", "+00:00")) > current_time_utc:
-                    return None
-            except ValueError:
-                pass
-
-        reminder_offset_sec = todo.get("reminderOffset", 0)
-        if reminder_offset_sec >= 0:
-            reminder_time_dt = due_date_dt - timedelta(seconds=reminder_offset_sec)
-            if (
-                reminder_time_dt <= current_time_utc
-                and due_date_dt > current_time_utc
-                and not todo.get("notifiedForReminder", False)
-            ):
-                todo["notifiedForReminder"] = True
-                todo["lastNotifiedAt"] = current_time_utc.isoformat()
-                return todo, False
-
-        if due_date_dt <= current_time_utc and not todo.get("notifiedForDue", False):
-            todo["notifiedForDue"] = True
-            todo["notifiedForReminder"] = True
-            todo["lastNotifiedAt"] = current_time_utc.isoformat()
-            return todo, True
-
-        return None
+        return todo, is_due
 
     def _show_notification_batch(self, requests: list[tuple[dict, bool]]) -> None:
         if any(is_due for _, is_due in requests):
@@ -622,47 +754,49 @@ class ModernTodoAppWindow(QMainWindow):
 
     def _handle_notification_complete(self, todo_ids: list[int]) -> None:
         requested_ids = {int(todo_id) for todo_id in todo_ids}
-        changed = False
-        for todo in self.todos:
-            if todo.get("id") not in requested_ids or todo.get("completed", False):
+        changed_todos: list[dict] = []
+        for todo in self._store.records(requested_ids):
+            if todo.get("completed", False):
                 continue
-            todo.update(
+            self._store.update(
+                todo["id"],
                 {
                     "completed": True,
+                    "completedAt": datetime.now(timezone.utc).isoformat(),
                     "snoozeUntil": None,
                     "notifiedForReminder": True,
                     "notifiedForDue": True,
-                }
+                },
             )
-            changed = True
+            changed_todos.append(todo)
 
         self._remove_notification_tasks(list(requested_ids))
-        if changed:
-            save_todos(self.todos)
+        if changed_todos:
+            self._reschedule_reminders(changed_todos)
+            self._save_worker.request_save()
             self.update_list_widget()
 
     def _handle_notification_snooze(
         self, todo_ids: list[int], snooze_duration: timedelta
     ) -> None:
         requested_ids = {int(todo_id) for todo_id in todo_ids}
-        changed = False
-        for todo in self.todos:
-            if todo.get("id") not in requested_ids or todo.get("completed", False):
+        changed_todos: list[dict] = []
+        for todo in self._store.records(requested_ids):
+            if todo.get("completed", False):
                 continue
-            todo.update(build_snooze_update_fields(todo, snooze_duration))
-            changed = True
+            self._store.update(todo["id"], build_snooze_update_fields(todo, snooze_duration))
+            changed_todos.append(todo)
 
         self._remove_notification_tasks(list(requested_ids))
-        if changed:
-            save_todos(self.todos)
+        if changed_todos:
+            self._reschedule_reminders(changed_todos)
+            self._save_worker.request_save()
             self.update_list_widget()
 
     def _handle_notification_ignore(self, todo_ids: list[int]) -> None:
         requested_ids = {int(todo_id) for todo_id in todo_ids}
-        changed = False
-        for todo in self.todos:
-            if todo.get("id") not in requested_ids:
-                continue
+        changed_todos: list[dict] = []
+        for todo in self._store.records(requested_ids):
             updated_fields = {
                 "dueDate": None,
                 "snoozeUntil": None,
@@ -670,12 +804,13 @@ class ModernTodoAppWindow(QMainWindow):
                 "notifiedForDue": False,
             }
             if any(todo.get(key) != value for key, value in updated_fields.items()):
-                todo.update(updated_fields)
-                changed = True
+                self._store.update(todo["id"], updated_fields)
+                changed_todos.append(todo)
 
         self._remove_notification_tasks(list(requested_ids))
-        if changed:
-            save_todos(self.todos)
+        if changed_todos:
+            self._reschedule_reminders(changed_todos)
+            self._save_worker.request_save()
             self.update_list_widget()
 
     def _remove_notification_tasks(self, todo_ids: list[int]) -> None:
@@ -791,13 +926,8 @@ class ModernTodoAppWindow(QMainWindow):
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 new_data = dialog.get_task_data()
 
-                current_ids = [t["id"] for t in self.todos if isinstance(t.get("id"), int)]
-                max_id = max(current_ids) if current_ids else 0
                 new_id_time = int(datetime.now(timezone.utc).timestamp() * 1000)
-                new_id = max(new_id_time, max_id + 1)
-                existing_ids = set(current_ids)
-                while new_id in existing_ids:
-                    new_id += 1
+                new_id = self._store.allocate_id(new_id_time)
 
                 new_todo = {
                     "id": new_id,
@@ -812,8 +942,9 @@ class ModernTodoAppWindow(QMainWindow):
                     "notifiedForDue": False,
                     "lastNotifiedAt": None,
                 }
-                self.todos.append(new_todo)
-                save_todos(self.todos)
+                self._store.add(new_todo)
+                self._reschedule_reminders([new_todo])
+                self._save_worker.request_save()
                 self.update_list_widget()
         finally:
             if self._add_task_dialog is dialog:
@@ -834,21 +965,31 @@ class ModernTodoAppWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "收到无效的任务标识，无法编辑。")
             return
 
-        todo_to_edit = next((t for t in self.todos if t.get("id") == normalized_id), None)
-        if not todo_to_edit:
+        todo_to_edit = self._store.get(normalized_id)
+        archived_todo = None if todo_to_edit else self._find_archived_todo(normalized_id)
+        if not todo_to_edit and not archived_todo:
             QMessageBox.warning(self, "错误", "无法找到要编辑的任务。")
             return
 
-        dialog = TaskEditDialog(todo_item=todo_to_edit, parent=self)
+        dialog = TaskEditDialog(todo_item=todo_to_edit or archived_todo, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             updated_data = dialog.get_task_data()
-            for index, todo in enumerate(self.todos):
-                if todo["id"] == normalized_id:
-                    self.todos[index].update(build_edit_update_fields(todo, updated_data))
-                    self._remove_notification_task(normalized_id)
-                    break
-
-            save_todos(self.todos)
+            if archived_todo:
+                updated_todo = {
+                    **archived_todo,
+                    **build_edit_update_fields(archived_todo, updated_data),
+                }
+                if not update_archived_todo(updated_todo):
+                    QMessageBox.warning(self, "错误", "归档任务未能保存，请稍后重试。")
+                self.update_list_widget()
+                return
+            todo = self._store.get(normalized_id)
+            if todo is not None:
+                self._store.update(normalized_id, build_edit_update_fields(todo, updated_data))
+                self._remove_notification_task(normalized_id)
+                self._reschedule_reminders([todo])
+
+            self._save_worker.request_save()
             self.update_list_widget()
 
     @Slot(object)
@@ -858,7 +999,9 @@ class ModernTodoAppWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "收到无效的任务标识，无法删除。")
             return
 
-        todo_to_delete = next((t for t in self.todos if t.get("id") == normalized_id), None)
+        todo_to_delete = self._store.get(normalized_id)
+        archived_todo = None if todo_to_delete else self._find_archived_todo(normalized_id)
+        todo_to_delete = todo_to_delete or archived_todo
         item_text = (
             f"待办事项 \"{todo_to_delete['text'][:30]}{'...' if len(todo_to_delete['text']) > 30 else ''}\""
             if todo_to_delete
@@ -874,11 +1017,16 @@ class ModernTodoAppWindow(QMainWindow):
             )
             == QMessageBox.StandardButton.Yes
         ):
+            if archived_todo:
+                if remove_archived_todo(normalized_id) is None:
+                    QMessageBox.warning(self, "错误", "归档任务未能删除，请稍后重试。")
+                self.update_list_widget()
+                return
             self._remove_notification_task(normalized_id)
-            original_len = len(self.todos)
-            self.todos = [t for t in self.todos if t.get("id") != normalized_id]
-            if len(self.todos) < original_len:
-                save_todos(self.todos)
+            if self._store.remove(normalized_id) is not None:
+                self._reminder_queue.discard(normalized_id)
+                self._arm_reminder_timer()
+                self._save_worker.request_save()
                 self.update_list_widget()
             else:
                 print(f"警告: 删除任务时未找到ID {normalized_id}。")
@@ -894,68 +1042,65 @@ class ModernTodoAppWindow(QMainWindow):
             return
 
         changed = False
-        for index, todo in enumerate(self.todos):
-            if todo.get("id") == normalized_id:
-                is_now_completed = not todo.get("completed", False)
-                self.todos[index]["completed"] = is_now_completed
-                if is_now_completed:
-                    self.todos[index].update(
-                        {
-                            "snoozeUntil": None,
-                            "notifiedForReminder": True,
-                            "notifiedForDue": True,
-                        }
-                    )
-                    self._remove_notification_task(normalized_id)
-                else:
-                    self.todos[index].update(
-                        {
-                            "notifiedForReminder": False,
-                            "notifiedForDue": False,
-                            "lastNotifiedAt": None,
-                        }
-                    )
-                changed = True
-                break
+        todo = self._store.get(normalized_id)
+        if todo is not None:
+            if not todo.get("completed", False):
+                self._store.update(
+                    normalized_id,
+                    {
+                        "completed": True,
+                        "completedAt": datetime.now(timezone.utc).isoformat(),
+                        "snoozeUntil": None,
+                        "notifiedForReminder": True,
+                        "notifiedForDue": True,
+                    },
+                )
+                self._remove_notification_task(normalized_id)
+            else:
+                self._store.update(normalized_id, _REOPENED_FIELDS)
+            self._reschedule_reminders([todo])
+            changed = True
+        else:
+            archived = self._find_archived_todo(normalized_id)
+            if archived is not None:
+                restored = {**archived, **_REOPENED_FIELDS}
+                self._store.add(restored)
+                self._reschedule_reminders([restored])
+                # 先同步写入含该任务的主文件，再追加归档删除记录：两步之间中断时任务同时留在两边，
+                # 以主文件为准；主文件写入失败时保留归档记录，任务不会从两处同时消失。
+                self._save_worker.request_save()
+                if self._save_worker.flush():
+                    remove_archived_todo(normalized_id)
+                self.update_list_widget()
+                return
 
         if changed:
-            save_todos(self.todos)
+            self._save_worker.request_save()
             self.update_list_widget()
         else:
             print(f"警告: 切换ID {normalized_id} 任务完成状态时未找到。")
 
     # --- 列表刷新 ---
     def update_list_widget(self) -> None:
-        self.list_widget.clear()
-        if not isinstance(self.todos, list):
-            self.todos = []
-
-        working_copy = [item.copy() for item in self.todos if isinstance(item, dict) and "id" in item]
-        processed = self._sort_todos(self._filter_todos(working_copy))
+        processed = self._visible_todos()
+        if self.todo_model.reconcile(processed):
+            # 替换内容的行可能改变高度；插入、删除与移动由视图自行重新排布。
+            self.list_widget.scheduleDelayedItemsLayout()
         if not processed:
             self._show_empty_list_message()
             return
 
-        self._empty_placeholder_item = None
-        self._empty_placeholder_widget = None
-        self._empty_placeholder_label = None
+        if self._empty_placeholder_label is not None:
+            self._empty_placeholder_label.hide()
+        self._schedule_todo_card_size_sync()
 
-        for todo_data in processed:
-            list_item = QListWidgetItem(self.list_widget)
-            item_widget = TodoItemWidget(todo_data.copy(), palette=self._palette)
-            item_widget.request_edit.connect(self.handle_edit_request)
-            item_widget.request_delete.connect(self.handle_delete_request)
-            item_widget.request_toggle_complete.connect(self.handle_toggle_complete_request)
-            widget_size_hint = item_widget.sizeHint()
-            item_height = max(widget_size_hint.height(), item_widget.minimumHeight())
-            list_item.setSizeHint(QSize(0, item_height))
-            self.list_widget.addItem(list_item)
-            self.list_widget.setItemWidget(list_item, item_widget)
+    def _schedule_todo_card_size_sync(self) -> None:
+        """请求在本轮事件处理结束后同步一次卡片尺寸，重复请求只保留一次。"""
 
-        self._sync_todo_card_sizes()
+        self._card_size_sync_timer.start()
 
     def _sync_todo_card_sizes(self) -> None:
-        """按最终 viewport 宽度同步卡片与 QListWidgetItem 的动态高度。"""
+        """按最终 viewport 宽度刷新委托的卡片布局，宽度变化时重新排布行高。"""
 
         if self._syncing_todo_card_sizes or not hasattr(self, "list_widget"):
             return
@@ -969,59 +1114,81 @@ class ModernTodoAppWindow(QMainWindow):
 
         self._syncing_todo_card_sizes = True
         try:
-            self.list_widget.doItemsLayout()
-            changed = False
-            for index in range(self.list_widget.count()):
-                list_item = self.list_widget.item(index)
-                item_widget = self.list_widget.itemWidget(list_item)
-                if not isinstance(item_widget, TodoItemWidget):
-                    continue
-
-                layout_result = item_widget.refresh_layout(
-                    viewport_width=viewport.width(),
-                    list_spacing=self.list_widget.spacing(),
-                )
-                target_hint = QSize(0, layout_result.card_height)
-                if list_item.sizeHint() != target_hint:
-                    list_item.setSizeHint(target_hint)
-                    changed = True
-
-            if changed:
+            if self.todo_delegate.set_viewport_geometry(
+                viewport.width(),
+                self.list_widget.spacing(),
+            ):
                 self.list_widget.doItemsLayout()
         finally:
             self._syncing_todo_card_sizes = False
 
     def _show_empty_list_message(self) -> None:
-        self.list_widget.clear()
-        empty_item = QListWidgetItem(self.list_widget)
-        empty_container = QWidget()
-        container_layout = QVBoxLayout(empty_container)
-        container_layout.setContentsMargins(0, 40, 0, 40)
-        container_layout.setSpacing(0)
-        container_layout.addStretch()
-
-        empty_label = QLabel("🎉 暂无待办事项！")
-        empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        empty_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        container_layout.addWidget(empty_label, alignment=Qt.AlignmentFlag.AlignCenter)
-        container_layout.addStretch()
-
-        self.list_widget.addItem(empty_item)
-        self.list_widget.setItemWidget(empty_item, empty_container)
-
-        self._empty_placeholder_item = empty_item
-        self._empty_placeholder_widget = empty_container
-        self._empty_placeholder_label = empty_label
+        if self._empty_placeholder_label is None:
+            empty_label = QLabel("🎉 暂无待办事项！", self.list_widget.viewport())
+            empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self._empty_placeholder_label = empty_label
         self._apply_palette(self._palette)
+        self._empty_placeholder_label.show()
         self._update_empty_placeholder_geometry()
         QTimer.singleShot(0, self._update_empty_placeholder_geometry)
 
+    def _visible_todos(self) -> List[dict]:
+        """返回当前筛选与排序下的任务引用，调用方不得修改；由列表模型按需复制。
+
+        只有“已完成”筛选会读取归档，与主列表重复的 ID 以主列表为准。
+        """
+
+        archived: List[dict] = []
+        if self.filter_combo.currentText() == "已完成":
+            archived = [
+                todo for todo in load_archived_todos() if todo.get("id") not in self._store
+            ]
+
+        ordered_ids = None
+        if not archived and not self._save_worker.has_pending():
+            ordered_ids = query_todo_ids(
+                self.filter_combo.currentText(),
+                self.sort_combo.currentText(),
+                self.todos,
+            )
+        if ordered_ids is not None and all(todo_id in self._store for todo_id in ordered_ids):
+            return [self._store.get(todo_id) for todo_id in ordered_ids]
+
+        return self._sort_todos(self._filter_todos(self._filter_candidates() + archived))
+
+    def _filter_candidates(self) -> List[dict]:
+        """按二级索引取出可能通过当前筛选的任务（保持列表顺序），逐项条件仍由 _filter_todos 判定。"""
+
+        filter_text = self.filter_combo.currentText()
+        store = self._store
+        if store.has_unindexed():
+            # 缺少 ID 或 ID 重复的任务不在索引中，改为逐项筛选全部任务，避免它们从列表消失。
+            return store.records()
+        if filter_text == "未完成":
+            todo_ids = store.ids_with_completed(False)
+        elif filter_text == "已完成":
+            todo_ids = store.ids_with_completed(True)
+        elif filter_text == "今天到期":
+            today_local = datetime.now().astimezone().date()
+            todo_ids = store.ids_due_on(today_local) - store.ids_with_completed(True)
+        elif filter_text == "高优先级":
+            todo_ids = store.ids_with_priority("高") - store.ids_with_completed(True)
+        else:
+            return store.records()
+        return store.records(todo_ids)
+
     def _filter_todos(self, todos_list: List[dict]) -> List[dict]:
         filter_text = self.filter_combo.currentText()
         if filter_text == "全部":
             return todos_list
 
+        # 今天的本地日界转为纪元微秒，逐项只比较缓存的截止时间，不再逐个换算时区；
+        # 不带时区的截止时间按本地时间解读。
         today_local = datetime.now().astimezone().date()
+        today_start_us, today_end_us = (
+            (datetime.combine(day, datetime.min.time()).astimezone() - _EPOCH) // _ONE_MICROSECOND
+            for day in (today_local, today_local + timedelta(days=1))
+        )
         filtered: List[dict] = []
         for todo in todos_list:
             add = False
@@ -1030,11 +1197,8 @@ class ModernTodoAppWindow(QMainWindow):
             elif filter_text == "已完成":
                 add = todo.get("completed", False)
             elif filter_text == "今天到期" and not todo.get("completed", False) and todo.get("dueDate"):
-                try:
-                    if datetime.fromisoformat(todo["dueDate"].replace("Z", "+00:00")).astimezone().date() == today_local:
-                        add = True
-                except ValueError:
-                    pass
+                due_us = timestamp_us(todo, "dueDate", naive_local=True)
+                add = due_us is not None and today_start_us <= due_us < today_end_us
             elif filter_text == "高优先级" and not todo.get("completed", False) and todo.get("priority") == "高":
                 add = True
             if add:
@@ -1044,28 +1208,25 @@ class ModernTodoAppWindow(QMainWindow):
     def _sort_todos(self, todos_list: List[dict]) -> List[dict]:
         sort_key = self.sort_combo.currentText()
 
-        def get_due(todo: dict, future_extreme: bool = True) -> datetime:
-            due_str = todo.get("dueDate")
-            if due_str:
-                try:
-                    return datetime.fromisoformat(due_str.replace("Z", "+00:00"))
-                except ValueError:
-                    pass
-            extreme_date = datetime.max if future_extreme else datetime.min
-            return extreme_date.replace(tzinfo=timezone.utc)
+        # 不带时区的时间与“今天到期”筛选及 SQLite 派生列一样按本地时间解读。
+        def get_due(todo: dict, future_extreme: bool = True) -> int:
+            due_us = timestamp_us(todo, "dueDate", naive_local=True)
+            if due_us is not None:
+                return due_us
+            return _MISSING_DUE_US if future_extreme else -_MISSING_DUE_US
 
         priority_value = lambda p: {"高": 0, "中": 1, "低": 2}.get(p, 3)
 
         if sort_key == "创建时间 (新->旧)":
             return sorted(
                 todos_list,
-                key=lambda t: datetime.fromisoformat(t["createdAt"].replace("Z", "+00:00")),
+                key=lambda t: timestamp_us(t, "createdAt", naive_local=True) or 0,
                 reverse=True,
             )
         if sort_key == "创建时间 (旧->新)":
             return sorted(
                 todos_list,
-                key=lambda t: datetime.fromisoformat(t["createdAt"].replace("Z", "+00:00")),
+                key=lambda t: timestamp_us(t, "createdAt", naive_local=True) or 0,
             )
         if sort_key == "截止日期 (近->远)":
             return sorted(
@@ -1202,16 +1363,15 @@ class ModernTodoAppWindow(QMainWindow):
                 self.showNormal()
 
     def _update_empty_placeholder_geometry(self) -> None:
-        if not self._empty_placeholder_item or not self._empty_placeholder_widget:
+        label = self._empty_placeholder_label
+        if label is None or label.isHidden():
             return
 
-        viewport = self.list_widget.viewport() if self.list_widget else None
-        viewport_size = viewport.size() if viewport else self.list_widget.size()
+        viewport_size = self.list_widget.viewport().size()
+        spacing = self.list_widget.spacing()
         width = max(viewport_size.width() - 10, 200)
-        vertical_spacing = self.list_widget.spacing() * 2
-        height = max(viewport_size.height() - vertical_spacing, 160)
-        self._empty_placeholder_item.setSizeHint(QSize(width, height))
-        self._empty_placeholder_widget.setMinimumSize(width, height)
+        height = max(viewport_size.height() - spacing * 2, 160)
+        label.setGeometry(spacing, spacing, width, height)
 
     def eventFilter(self, watched: object, event: QEvent) -> bool:  # noqa: N802
         if (
@@ -1219,18 +1379,47 @@ class ModernTodoAppWindow(QMainWindow):
             and watched is self.list_widget.viewport()
             and event.type() == QEvent.Type.Resize
         ):
+            # viewport 尺寸已是最终值，立即同步，避免先按旧行高绘制一帧再重排。
+            self._card_size_sync_timer.stop()
             self._sync_todo_card_sizes()
         return super().eventFilter(watched, event)
 
     def resizeEvent(self, event: QEvent) -> None:  # noqa: N802
         super().resizeEvent(event)
         self._update_empty_placeholder_geometry()
-        self._sync_todo_card_sizes()
+        self._schedule_todo_card_size_sync()
 
     def showEvent(self, event: QEvent) -> None:  # noqa: N802
         super().showEvent(event)
-        self._sync_todo_card_sizes()
+        self._schedule_todo_card_size_sync()
         QTimer.singleShot(0, self._update_empty_placeholder_geometry)
+        self._leave_tray_idle()
+
+    def hideEvent(self, event: QEvent) -> None:  # noqa: N802
+        super().hideEvent(event)
+        self._enter_tray_idle()
+
+    def _enter_tray_idle(self) -> None:
+        """窗口隐藏或最小化后停止逐秒刷新并放缓回收检查，提醒仍由独立的截止计时器驱动。"""
+
+        self._tray_idle = True
+        self.master_timer.stop()
+        self._garbage_collector.set_idle(True)
+        # 按空闲封顶重新设定截止计时器，隐藏期间休眠唤醒或时间跳变后也能及时校正。
+        self._arm_reminder_timer()
+
+    def _leave_tray_idle(self) -> None:
+        """窗口重新显示时恢复逐秒刷新，并把可见卡片一次性刷新到当前时刻。
+
+        ``tick_update`` 同时补发隐藏期间到期的提醒，并按非空闲封顶重新设定截止计时器。
+        """
+
+        if not self._tray_idle or self._quitting_app:
+            return
+        self._tray_idle = False
+        self._garbage_collector.set_idle(False)
+        self.master_timer.start()
+        self.tick_update()
 
     # --- 关闭流程 ---
     def closeEvent(self, event: QEvent) -> None:  # noqa: N802
@@ -1243,8 +1432,14 @@ class ModernTodoAppWindow(QMainWindow):
             event.ignore()
         else:
             self._close_notification_dialog()
+            self._reminder_timer.stop()
             if not self._quitting_app:
                 self.quit_application(from_close_event=True)
+            else:
+                try:
+                    self._save_worker.shutdown()
+                finally:
+                    self._garbage_collector.stop()
             event.accept()
 
     def quit_application(self, from_close_event: bool = False) -> None:
@@ -1255,7 +1450,16 @@ class ModernTodoAppWindow(QMainWindow):
         self._close_notification_dialog()
         if hasattr(self, "master_timer"):
             self.master_timer.stop()
-        save_todos(self.todos)
+        if hasattr(self, "_archive_timer"):
+            self._archive_timer.stop()
+        self._reminder_timer.stop()
+        # 写盘失败或抛出时也要恢复自动循环回收，不让进程停在手动回收状态。
+        try:
+            self._save_worker.request_save()
+            self._save_worker.shutdown()
+            flush_storage()
+        finally:
+            self._garbage_collector.stop()
         if hasattr(self, "reminder_sound"):
             self.reminder_sound.stop()
         if hasattr(self, "due_sound"):
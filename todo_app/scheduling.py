@@ -1,34 +1,120 @@
 """提醒、推迟与编辑时的调度状态规则。"""
 from __future__ import annotations
 
+import heapq
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from itertools import count
+from typing import Any, Generic, Hashable, Mapping, NamedTuple, TypeVar
 
 
-def _parse_utc_datetime(value: object) -> datetime | None:
-    """解析 ISO 时间，并统一为 UTC aware datetime。"""
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MILLISECOND = timedelta(milliseconds=1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_PayloadT = TypeVar("_PayloadT")
+# 时间解析缓存的条目上限，约为数千个任务的全部时间字段；超出后淘汰最久未用的条目。
+_TIMESTAMP_CACHE_CAPACITY = 16384
 
+
+class TimestampCacheStats(NamedTuple):
+    """累计解析次数与当前缓存条目数。
+
+    本模块需可脱离包单独加载，不使用依赖模块注册的 dataclass。
+    """
+
+    parses: int
+    size: int
+
+
+# 按不带时区值的解读方式分开缓存（提醒规则按 UTC，筛选与提醒窗口文本按本地时间），
+# 每份是原始字符串到 (纪元微秒, UTC datetime) 的 LRU 映射；字段改写后即是新键，旧值无需失效。
+# 缺失与空值预置为无效结果，命中路径只有一次查找与一次移到末尾。
+_TIMESTAMP_PRESETS: dict[object, tuple[int | None, datetime | None]] = {
+    None: (None, None),
+    "": (None, None),
+}
+_timestamp_caches: dict[bool, OrderedDict[object, tuple[int | None, datetime | None]]] = {
+    naive_local: OrderedDict(_TIMESTAMP_PRESETS) for naive_local in (False, True)
+}
+_timestamp_parse_count = 0
+
+
+def parse_timestamp(value: object, naive_local: bool = False) -> datetime | None:
+    """解析 ISO 时间并统一为 UTC aware datetime，无效时返回 None。
+
+    不带时区的值默认按 UTC 处理，``naive_local`` 为真时按本地时间处理。
+    """
+
+    global _timestamp_parse_count
     if not isinstance(value, str) or not value:
         return None
-
+    _timestamp_parse_count += 1
     try:
         parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
     except ValueError:
         return None
-
-    if parsed.tzinfo is None:
+    if parsed.tzinfo is None and not naive_local:
         return parsed.replace(tzinfo=timezone.utc)
     return parsed.astimezone(timezone.utc)
 
 
+def _cached_timestamp(value: object, naive_local: bool) -> tuple[int | None, datetime | None]:
+    cache = _timestamp_caches[naive_local]
+    try:
+        entry = cache[value]
+    except KeyError:
+        pass
+    except TypeError:
+        return (None, None)
+    else:
+        cache.move_to_end(value)
+        return entry
+    parsed = parse_timestamp(value, naive_local)
+    entry = ((parsed - _EPOCH) // _ONE_MICROSECOND if parsed is not None else None, parsed)
+    cache[value] = entry
+    while len(cache) > _TIMESTAMP_CACHE_CAPACITY + len(_TIMESTAMP_PRESETS):
+        evicted_value, evicted_entry = cache.popitem(last=False)
+        if evicted_value in _TIMESTAMP_PRESETS:
+            # 预置条目不淘汰，放回末尾继续淘汰下一个。
+            cache[evicted_value] = evicted_entry
+    return entry
+
+
+def timestamp_datetime(
+    todo: Mapping[str, Any], field: str, *, naive_local: bool = False
+) -> datetime | None:
+    """返回任务时间字段的 UTC datetime；字段缺失、为空或无法解析时返回 None。"""
+
+    return _cached_timestamp(todo.get(field), naive_local)[1]
+
+
+def timestamp_us(todo: Mapping[str, Any], field: str, *, naive_local: bool = False) -> int | None:
+    """返回任务时间字段的纪元微秒，可直接作为排序键；无效时返回 None。"""
+
+    return _cached_timestamp(todo.get(field), naive_local)[0]
+
+
+def clear_timestamp_cache() -> None:
+    for cache in _timestamp_caches.values():
+        cache.clear()
+        cache.update(_TIMESTAMP_PRESETS)
+
+
+def timestamp_cache_stats() -> TimestampCacheStats:
+    return TimestampCacheStats(
+        parses=_timestamp_parse_count,
+        size=sum(len(cache) - len(_TIMESTAMP_PRESETS) for cache in _timestamp_caches.values()),
+    )
+
+
 def _due_dates_are_equivalent(existing_value: object, updated_value: object) -> bool:
     """按 Qt 可表达的毫秒精度比较两个截止时间是否为同一时刻。"""
 
     if existing_value == updated_value:
         return True
 
-    existing_dt = _parse_utc_datetime(existing_value)
-    updated_dt = _parse_utc_datetime(updated_value)
+    existing_dt = parse_timestamp(existing_value)
+    updated_dt = parse_timestamp(updated_value)
     if existing_dt is None or updated_dt is None:
         return False
 
@@ -59,7 +145,7 @@ def build_snooze_update_fields(
         "lastNotifiedAt": None,
     }
 
-    due_date_dt = _parse_utc_datetime(todo.get("dueDate"))
+    due_date_dt = timestamp_datetime(todo, "dueDate")
     if due_date_dt is None:
         if todo.get("dueDate"):
             updated_fields["dueDate"] = snooze_until_dt.isoformat()
@@ -103,7 +189,196 @@ def build_edit_update_fields(existing: dict[str, Any], updated_data: dict[str, A
     return updated_fields
 
 
+def to_epoch_ms(value: datetime, *, round_up: bool = False) -> int:
+    """将 aware datetime 转为 Unix 毫秒；截止时刻向上取整，避免提前唤醒。"""
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    if round_up:
+        return -((_EPOCH - value) // _ONE_MILLISECOND)
+    return (value - _EPOCH) // _ONE_MILLISECOND
+
+
+def release_expired_snooze(todo: dict[str, Any], now_utc: datetime) -> bool:
+    """推迟时间已到时清除推迟并重置提醒状态；无效推迟时间直接清除。"""
+
+    snooze_until = todo.get("snoozeUntil")
+    if not snooze_until:
+        return False
+
+    snooze_until_dt = timestamp_datetime(todo, "snoozeUntil")
+    if snooze_until_dt is None:
+        todo["snoozeUntil"] = None
+        return True
+    if snooze_until_dt > now_utc:
+        return False
+
+    todo.update(
+        {
+            "snoozeUntil": None,
+            "notifiedForReminder": False,
+            "notifiedForDue": False,
+        }
+    )
+    return True
+
+
+def claim_notification(todo: dict[str, Any], now_utc: datetime) -> bool | None:
+    """判断任务此刻是否需要提醒；命中时写入已提醒标记并返回是否已到期。"""
+
+    if todo.get("completed"):
+        return None
+
+    due_date_dt = timestamp_datetime(todo, "dueDate")
+    if due_date_dt is None:
+        return None
+
+    snooze_until_dt = timestamp_datetime(todo, "snoozeUntil")
+    if snooze_until_dt is not None and snooze_until_dt > now_utc:
+        return None
+
+    reminder_offset_sec = todo.get("reminderOffset", 0)
+    if reminder_offset_sec >= 0:
+        reminder_time_dt = due_date_dt - timedelta(seconds=reminder_offset_sec)
+        if (
+            reminder_time_dt <= now_utc
+            and due_date_dt > now_utc
+            and not todo.get("notifiedForReminder", False)
+        ):
+            todo["notifiedForReminder"] = True
+            todo["lastNotifiedAt"] = now_utc.isoformat()
+            return False
+
+    if due_date_dt <= now_utc and not todo.get("notifiedForDue", False):
+        todo["notifiedForDue"] = True
+        todo["notifiedForReminder"] = True
+        todo["lastNotifiedAt"] = now_utc.isoformat()
+        return True
+
+    return None
+
+
+def next_reminder_deadline(todo: dict[str, Any]) -> datetime | None:
+    """返回任务提醒状态下一次可能变化的时刻；无需再检查时返回 None。
+
+    与 ``release_expired_snooze``、``claim_notification`` 的判定保持一致：
+    推迟中的任务只在推迟结束时复查，其余任务取未触发的提前提醒与到期时刻中较早者。
+    """
+
+    snooze_until = todo.get("snoozeUntil")
+    if snooze_until:
+        return timestamp_datetime(todo, "snoozeUntil") or _EPOCH
+
+    if todo.get("completed"):
+        return None
+
+    due_date_dt = timestamp_datetime(todo, "dueDate")
+    if due_date_dt is None:
+        return None
+
+    candidates: list[datetime] = []
+    reminder_offset_sec = todo.get("reminderOffset", 0)
+    if reminder_offset_sec >= 0 and not todo.get("notifiedForReminder", False):
+        candidates.append(due_date_dt - timedelta(seconds=reminder_offset_sec))
+    if not todo.get("notifiedForDue", False):
+        candidates.append(due_date_dt)
+    return min(candidates, default=None)
+
+
+class DeadlineQueue(Generic[_PayloadT]):
+    """按截止时刻排序的键控最小堆，重排与删除采用惰性失效。
+
+    每个键只保留最新一次 ``schedule`` 的截止时刻；旧堆项在弹出时跳过，
+    失效项过多时整体重建，保证堆大小与有效键数量同阶。
+    """
+
+    _COMPACT_MIN_SIZE = 64
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._entries: dict[Hashable, tuple[int, _PayloadT]] = {}
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def deadline_of(self, key: Hashable) -> int | None:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def schedule(self, key: Hashable, deadline_ms: int | None, payload: _PayloadT) -> None:
+        """设置键的截止时刻；``deadline_ms`` 为 None 时移除该键。"""
+
+        if deadline_ms is None:
+            self.discard(key)
+            return
+
+        current = self._entries.get(key)
+        self._entries[key] = (deadline_ms, payload)
+        if current is not None and current[0] == deadline_ms:
+            return
+        heapq.heappush(self._heap, (deadline_ms, next(self._sequence), key))
+        self._maybe_compact()
+
+    def discard(self, key: Hashable) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._maybe_compact()
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._entries.clear()
+
+    def next_deadline(self) -> int | None:
+        """返回最早的有效截止时刻，顺带丢弃堆顶的失效项。"""
+
+        heap = self._heap
+        while heap:
+            deadline_ms, _, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == deadline_ms:
+                return deadline_ms
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now_ms: int) -> list[_PayloadT]:
+        """弹出所有截止时刻不晚于 ``now_ms`` 的条目，按截止时刻先后返回。"""
+
+        due: list[_PayloadT] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ms:
+            deadline_ms, _, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != deadline_ms:
+                continue
+            del self._entries[key]
+            due.append(entry[1])
+        return due
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) <= max(self._COMPACT_MIN_SIZE, 2 * len(self._entries)):
+            return
+        self._heap = [
+            (deadline_ms, next(self._sequence), key)
+            for key, (deadline_ms, _) in self._entries.items()
+        ]
+        heapq.heapify(self._heap)
+
+
 __all__ = [
+    "DeadlineQueue",
+    "TimestampCacheStats",
     "build_edit_update_fields",
     "build_snooze_update_fields",
+    "claim_notification",
+    "clear_timestamp_cache",
+    "next_reminder_deadline",
+    "parse_timestamp",
+    "release_expired_snooze",
+    "timestamp_cache_stats",
+    "timestamp_datetime",
+    "timestamp_us",
+    "to_epoch_ms",
 ]
@@ -0,0 +1,271 @@
+"""可选的 SQLite 待办存储：整行 JSON 文档加可索引的派生列。"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+
+# 版本 2 起不带时区的时间串按本地时间换算派生列，与主窗口内存筛选排序一致。
+SCHEMA_VERSION = 2
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+# 与主窗口排序中缺失或无效截止时间使用的 datetime.max 对齐。
+_MISSING_DUE_US = (datetime.max.replace(tzinfo=timezone.utc) - _EPOCH) // _ONE_MICROSECOND
+_PRIORITY_RANK = {"高": 0, "中": 1, "低": 2}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS todos (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    priority TEXT,
+    priority_rank INTEGER NOT NULL,
+    due_date_us INTEGER,
+    snooze_until_us INTEGER,
+    created_at_us INTEGER
+);
+CREATE INDEX IF NOT EXISTS todos_position_idx ON todos(position);
+CREATE INDEX IF NOT EXISTS todos_due_date_idx ON todos(completed, due_date_us);
+CREATE INDEX IF NOT EXISTS todos_priority_idx ON todos(completed, priority_rank, due_date_us);
+CREATE INDEX IF NOT EXISTS todos_snooze_until_idx ON todos(snooze_until_us)
+    WHERE snooze_until_us IS NOT NULL;
+CREATE INDEX IF NOT EXISTS todos_created_at_idx ON todos(created_at_us);
+"""
+
+_UPSERT = """
+INSERT INTO todos (
+    id, position, document, completed, priority, priority_rank,
+    due_date_us, snooze_until_us, created_at_us
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    position = excluded.position,
+    document = excluded.document,
+    completed = excluded.completed,
+    priority = excluded.priority,
+    priority_rank = excluded.priority_rank,
+    due_date_us = excluded.due_date_us,
+    snooze_until_us = excluded.snooze_until_us,
+    created_at_us = excluded.created_at_us
+"""
+
+_DUE_ORDER = f"COALESCE(due_date_us, {_MISSING_DUE_US})"
+# 与 ModernTodoAppWindow._sort_todos 一致；末尾按原列表位置保持稳定排序。
+_SORT_CLAUSES = {
+    "创建时间 (新->旧)": "created_at_us DESC, position",
+    "创建时间 (旧->新)": "created_at_us, position",
+    "截止日期 (近->远)": f"completed, {_DUE_ORDER}, position",
+    "截止日期 (远->近)": f"completed DESC, {_DUE_ORDER} DESC, position",
+    "优先级 (高->低)": f"completed, priority_rank, {_DUE_ORDER}, position",
+}
+
+
+def database_path(data_file: Path) -> Path:
+    return data_file.with_name(f"{data_file.stem}.sqlite3")
+
+
+def _epoch_us(value: object) -> int | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        # 与 scheduling.parse_timestamp(..., naive_local=True) 相同，按本地时间解读。
+        parsed = parsed.astimezone()
+    return (parsed - _EPOCH) // _ONE_MICROSECOND
+
+
+def _local_day_bounds_us(day: date) -> tuple[int, int]:
+    start = datetime.combine(day, time.min).astimezone()
+    end = datetime.combine(day + timedelta(days=1), time.min).astimezone()
+    return (start - _EPOCH) // _ONE_MICROSECOND, (end - _EPOCH) // _ONE_MICROSECOND
+
+
+def _row_values(todo: dict[str, Any], position: int) -> tuple[Any, ...]:
+    priority = todo.get("priority", "中")
+    return (
+        todo["id"],
+        position,
+        json.dumps(todo, ensure_ascii=False),
+        1 if todo.get("completed", False) else 0,
+        priority if isinstance(priority, str) else None,
+        _PRIORITY_RANK.get(priority, 3) if isinstance(priority, str) else 3,
+        _epoch_us(todo.get("dueDate")),
+        _epoch_us(todo.get("snoozeUntil")),
+        _epoch_us(todo.get("createdAt")),
+    )
+
+
+class SqliteTodoStore:
+    """以行级 UPSERT 持久化待办列表，并把筛选排序下推到带索引的查询。"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._saved: dict[int, tuple[int, dict[str, Any]]] | None = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=FULL")
+                with connection:
+                    connection.executescript(_SCHEMA)
+                    connection.execute(
+                        "INSERT OR IGNORE INTO meta(key, value) VALUES ('schemaVersion', ?)",
+                        (str(SCHEMA_VERSION),),
+                    )
+                version = connection.execute(
+                    "SELECT value FROM meta WHERE key = 'schemaVersion'"
+                ).fetchone()[0]
+                if int(version) > SCHEMA_VERSION:
+                    raise sqlite3.DatabaseError(
+                        f"{self.path} 的结构版本 {version} 高于当前支持的 {SCHEMA_VERSION}"
+                    )
+                if int(version) < SCHEMA_VERSION:
+                    self._rebuild_derived_columns(connection)
+            except Exception:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _rebuild_derived_columns(connection: sqlite3.Connection) -> None:
+        """按当前规则从整行文档重算派生列，并记录新的结构版本。"""
+
+        rows = connection.execute("SELECT position, document FROM todos").fetchall()
+        with connection:
+            connection.executemany(
+                _UPSERT,
+                (_row_values(json.loads(document), position) for position, document in rows),
+            )
+            connection.execute(
+                "UPDATE meta SET value = ? WHERE key = 'schemaVersion'",
+                (str(SCHEMA_VERSION),),
+            )
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._saved = None
+
+    def row_count(self) -> int | None:
+        """最近一次加载或保存后的行数；尚未读取时返回 None。"""
+
+        return None if self._saved is None else len(self._saved)
+
+    def load(self) -> list[dict[str, Any]]:
+        connection = self._connect()
+        saved: dict[int, tuple[int, dict[str, Any]]] = {}
+        todos: list[dict[str, Any]] = []
+        for todo_id, position, document in connection.execute(
+            "SELECT id, position, document FROM todos ORDER BY position, id"
+        ):
+            todo = json.loads(document)
+            todos.append(todo)
+            saved[todo_id] = (position, dict(todo))
+        self._saved = saved
+        return todos
+
+    def import_todos(self, todos: list[dict[str, Any]], source: Path) -> None:
+        """一次性导入已迁移的 JSON 数据，并记录来源。"""
+
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM todos")
+            connection.executemany(
+                _UPSERT,
+                (_row_values(todo, position) for position, todo in enumerate(todos)),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                (
+                    ("migratedFrom", str(source)),
+                    ("migratedAt", datetime.now(timezone.utc).isoformat()),
+                ),
+            )
+        self._saved = {
+            todo["id"]: (position, dict(todo)) for position, todo in enumerate(todos)
+        }
+
+    def save(self, todos: list[dict[str, Any]]) -> int:
+        """在单个事务中只写入新增、修改或移位的行，返回写入与删除的行数。"""
+
+        if self._saved is None:
+            self.load()
+        previous_rows = self._saved or {}
+        upserts: list[tuple[Any, ...]] = []
+        saved: dict[int, tuple[int, dict[str, Any]]] = {}
+        last_position = -1
+        for todo in todos:
+            todo_id = todo.get("id") if isinstance(todo, dict) else None
+            if not isinstance(todo_id, int) or isinstance(todo_id, bool) or todo_id in saved:
+                raise ValueError(f"SQLite 存储要求任务 ID 为唯一整数，收到 {todo_id!r}")
+
+            previous = previous_rows.get(todo_id)
+            # 位置只需保持单调，删除或末尾追加不会牵动其余行。
+            if previous is not None and previous[0] > last_position:
+                position = previous[0]
+                if previous[1] == todo:
+                    saved[todo_id] = previous
+                    last_position = position
+                    continue
+            else:
+                position = last_position + 1
+            upserts.append(_row_values(todo, position))
+            saved[todo_id] = (position, dict(todo))
+            last_position = position
+
+        deleted = [(todo_id,) for todo_id in previous_rows if todo_id not in saved]
+        if upserts or deleted:
+            connection = self._connect()
+            with connection:
+                connection.executemany(_UPSERT, upserts)
+                connection.executemany("DELETE FROM todos WHERE id = ?", deleted)
+        self._saved = saved
+        return len(upserts) + len(deleted)
+
+    def query_ids(
+        self, filter_name: str, sort_name: str, today_local: date | None = None
+    ) -> list[int]:
+        """按主窗口的筛选与排序选项返回任务 ID 顺序。"""
+
+        where = ""
+        params: tuple[Any, ...] = ()
+        if filter_name == "未完成":
+            where = "WHERE completed = 0"
+        elif filter_name == "已完成":
+            where = "WHERE completed = 1"
+        elif filter_name == "今天到期":
+            if today_local is None:
+                today_local = datetime.now().astimezone().date()
+            where = "WHERE completed = 0 AND due_date_us >= ? AND due_date_us < ?"
+            params = _local_day_bounds_us(today_local)
+        elif filter_name == "高优先级":
+            where = "WHERE completed = 0 AND priority = '高'"
+
+        order = _SORT_CLAUSES.get(sort_name, "position")
+        return [
+            row[0]
+            for row in self._connect().execute(
+                f"SELECT id FROM todos {where} ORDER BY {order}", params
+            )
+        ]
+
+
+__all__ = ["SCHEMA_VERSION", "SqliteTodoStore", "database_path"]
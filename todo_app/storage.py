@@ -1,20 +1,194 @@
 """数据存储与迁移逻辑。"""
 from __future__ import annotations
 
+import gzip
+import hashlib
+import io
 import json
 import logging
+import mmap
 import os
 import tempfile
-from datetime import datetime, timezone
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterable
 
+from .archive import archive_path, encode_archive_header, replay_archive, split_archivable
+from .columnar import (
+    COLUMNAR_MAGIC,
+    ColumnarSnapshot,
+    encode_columnar_snapshot,
+    is_columnar_snapshot,
+)
 from .constants import REMINDER_SECONDS_TO_TEXT_MAP
+from .journal import (
+    apply_journal_records,
+    diff_todo_records,
+    encode_journal_header,
+    encode_journal_records,
+    journal_path,
+    replay_journal,
+)
+from .json_stream import TodoDocumentStream
 from .paths import DATA_FILE
+from .sqlite_store import SqliteTodoStore, database_path
 
 
 logger = logging.getLogger(__name__)
 
+# 主文件顶层为 {"schemaVersion": N, "todos": [...]}；旧版直接保存列表，视为版本 0。
+DATA_SCHEMA_VERSION = 1
+_FIELD_DEFAULTS: dict[str, Any] = {
+    "completed": False,
+    "priority": "中",
+    "dueDate": None,
+    "reminderOffset": 0,
+    "snoozeUntil": None,
+    "lastNotifiedAt": None,
+    "notifiedForReminder": False,
+    "notifiedForDue": False,
+}
+_REQUIRED_FIELDS = frozenset(_FIELD_DEFAULTS)
+# pretty 为便于人工查看的缩进格式；compact 去掉缩进与多余空白；gzip 在 compact 之上压缩；
+# columnar 为按字段分列的二进制快照。加载时按魔数自动识别，几种格式可以随时切换。
+_DATA_FORMATS = ("pretty", "compact", "gzip", "columnar")
+_GZIP_MAGIC = b"\x1f\x8b"
+_COMPACT_SEPARATORS = (",", ":")
+
+
+@dataclass(frozen=True)
+class StorageOptions:
+    """存储行为配置；默认每次保存都原子重写完整的 JSON 主文件。
+
+    ``backend="sqlite"`` 改用同目录 ``todos.sqlite3``，首次加载时从 JSON 数据一次性迁移；
+    变更日志只作用于 JSON 后端。``data_format`` 只决定之后写入的主文件格式，
+    加载总能识别任意一种。归档默认关闭；设置 ``archive_after_days`` 后，完成超过该天数的
+    任务由 ``archive_completed_todos`` 移入 ``todos.archive.jsonl``。
+    """
+
+    backend: str = "json"
+    data_format: str = "pretty"
+    journal_enabled: bool = False
+    journal_compact_records: int = 512
+    journal_compact_bytes: int = 1024 * 1024
+    archive_after_days: float | None = None
+
+
+@dataclass(frozen=True)
+class MigrationStats:
+    """最近一次加载的迁移统计；``schema_version`` 为文件中记录的结构版本。"""
+
+    schema_version: int
+    total: int = 0
+    unchanged: int = 0
+    migrated: int = 0
+    regenerated_ids: int = 0
+    skipped: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """加载结果与文件内容不同，下一次保存需要写出完整快照。"""
+
+        return (
+            self.schema_version != DATA_SCHEMA_VERSION
+            or self.migrated > 0
+            or self.skipped > 0
+        )
+
+
+@dataclass(frozen=True)
+class ArchiveStats:
+    """一次归档的结果：移出主文件的任务数，以及补记完成时刻的旧任务数。"""
+
+    archived: int = 0
+    stamped: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return self.archived > 0 or self.stamped > 0
+
+
+@dataclass
+class _JournalState:
+    """主文件与日志共同表示的最近落盘状态，用于计算下一次增量记录。"""
+
+    data_file: Path
+    base_digest: str
+    base_signature: tuple[int, int, int] | None
+    todos: dict[int, dict[str, Any]]
+    journal_bytes: int = 0
+    record_count: int = 0
+
+
+@dataclass(frozen=True)
+class _FileFingerprint:
+    """最近一次写入或校验通过的主文件指纹，全部吻合时保存可跳过重复的 JSON 解析。"""
+
+    path: Path
+    signature: tuple[int, int, int]
+    digest: str
+
+
+_STORAGE_BACKENDS = ("json", "sqlite")
+
+_options = StorageOptions()
+_state_lock = threading.RLock()
+_journal_state: _JournalState | None = None
+_compaction_thread: threading.Thread | None = None
+_sqlite_store: SqliteTodoStore | None = None
+_sqlite_unavailable: Path | None = None
+_sqlite_synced = False
+_validated_main: _FileFingerprint | None = None
+_last_migration_stats: MigrationStats | None = None
+# 归档内容只在首次需要时读取；追加写入不依赖它是否已加载。
+_archive_cache: dict[int, dict[str, Any]] | None = None
+_archive_cache_path: Path | None = None
+
+
+def configure_storage(options: StorageOptions) -> None:
+    """切换存储配置；已落盘的日志在下次加载时仍会被重放。"""
+
+    global _options, _journal_state, _sqlite_store, _sqlite_unavailable, _sqlite_synced
+    global _validated_main
+    if options.backend not in _STORAGE_BACKENDS:
+        raise ValueError(f"未知的存储后端 {options.backend!r}")
+    if options.data_format not in _DATA_FORMATS:
+        raise ValueError(f"未知的主文件格式 {options.data_format!r}")
+    if options.archive_after_days is not None and options.archive_after_days < 0:
+        raise ValueError(f"归档天数不能为负数: {options.archive_after_days!r}")
+    flush_storage()
+    with _state_lock:
+        _options = options
+        _journal_state = None
+        if _sqlite_store is not None:
+            _sqlite_store.close()
+        _sqlite_store = None
+        _sqlite_unavailable = None
+        _sqlite_synced = False
+        _validated_main = None
+        _drop_archive_cache()
+
+
+def get_storage_options() -> StorageOptions:
+    return _options
+
+
+def get_last_migration_stats() -> MigrationStats | None:
+    """返回最近一次从 JSON 数据加载时的迁移统计；尚未加载时为 None。"""
+
+    return _last_migration_stats
+
+
+def flush_storage(timeout: float | None = None) -> None:
+    """等待进行中的后台日志折叠结束。"""
+
+    thread = _compaction_thread
+    if thread is not None and thread is not threading.current_thread():
+        thread.join(timeout)
+
 
 class _InvalidTodoFile(ValueError):
     """待办文件可读取，但不符合当前顶层结构约束。"""
@@ -24,17 +198,172 @@ def _backup_path(data_file: Path) -> Path:
     return data_file.with_name(f"{data_file.name}.bak")
 
 
-def _decode_todo_list(raw_data: bytes, source: Path) -> list[Any]:
-    parsed = json.loads(raw_data.decode("utf-8"))
-    if not isinstance(parsed, list):
+def _document_schema_version(
+    stream: TodoDocumentStream, source: Path, *, complete: bool
+) -> int | None:
+    """返回文档结构版本，旧版顶层列表为 0；版本号出现在 todos 之后时，解析完成前返回 None。"""
+
+    if stream.is_list:
+        return 0
+    if "schemaVersion" not in stream.header and not complete:
+        return None
+    return _checked_schema_version(stream.header.get("schemaVersion"), source)
+
+
+def _checked_schema_version(schema_version: Any, source: Path) -> int:
+    if not isinstance(schema_version, int) or isinstance(schema_version, bool):
+        raise _InvalidTodoFile(f"{source} 缺少有效的 schemaVersion: {schema_version!r}")
+    if not 0 < schema_version <= DATA_SCHEMA_VERSION:
         raise _InvalidTodoFile(
-            f"{source} 顶层类型为 {type(parsed).__name__}，预期为 list"
+            f"{source} 的结构版本 {schema_version} 不受支持，当前支持到 {DATA_SCHEMA_VERSION}"
         )
-    return parsed
+    return schema_version
+
+
+@dataclass
+class _StreamedDocument:
+    """流式读取的结果；``stats`` 为 None 表示尚未迁移，需先重放日志。"""
+
+    todos: list[Any]
+    schema_version: int
+    digest: str
+    stats: MigrationStats | None
+
+
+class _HashingReader:
+    """在读取的同时累计磁盘原始字节的 SHA-256，压缩文件的哈希同样基于落盘内容。"""
+
+    def __init__(self, fp: BinaryIO):
+        self._fp = fp
+        self.hasher = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._fp.read(size)
+        self.hasher.update(chunk)
+        return chunk
+
+    def drain(self) -> None:
+        while self.read(io.DEFAULT_BUFFER_SIZE * 16):
+            pass
+
+
+def _open_document_stream(fp: BinaryIO, magic: bytes) -> TodoDocumentStream:
+    if magic == _GZIP_MAGIC:
+        return TodoDocumentStream(gzip.GzipFile(fileobj=fp, mode="rb"))
+    return TodoDocumentStream(fp)
+
+
+def _stream_todo_document(source: Path, *, migrate: bool) -> _StreamedDocument:
+    """逐项解析主文件或备份并同步计算内容哈希；``migrate`` 时边解析边迁移。
+
+    只接受顶层列表或带 ``schemaVersion`` 与 ``todos`` 列表的文档，其余结构抛出异常；
+    以 gzip 魔数开头的文件先解压再解析，列式快照经 mmap 逐行还原。
+    """
+
+    with source.open("rb") as fp:
+        magic = fp.read(len(COLUMNAR_MAGIC))
+        if is_columnar_snapshot(magic):
+            return _read_columnar_document(fp, source, migrate=migrate)
+        fp.seek(0)
+        reader = _HashingReader(fp)
+        stream = _open_document_stream(reader, magic[: len(_GZIP_MAGIC)])
+        stream.open()
+        schema_version = _document_schema_version(stream, source, complete=False)
+        if migrate:
+            todos, stats = _migrate_todo_items(stream.items(), schema_version)
+        else:
+            todos, stats = list(stream.items()), None
+        reader.drain()
+    final_version = _document_schema_version(stream, source, complete=True)
+    if stats is not None and stats.schema_version != final_version:
+        stats = replace(stats, schema_version=final_version)
+    return _StreamedDocument(todos, final_version, reader.hasher.hexdigest(), stats)
+
+
+def _read_columnar_document(fp: BinaryIO, source: Path, *, migrate: bool) -> _StreamedDocument:
+    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        digest = hashlib.sha256(mapped).hexdigest()
+        snapshot = ColumnarSnapshot(mapped)
+        try:
+            schema_version = _checked_schema_version(snapshot.schema_version, source)
+            rows = (snapshot.record(row) for row in range(snapshot.count))
+            if migrate:
+                todos, stats = _migrate_todo_items(rows, schema_version)
+            else:
+                todos, stats = list(rows), None
+        finally:
+            snapshot.release()
+    return _StreamedDocument(todos, schema_version, digest, stats)
+
+
+def _validate_todo_document(raw_data: bytes, source: Path) -> None:
+    """按加载时相同的规则校验内容，不保留解析出的任务。"""
+
+    if is_columnar_snapshot(raw_data):
+        snapshot = ColumnarSnapshot(raw_data)
+        try:
+            _checked_schema_version(snapshot.schema_version, source)
+            for row in range(snapshot.count):
+                snapshot.record(row)
+        finally:
+            snapshot.release()
+        return
+    stream = _open_document_stream(io.BytesIO(raw_data), raw_data[: len(_GZIP_MAGIC)])
+    stream.open()
+    _document_schema_version(stream, source, complete=False)
+    for _ in stream.items():
+        pass
+    _document_schema_version(stream, source, complete=True)
 
 
-def _read_todo_list(source: Path) -> list[Any]:
-    return _decode_todo_list(source.read_bytes(), source)
+def _encode_todo_document(todos_list: list[dict[str, Any]]) -> bytes:
+    if _options.data_format == "columnar":
+        return encode_columnar_snapshot(todos_list, DATA_SCHEMA_VERSION)
+    document = {"schemaVersion": DATA_SCHEMA_VERSION, "todos": todos_list}
+    if _options.data_format == "pretty":
+        return json.dumps(document, ensure_ascii=False, indent=4).encode("utf-8")
+    compact = json.dumps(document, ensure_ascii=False, separators=_COMPACT_SEPARATORS)
+    if _options.data_format == "compact":
+        return compact.encode("utf-8")
+    # 固定 mtime，相同内容得到相同字节，日志基准哈希与指纹缓存保持稳定。
+    return gzip.compress(compact.encode("utf-8"), compresslevel=6, mtime=0)
+
+
+def _content_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _stat_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    return stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino
+
+
+def _remember_valid_main(signature: tuple[int, int, int] | None, digest: str) -> None:
+    global _validated_main
+    _validated_main = (
+        None if signature is None else _FileFingerprint(DATA_FILE, signature, digest)
+    )
+
+
+def _is_known_valid_main(
+    signature: tuple[int, int, int] | None, content: bytes
+) -> bool:
+    """主文件自上次写入或校验后未被外部修改时返回 True。
+
+    大小、mtime 与 inode 只用于快速排除；内容哈希比完整 JSON 解析便宜得多，
+    同时覆盖粗粒度时间戳下同尺寸原地改写的情况。
+    """
+
+    fingerprint = _validated_main
+    return (
+        fingerprint is not None
+        and fingerprint.path == DATA_FILE
+        and fingerprint.signature == signature
+        and fingerprint.digest == _content_digest(content)
+    )
 
 
 def _write_fsynced_temp(destination: Path, content: bytes) -> Path:
@@ -66,8 +395,43 @@ def _cleanup_temp(temp_path: Path | None) -> None:
         logger.exception("清理临时数据文件失败: %s", temp_path)
 
 
-def _migrate_and_validate_todo_item(todo_dict: dict[str, Any], current_index: int, processed: list[dict[str, Any]]
-                                    ) -> dict[str, Any]:
+class _TodoIdAllocator:
+    """单次遍历中维护已处理任务的最大 ID，为缺失或非法 ID 的任务分配新值。"""
+
+    def __init__(self, now: datetime):
+        self._base_ms = int(now.timestamp() * 1000)
+        self._max_id: int | None = None
+
+    def observe(self, todo_id: int) -> None:
+        if self._max_id is None or todo_id > self._max_id:
+            self._max_id = todo_id
+
+    def allocate(self, current_index: int) -> int:
+        candidate_id = self._base_ms + current_index
+        new_id = candidate_id if self._max_id is None else max(candidate_id, self._max_id + 1)
+        self._max_id = new_id
+        return new_id
+
+
+def _is_current_todo_item(todo_data: Any) -> bool:
+    """已是当前结构的任务只做类型检查，逐项迁移对其不会产生任何改动。"""
+
+    return (
+        isinstance(todo_data, dict)
+        and type(todo_data.get("id")) is int
+        and bool(todo_data.get("createdAt"))
+        and todo_data.keys() >= _REQUIRED_FIELDS
+    )
+
+
+def _migrate_and_validate_todo_item(
+    todo_dict: dict[str, Any],
+    current_index: int,
+    ids: _TodoIdAllocator,
+    now_iso: str,
+) -> tuple[dict[str, Any], bool]:
+    """补全单个任务的缺省字段，返回迁移结果及是否重新生成了 ID。"""
+
     item = dict(todo_dict)
     is_new_id_needed = False
     original_id_for_warning = item.get("id", "未提供")
@@ -88,37 +452,91 @@ def _migrate_and_validate_todo_item(todo_dict: dict[str, Any], current_index: in
         item["id"] = int(item["id"])
 
     if is_new_id_needed:
-        processed_ids = [it["id"] for it in processed if isinstance(it.get("id"), int)]
-        current_max_id = max(processed_ids) if processed_ids else 0
-        candidate_id = int(datetime.now(timezone.utc).timestamp() * 1000) + current_index
-        new_id = max(candidate_id, current_max_id + 1 if processed_ids else candidate_id)
-        existing_ids = set(processed_ids)
-        while new_id in existing_ids:
-            new_id += 1
-        item["id"] = new_id
-
-    item.setdefault("createdAt", datetime.now(timezone.utc).isoformat())
-    if not item["createdAt"]:
-        item["createdAt"] = datetime.now(timezone.utc).isoformat()
-
-    item.setdefault("completed", False)
-    item.setdefault("priority", "中")
-    item.setdefault("dueDate", None)
-    item.setdefault("reminderOffset", 0)
-    item.setdefault("snoozeUntil", None)
-    item.setdefault("lastNotifiedAt", None)
-    item.setdefault("notifiedForReminder", False)
-    item.setdefault("notifiedForDue", False)
-    return item
+        item["id"] = ids.allocate(current_index)
+    else:
+        ids.observe(int(item["id"]))
+
+    if not item.get("createdAt"):
+        item["createdAt"] = now_iso
+    for field, default in _FIELD_DEFAULTS.items():
+        item.setdefault(field, default)
+    return item, is_new_id_needed
+
+
+def _migrate_todo_items(
+    todos_from_file: Iterable[Any], schema_version: int | None
+) -> tuple[list[dict[str, Any]], MigrationStats]:
+    """一次遍历完成迁移；当前结构版本的任务走只做类型检查的快速路径。
+
+    ``todos_from_file`` 可以是流式解析的迭代器；版本尚未确定（None）时全部逐项迁移。
+    """
+
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    ids = _TodoIdAllocator(now)
+    fast_path = schema_version == DATA_SCHEMA_VERSION
+    migrated: list[dict[str, Any]] = []
+    total = unchanged = migrated_count = regenerated_ids = skipped = 0
+    for index, todo_data in enumerate(todos_from_file):
+        total += 1
+        if fast_path and _is_current_todo_item(todo_data):
+            ids.observe(todo_data["id"])
+            migrated.append(todo_data)
+            unchanged += 1
+            continue
+        if not isinstance(todo_data, dict):
+            logger.warning("文件中发现非字典类型的任务项 %r，已跳过", str(todo_data)[:100])
+            skipped += 1
+            continue
+        try:
+            migrated_item, regenerated = _migrate_and_validate_todo_item(
+                todo_data, index, ids, now_iso
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.exception(
+                "迁移和验证任务 %r 时失败，该任务将被跳过: %s",
+                str(todo_data)[:100],
+                exc,
+            )
+            skipped += 1
+            continue
+        if migrated_item == todo_data:
+            unchanged += 1
+        else:
+            migrated_count += 1
+        regenerated_ids += regenerated
+        migrated.append(migrated_item)
+
+    stats = MigrationStats(
+        schema_version=schema_version or 0,
+        total=total,
+        unchanged=unchanged,
+        migrated=migrated_count,
+        regenerated_ids=regenerated_ids,
+        skipped=skipped,
+    )
+    return migrated, stats
 
 
 def load_todos() -> list[dict[str, Any]]:
+    if _options.backend == "sqlite":
+        return _load_sqlite_todos()
+    return _load_json_todos()[0]
+
+
+def _load_json_todos() -> tuple[list[dict[str, Any]], bool]:
+    """读取 JSON 主文件（必要时只读回退到备份），返回迁移后的列表及是否来自备份。"""
+
+    global _journal_state, _last_migration_stats
     if not DATA_FILE.exists():
-        return []
+        return [], False
 
     source = DATA_FILE
+    started = time.perf_counter()
+    # 存在日志时需先在原始内容上重放，之后再迁移；否则解析与迁移在同一遍流式完成。
+    has_journal = journal_path(DATA_FILE).exists()
     try:
-        todos_from_file = _read_todo_list(DATA_FILE)
+        document = _stream_todo_document(DATA_FILE, migrate=not has_journal)
     except Exception as exc:  # noqa: BLE001
         backup = _backup_path(DATA_FILE)
         logger.warning(
@@ -128,70 +546,525 @@ def load_todos() -> list[dict[str, Any]]:
             exc,
         )
         try:
-            todos_from_file = _read_todo_list(backup)
+            # 日志的基准哈希与备份一致时（日志周期开始时会刷新备份），可在备份上继续重放。
+            document = _stream_todo_document(backup, migrate=not has_journal)
             source = backup
         except Exception as backup_exc:  # noqa: BLE001
             logger.warning(
                 "主数据文件与备份均不可用，将返回空列表；主文件会保持原样: %s",
                 backup_exc,
             )
-            return []
+            return [], True
 
     if source != DATA_FILE:
         logger.warning("已从备份 %s 恢复待办数据，损坏的主文件 %s 未被修改", source, DATA_FILE)
 
-    migrated: list[dict[str, Any]] = []
-    for index, todo_data in enumerate(todos_from_file):
-        if not isinstance(todo_data, dict):
-            logger.warning("文件中发现非字典类型的任务项 %r，已跳过", str(todo_data)[:100])
-            continue
+    base_digest: str | None = None
+    journal_bytes = record_count = 0
+    migrated, stats = document.todos, document.stats
+    if source == DATA_FILE:
+        base_digest = document.digest
+    if stats is None:
+        todos_from_file, journal_bytes, record_count = _replay_journal_file(
+            document.digest, document.todos
+        )
+        migrated, stats = _migrate_todo_items(todos_from_file, document.schema_version)
+    if stats.changed:
+        logger.info(
+            "已按结构版本 %d -> %d 加载 %d 条任务：迁移 %d 条（重新生成 ID %d 条），"
+            "跳过 %d 条，用时 %.1f ms",
+            stats.schema_version,
+            DATA_SCHEMA_VERSION,
+            stats.total,
+            stats.migrated,
+            stats.regenerated_ids,
+            stats.skipped,
+            (time.perf_counter() - started) * 1000,
+        )
+
+    with _state_lock:
+        _last_migration_stats = stats
+        _journal_state = None
+        if base_digest is not None:
+            main_signature = _stat_signature(DATA_FILE)
+            _remember_valid_main(main_signature, base_digest)
+            if _journal_enabled() and not stats.changed:
+                _journal_state = _build_journal_state(
+                    base_digest, main_signature, migrated, journal_bytes, record_count
+                )
+    return migrated, source != DATA_FILE
+
+
+def _journal_enabled() -> bool:
+    return _options.backend == "json" and _options.journal_enabled
+
+
+def _load_sqlite_todos() -> list[dict[str, Any]]:
+    """从 SQLite 加载；数据库尚不存在时由 JSON 数据一次性迁移。"""
+
+    global _sqlite_unavailable, _sqlite_synced
+    with _state_lock:
+        store = _sqlite_store_for_data_file()
+        _sqlite_synced = False
         try:
-            migrated.append(_migrate_and_validate_todo_item(todo_data, index, migrated))
+            if store.exists():
+                todos = store.load()
+            else:
+                todos = _migrate_json_to_sqlite(store)
         except Exception as exc:  # noqa: BLE001
-            logger.exception(
-                "迁移和验证任务 %r 时失败，该任务将被跳过: %s",
-                str(todo_data)[:100],
+            store.close()
+            _sqlite_unavailable = store.path
+            logger.warning(
+                "SQLite 数据库 %s 不可用，将只读加载 JSON 数据；数据库保持原样且保存会被拒绝: %s",
+                store.path,
                 exc,
             )
-    return migrated
+            return _load_json_todos()[0]
+
+        _sqlite_unavailable = None
+        _sqlite_synced = True
+        return todos
+
+
+def _migrate_json_to_sqlite(store: SqliteTodoStore) -> list[dict[str, Any]]:
+    """复用 JSON 加载与逐项迁移，先写入临时数据库再原子替换到位。"""
+
+    todos, from_backup = _load_json_todos()
+    if from_backup:
+        raise _InvalidTodoFile(f"{DATA_FILE} 不可用，需人工处理后才能迁移到 SQLite")
+
+    staging = SqliteTodoStore(store.path.with_name(f".{store.path.name}.migrating"))
+    try:
+        staging.path.unlink(missing_ok=True)
+        staging.import_todos(todos, DATA_FILE)
+        staging.close()
+        os.replace(staging.path, store.path)
+    finally:
+        staging.close()
+        _cleanup_temp(staging.path)
+    logger.info("已将 %d 条任务从 %s 迁移到 %s", len(todos), DATA_FILE, store.path)
+    store.load()
+    return todos
+
+
+def _sqlite_store_for_data_file() -> SqliteTodoStore:
+    global _sqlite_store
+    path = database_path(DATA_FILE)
+    if _sqlite_store is None or _sqlite_store.path != path:
+        if _sqlite_store is not None:
+            _sqlite_store.close()
+        _sqlite_store = SqliteTodoStore(path)
+    return _sqlite_store
+
+
+def query_todo_ids(
+    filter_name: str, sort_name: str, todos_list: list[dict[str, Any]]
+) -> list[int] | None:
+    """SQLite 后端已保存最新状态时，把筛选排序下推到索引查询；否则返回 None。
+
+    调用方需保证内存列表的修改都已保存完成；这里只额外核对任务数量。
+    """
+
+    with _state_lock:
+        if _options.backend != "sqlite" or not _sqlite_synced or _sqlite_store is None:
+            return None
+        if _sqlite_store.row_count() != len(todos_list):
+            return None
+        try:
+            return _sqlite_store.query_ids(filter_name, sort_name)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("SQLite 筛选排序查询失败，将回退到内存处理: %s", exc)
+            return None
+
+
+def _drop_archive_cache() -> None:
+    global _archive_cache, _archive_cache_path
+    _archive_cache = None
+    _archive_cache_path = None
+
+
+def _archived_todos_by_id() -> dict[int, dict[str, Any]]:
+    """读取并缓存归档内容；调用方需持有 ``_state_lock``。"""
+
+    global _archive_cache, _archive_cache_path
+    path = archive_path(DATA_FILE)
+    if _archive_cache is not None and _archive_cache_path == path:
+        return _archive_cache
+    try:
+        raw_archive = path.read_bytes()
+    except FileNotFoundError:
+        raw_archive = b""
+    replay = replay_archive(raw_archive) if raw_archive else None
+    if replay is not None and replay.skipped:
+        logger.warning("归档文件 %s 中有 %d 行无法解析，已忽略", path, replay.skipped)
+    _archive_cache = replay.todos if replay is not None else {}
+    _archive_cache_path = path
+    return _archive_cache
+
+
+def _append_archive_records(records: list[dict[str, Any]]) -> bool:
+    """把 put/del 记录追加到归档文件末尾；已有内容从不改写。"""
+
+    path = archive_path(DATA_FILE)
+    payload = encode_journal_records(records)
+    header_temp: Path | None = None
+    try:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size == 0:
+            header_temp = _write_fsynced_temp(path, encode_archive_header())
+            os.replace(header_temp, path)
+            header_temp = None
+        else:
+            with path.open("rb") as fp:
+                fp.seek(-1, os.SEEK_END)
+                if fp.read(1) != b"\n":
+                    # 上次追加只写了半行时另起一行，重放会跳过那半行。
+                    payload = b"\n" + payload
+        with path.open("ab") as fp:
+            fp.write(payload)
+            fp.flush()
+            os.fsync(fp.fileno())
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("追加归档文件 %s 失败: %s", path, exc)
+        return False
+    finally:
+        _cleanup_temp(header_temp)
+
+    if _archive_cache is not None and _archive_cache_path == path:
+        apply_journal_records(_archive_cache, [_detached_record(record) for record in records])
+    return True
+
+
+def archive_completed_todos(
+    todos_list: list[dict[str, Any]], now: datetime | None = None
+) -> ArchiveStats:
+    """把完成超过 ``archive_after_days`` 天的任务追加到归档文件，并从 ``todos_list`` 原地移除。
+
+    缺少 ``completedAt`` 的已完成任务以本次时刻补记，从此开始计算归档期限。
+    归档先于主文件落盘，两者之间中断时任务会同时出现在两边，以主文件为准。
+    """
+
+    days = _options.archive_after_days
+    if days is None:
+        return ArchiveStats()
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    stamped = 0
+    for todo in todos_list:
+        if isinstance(todo, dict) and todo.get("completed", False) and not todo.get("completedAt"):
+            todo["completedAt"] = now.isoformat()
+            stamped += 1
+
+    hot, cold = split_archivable(todos_list, now - timedelta(days=days))
+    if not cold:
+        return ArchiveStats(stamped=stamped)
+    with _state_lock:
+        if not _append_archive_records([{"op": "put", "todo": todo} for todo in cold]):
+            return ArchiveStats(stamped=stamped)
+    todos_list[:] = hot
+    logger.info("已将 %d 条完成超过 %s 天的任务移入归档", len(cold), days)
+    return ArchiveStats(archived=len(cold), stamped=stamped)
+
+
+def load_archived_todos() -> list[dict[str, Any]]:
+    """返回归档中的任务（按归档顺序）；首次调用时才读取归档文件，结果不应被修改。"""
+
+    with _state_lock:
+        try:
+            return list(_archived_todos_by_id().values())
+        except (OSError, ValueError) as exc:
+            logger.warning("读取归档文件失败，将不显示归档任务: %s", exc)
+            return []
+
+
+def update_archived_todo(todo: dict[str, Any]) -> bool:
+    """以追加记录的方式更新归档中的任务。"""
+
+    with _state_lock:
+        return _append_archive_records([{"op": "put", "todo": dict(todo)}])
+
+
+def remove_archived_todo(todo_id: int) -> dict[str, Any] | None:
+    """从归档中移除任务（追加删除记录），返回被移除的任务；不存在时返回 None。"""
+
+    with _state_lock:
+        try:
+            archived = _archived_todos_by_id().get(todo_id)
+        except (OSError, ValueError) as exc:
+            logger.warning("读取归档文件失败，无法移除任务 %r: %s", todo_id, exc)
+            return None
+        if archived is None or not _append_archive_records([{"op": "del", "id": todo_id}]):
+            return None
+        return dict(archived)
+
+
+def _replay_journal_file(base_digest: str, todos: list[Any]) -> tuple[list[Any], int, int]:
+    """在主文件内容之上重放匹配的日志，返回结果、可续写的日志长度与记录数。"""
+
+    journal_file = journal_path(DATA_FILE)
+    try:
+        raw_journal = journal_file.read_bytes()
+    except FileNotFoundError:
+        return todos, 0, 0
+    except OSError as exc:
+        logger.warning("读取变更日志 %s 失败，将只使用主文件: %s", journal_file, exc)
+        return todos, 0, 0
+
+    replay = replay_journal(raw_journal, base_digest, todos)
+    if replay.stale:
+        logger.info("变更日志 %s 与主文件不匹配，视为已折叠的旧日志并忽略", journal_file)
+        return todos, 0, 0
+    if replay.truncated:
+        logger.warning(
+            "变更日志 %s 在第 %d 条记录后不完整，已丢弃未完整写入的尾部",
+            journal_file,
+            replay.record_count,
+        )
+        try:
+            os.truncate(journal_file, replay.valid_length)
+        except OSError:
+            logger.exception("截断变更日志失败，下次保存将改写日志头: %s", journal_file)
+            return replay.todos, 0, replay.record_count
+    return replay.todos, replay.valid_length, replay.record_count
+
+
+def _build_journal_state(
+    base_digest: str,
+    base_signature: tuple[int, int, int] | None,
+    todos: list[Any],
+    journal_bytes: int,
+    record_count: int = 0,
+) -> _JournalState | None:
+    """记录快照基准；ID 缺失或重复的列表无法增量表达，返回 None。"""
+
+    snapshot: dict[int, dict[str, Any]] = {}
+    for todo in todos:
+        todo_id = todo.get("id") if isinstance(todo, dict) else None
+        if not isinstance(todo_id, int) or isinstance(todo_id, bool) or todo_id in snapshot:
+            return None
+        snapshot[todo_id] = dict(todo)
+    return _JournalState(
+        DATA_FILE, base_digest, base_signature, snapshot, journal_bytes, record_count
+    )
+
+
+def save_todos(todos_list: list[dict[str, Any]]) -> bool:
+    """保存完整待办列表，返回是否成功落盘；失败只记录日志，不抛出异常。"""
+
+    with _state_lock:
+        if _options.backend == "sqlite":
+            return _save_sqlite(todos_list)
+        if _journal_enabled() and _append_journal(todos_list):
+            return True
+        return _save_snapshot(todos_list)
+
+
+def _save_sqlite(todos_list: list[dict[str, Any]]) -> bool:
+    global _sqlite_synced
+    _sqlite_synced = False
+    store = _sqlite_store_for_data_file()
+    if _sqlite_unavailable == store.path:
+        logger.error(
+            "拒绝写入不可用的 SQLite 数据库 %s；请先人工保留或移走该文件",
+            store.path,
+        )
+        return False
+    try:
+        store.save(todos_list)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("保存数据到 SQLite 时出错，事务已回滚: %s", exc)
+        return False
+    _sqlite_synced = True
+    return True
+
+
+def _append_journal(todos_list: list[dict[str, Any]]) -> bool:
+    """把相对上次落盘状态的变化追加到日志；无法增量表达时返回 False。"""
+
+    state = _journal_state
+    if state is None or state.data_file != DATA_FILE:
+        return False
+    if _stat_signature(DATA_FILE) != state.base_signature:
+        # 主文件被外部替换或修改，交由完整保存重新校验并拒绝覆盖损坏文件。
+        return False
+
+    records = diff_todo_records(state.todos, todos_list)
+    if records is None:
+        return False
+    if not records:
+        return True
+
+    journal_file = journal_path(DATA_FILE)
+    payload = encode_journal_records(records)
+    try:
+        if state.journal_bytes == 0:
+            base_content = DATA_FILE.read_bytes()
+            if _content_digest(base_content) != state.base_digest:
+                return False
+            state.journal_bytes = _start_journal_epoch(state.base_digest, base_content)
+        with journal_file.open("ab") as fp:
+            fp.write(payload)
+            fp.flush()
+            os.fsync(fp.fileno())
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("追加变更日志失败，将改为完整保存: %s", exc)
+        return False
+
+    apply_journal_records(state.todos, [_detached_record(record) for record in records])
+    state.record_count += len(records)
+    state.journal_bytes += len(payload)
+    if (
+        state.record_count >= _options.journal_compact_records
+        or state.journal_bytes >= _options.journal_compact_bytes
+    ):
+        _schedule_compaction()
+    return True
+
+
+def _detached_record(record: dict[str, Any]) -> dict[str, Any]:
+    if record["op"] == "put":
+        return {"op": "put", "todo": dict(record["todo"])}
+    return record
+
+
+def _schedule_compaction() -> None:
+    global _compaction_thread
+    if _compaction_thread is not None and _compaction_thread.is_alive():
+        return
+    _compaction_thread = threading.Thread(
+        target=_compact_journal,
+        name="todo-journal-compaction",
+        daemon=True,
+    )
+    _compaction_thread.start()
+
 
+def _compact_journal() -> None:
+    """后台将日志折叠进主文件快照，沿用完整保存的备份与损坏保护。"""
 
-def save_todos(todos_list: list[dict[str, Any]]) -> None:
+    with _state_lock:
+        state = _journal_state
+        if state is None or state.data_file != DATA_FILE or state.record_count == 0:
+            return
+        _save_snapshot(list(state.todos.values()))
+
+
+def _save_snapshot(todos_list: list[dict[str, Any]]) -> bool:
     data_temp: Path | None = None
-    backup_temp: Path | None = None
     try:
         DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-        serialized = json.dumps(todos_list, ensure_ascii=False, indent=4).encode("utf-8")
+        serialized = _encode_todo_document(todos_list)
         data_temp = _write_fsynced_temp(DATA_FILE, serialized)
 
-        if DATA_FILE.exists():
+        current_signature = _stat_signature(DATA_FILE)
+        if current_signature is not None:
             current_content = DATA_FILE.read_bytes()
-            try:
-                _decode_todo_list(current_content, DATA_FILE)
-            except Exception as exc:  # noqa: BLE001
-                logger.error(
-                    "拒绝覆盖不可用的主数据文件 %s；请先人工保留或移走该文件: %s",
-                    DATA_FILE,
-                    exc,
-                )
-                return
+            if not _is_known_valid_main(current_signature, current_content):
+                try:
+                    _validate_todo_document(current_content, DATA_FILE)
+                except Exception as exc:  # noqa: BLE001
+                    logger.error(
+                        "拒绝覆盖不可用的主数据文件 %s；请先人工保留或移走该文件: %s",
+                        DATA_FILE,
+                        exc,
+                    )
+                    return False
 
-            backup = _backup_path(DATA_FILE)
-            backup_temp = _write_fsynced_temp(backup, current_content)
-            os.replace(backup_temp, backup)
-            backup_temp = None
+            # 日志模式下新快照落盘后会以它开始新的日志周期并刷新备份，无需先复制旧主文件；
+            # 两步之间中断时，旧备份与旧日志仍能还原出快照之前的状态。
+            if not _journal_enabled():
+                _write_backup(current_content)
 
         os.replace(data_temp, DATA_FILE)
         data_temp = None
     except Exception as exc:  # noqa: BLE001
         logger.exception("保存数据时出错，原主文件保持不变: %s", exc)
+        return False
     finally:
-        _cleanup_temp(backup_temp)
         _cleanup_temp(data_temp)
 
+    base_digest = _content_digest(serialized)
+    _remember_valid_main(_stat_signature(DATA_FILE), base_digest)
+    _reset_journal(base_digest, todos_list, serialized)
+    return True
+
+
+def _write_backup(content: bytes) -> None:
+    backup_temp: Path | None = None
+    try:
+        backup = _backup_path(DATA_FILE)
+        backup_temp = _write_fsynced_temp(backup, content)
+        os.replace(backup_temp, backup)
+        backup_temp = None
+    finally:
+        _cleanup_temp(backup_temp)
+
+
+def _start_journal_epoch(base_digest: str, base_content: bytes) -> int:
+    """以 ``base_content`` 开始新的日志周期，返回日志头长度。
+
+    备份先刷新为同一份基准快照，主文件损坏时加载流程可在备份上重放日志，
+    不会只恢复到更早的快照。
+    """
+
+    _write_backup(base_content)
+    journal_file = journal_path(DATA_FILE)
+    header_temp: Path | None = None
+    try:
+        header = encode_journal_header(base_digest)
+        header_temp = _write_fsynced_temp(journal_file, header)
+        os.replace(header_temp, journal_file)
+        header_temp = None
+    finally:
+        _cleanup_temp(header_temp)
+    return len(header)
+
+
+def _reset_journal(
+    base_digest: str, todos_list: list[dict[str, Any]], base_content: bytes
+) -> None:
+    """完整快照落盘后旧日志已被折叠；日志模式下以新快照开始新的日志周期。"""
+
+    global _journal_state
+    _journal_state = None
+    journal_file = journal_path(DATA_FILE)
+    if not _journal_enabled():
+        try:
+            journal_file.unlink(missing_ok=True)
+        except OSError:
+            logger.exception("移除已折叠的变更日志失败，加载时会按基准校验忽略: %s", journal_file)
+        return
+
+    try:
+        header_length = _start_journal_epoch(base_digest, base_content)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("重置变更日志失败，下次保存将改写完整快照: %s", exc)
+        return
+
+    _journal_state = _build_journal_state(
+        base_digest, _stat_signature(DATA_FILE), todos_list, header_length
+    )
+
 
 __all__ = [
+    "ArchiveStats",
+    "DATA_SCHEMA_VERSION",
+    "MigrationStats",
+    "StorageOptions",
+    "archive_completed_todos",
+    "configure_storage",
+    "flush_storage",
+    "get_last_migration_stats",
+    "get_storage_options",
+    "load_archived_todos",
     "load_todos",
+    "query_todo_ids",
+    "remove_archived_todo",
     "save_todos",
+    "update_archived_todo",
     "REMINDER_SECONDS_TO_TEXT_MAP",
 ]
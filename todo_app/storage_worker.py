@@ -0,0 +1,97 @@
+"""后台合并保存待办快照的写后（write-behind）工作器。"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+logger = logging.getLogger(__name__)
+
+
+class TodoSaveWorker(QObject):
+    """GUI 线程只标记待保存，合并窗口结束时拍一次快照交给后台线程写入。
+
+    写入在单线程执行器中按提交顺序串行完成；``save_finished`` 从后台线程发出，
+    连接到 GUI 对象的槽会经 Qt 排队连接回到主线程执行。
+    """
+
+    save_finished = Signal(bool)
+
+    def __init__(
+        self,
+        source: Callable[[], list[dict[str, Any]]],
+        save_function: Callable[[list[dict[str, Any]]], Optional[bool]],
+        coalesce_ms: int,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._source = source
+        self._save_function = save_function
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="todo-save",
+        )
+        self._last_future: Optional[Future[bool]] = None
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(max(coalesce_ms, 0))
+        self._coalesce_timer.timeout.connect(self._submit_snapshot)
+
+    def request_save(self) -> None:
+        """登记一次保存请求；合并窗口内的多次请求只写入一次最新状态。"""
+
+        if self._executor is None:
+            self._write_snapshot(self._snapshot())
+            return
+        if not self._coalesce_timer.isActive():
+            self._coalesce_timer.start()
+
+    def has_pending(self) -> bool:
+        """仍有未提交或正在写入的快照时返回 True。"""
+
+        return self._coalesce_timer.isActive() or (
+            self._last_future is not None and not self._last_future.done()
+        )
+
+    def flush(self) -> bool:
+        """立即提交待保存快照并阻塞等待所有写入完成，返回最后一次写入是否成功。"""
+
+        if self._coalesce_timer.isActive():
+            self._coalesce_timer.stop()
+            self._submit_snapshot()
+        future = self._last_future
+        if future is None:
+            return True
+        return future.result()
+
+    def shutdown(self) -> bool:
+        """写完待保存快照后停止后台线程；之后的保存请求改为同步执行。"""
+
+        result = self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        return result
+
+    def _snapshot(self) -> list[dict[str, Any]]:
+        return [dict(todo) for todo in self._source()]
+
+    def _submit_snapshot(self) -> None:
+        if self._executor is None:
+            return
+        self._last_future = self._executor.submit(self._write_snapshot, self._snapshot())
+
+    def _write_snapshot(self, snapshot: list[dict[str, Any]]) -> bool:
+        try:
+            succeeded = self._save_function(snapshot) is not False
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("后台保存待办数据失败: %s", exc)
+            succeeded = False
+        self.save_finished.emit(succeeded)
+        return succeeded
+
+
+__all__ = ["TodoSaveWorker"]
@@ -0,0 +1,692 @@
+"""任务列表的模型/视图：委托按行绘制卡片，只有鼠标所在行持有真实卡片部件。"""
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QPersistentModelIndex,
+    QPoint,
+    QSize,
+    Qt,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QCursor, QPixmap, QRegion
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QListView,
+    QStyledItemDelegate,
+    QWidget,
+)
+
+from .layout import (
+    TaskCardLayout,
+    TaskCardLayoutInput,
+    calculate_card_width,
+    calculate_task_card_layout,
+    calculate_task_card_layouts,
+)
+from .scheduling import DeadlineQueue, to_epoch_ms
+from .theme import ThemeColors
+from .widgets import TimerPresentation, TodoItemWidget, timer_presentation
+
+
+# 行高缓存按任务文本等键共享；超过可见行数太多时整体丢弃，避免长期累积。
+_HEIGHT_CACHE_SLACK = 256
+# 增量对齐中移动行超过该次数时改为整体重置，避免逐行查找退化为平方复杂度。
+_MAX_INCREMENTAL_MOVES = 64
+# 空闲卡片池的默认上限；同一时刻只有悬停行持有卡片，少量余量足以覆盖重置与切换。
+_CARD_POOL_CAPACITY = 4
+# 空闲时每轮精确测量的估算行数；其余留到下一轮，避免长时间占用事件循环。
+_IDLE_MEASURE_BATCH = 32
+# 视图每轮排布的行数；从顶部起分批排布，剩余行在后续事件循环中继续。
+_LAYOUT_BATCH_SIZE = 64
+# 行位图缓存至少保留的行数；实际上限取可见行数的两倍，滚动来回时不必重新渲染。
+_PAINTED_ROWS_MIN_CAPACITY = 16
+
+
+class TodoListModel(QAbstractListModel):
+    """持有当前筛选与排序下的任务副本，每行只保存一个字典引用。"""
+
+    # 增量对齐中被删除或替换内容的行的任务 ID 集合，供委托丢弃按行缓存的绘制结果。
+    rows_invalidated = Signal(object)
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._todos: list[dict] = []
+        # 行副本的原始任务来源；标记过期后只在行被访问时按需从来源同步。
+        self._row_source: Optional[Callable[[object], Optional[dict]]] = None
+        self._fresh_ids: set = set()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self._todos)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> object:
+        if not index.isValid() or not 0 <= index.row() < len(self._todos):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.AccessibleTextRole):
+            return self._todos[index.row()].get("text", "")
+        return None
+
+    def todos(self) -> list[dict]:
+        return self._todos
+
+    def todo_at(self, row: int) -> dict:
+        return self._todos[row]
+
+    def set_row_source(self, source: Optional[Callable[[object], Optional[dict]]]) -> None:
+        """设置按任务 ID 查找原始任务的函数，供过期行同步使用。"""
+
+        self._row_source = source
+
+    def mark_stale(self) -> None:
+        """把全部行标记为过期；开销只与上次标记后同步过的行数有关。"""
+
+        self._fresh_ids.clear()
+
+    def refresh_rows(self, rows) -> None:
+        """把过期行从原始任务同步到行副本，每次标记后每行最多同步一次。"""
+
+        if self._row_source is None:
+            return
+        for row in rows:
+            if not 0 <= row < len(self._todos):
+                continue
+            todo = self._todos[row]
+            todo_id = todo.get("id")
+            if todo_id in self._fresh_ids:
+                continue
+            self._fresh_ids.add(todo_id)
+            original_ref = self._row_source(todo_id)
+            if original_ref:
+                todo.update(original_ref)
+
+    def set_todos(self, todos: list[dict]) -> None:
+        self.beginResetModel()
+        self._todos = list(todos)
+        self.endResetModel()
+
+    def reconcile(self, todos: list[dict]) -> int:
+        """按任务 ID 把行对齐到 ``todos`` 的顺序，返回内容被替换的行数。
+
+        只删除、插入、移动或替换有差异的行，未变化的行保留原字典、持久索引与
+        悬停卡片；新增或变化的行保存副本，不修改 ``todos`` 中的字典。
+        """
+
+        target_ids = [todo.get("id") for todo in todos]
+        if not self._todos or len(set(target_ids)) != len(target_ids):
+            self.set_todos([todo.copy() for todo in todos])
+            return len(todos)
+
+        invalidated = self._remove_rows_except(set(target_ids))
+        changed = 0
+        moves = 0
+        for row, todo in enumerate(todos):
+            todo_id = target_ids[row]
+            if row >= len(self._todos) or self._todos[row].get("id") != todo_id:
+                source = self._find_row(todo_id, row + 1)
+                if source is None:
+                    self.beginInsertRows(QModelIndex(), row, row)
+                    self._todos.insert(row, todo.copy())
+                    self.endInsertRows()
+                    continue
+                moves += 1
+                if moves > _MAX_INCREMENTAL_MOVES:
+                    self._emit_invalidated(invalidated)
+                    return changed + self._reset_tail(row, todos[row:])
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                self._todos.insert(row, self._todos.pop(source))
+                self.endMoveRows()
+
+            if self._todos[row] != todo:
+                self._todos[row] = todo.copy()
+                invalidated.add(todo_id)
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index)
+                changed += 1
+        self._emit_invalidated(invalidated)
+        return changed
+
+    def _emit_invalidated(self, todo_ids: set) -> None:
+        if todo_ids:
+            self.rows_invalidated.emit(todo_ids)
+
+    def _remove_rows_except(self, kept_ids: set) -> set:
+        removed_ids: set = set()
+        row = len(self._todos) - 1
+        while row >= 0:
+            if self._todos[row].get("id") in kept_ids:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._todos[row].get("id") not in kept_ids:
+                removed_ids.add(self._todos[row].get("id"))
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self._todos[row + 1 : last + 1]
+            self.endRemoveRows()
+        return removed_ids
+
+    def _find_row(self, todo_id: object, start: int) -> Optional[int]:
+        for row in range(start, len(self._todos)):
+            if self._todos[row].get("id") == todo_id:
+                return row
+        return None
+
+    def _reset_tail(self, start: int, todos: list[dict]) -> int:
+        existing = {todo.get("id"): todo for todo in self._todos[start:]}
+        tail: list[dict] = []
+        changed = 0
+        for todo in todos:
+            kept = existing.get(todo.get("id"))
+            if kept is None or kept != todo:
+                kept = todo.copy()
+                changed += 1
+            tail.append(kept)
+        self.set_todos(self._todos[:start] + tail)
+        return changed
+
+
+@dataclass(frozen=True)
+class CardPoolStats:
+    """卡片池的复用统计：命中、新建、淘汰次数与当前空闲卡片数。"""
+
+    hits: int
+    misses: int
+    evictions: int
+    idle: int
+
+
+class TodoCardPool:
+    """有上限的空闲卡片池，归还的卡片脱离行后保留，下次绑定到其他任务复用。
+
+    取用时优先复用最近归还的卡片；空闲数超过上限时淘汰最久未用的一张。
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[dict, QWidget], TodoItemWidget],
+        capacity: int = _CARD_POOL_CAPACITY,
+    ):
+        if capacity < 1:
+            raise ValueError("卡片池容量至少为 1")
+        self._factory = factory
+        self._capacity = capacity
+        self._idle: deque[TodoItemWidget] = deque()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def acquire(
+        self,
+        todo: dict,
+        parent: QWidget,
+        palette: ThemeColors,
+    ) -> TodoItemWidget:
+        """取出一张绑定到 ``todo`` 与 ``palette`` 的卡片，池空时才新建。"""
+
+        if not self._idle:
+            self._misses += 1
+            return self._factory(todo, parent)
+        self._hits += 1
+        card = self._idle.pop()
+        if card.parentWidget() is not parent:
+            card.setParent(parent)
+        card.bind(todo, palette)
+        return card
+
+    def release(self, card: TodoItemWidget) -> None:
+        """收回不再使用的卡片；隐藏其悬停浮层，超出上限时销毁最旧的空闲卡片。"""
+
+        card.hide()
+        card.hide_hover_overlays()
+        self._idle.append(card)
+        while len(self._idle) > self._capacity:
+            self._idle.popleft().deleteLater()
+            self._evictions += 1
+
+    def clear(self) -> None:
+        while self._idle:
+            self._idle.popleft().deleteLater()
+
+    def stats(self) -> CardPoolStats:
+        return CardPoolStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            idle=len(self._idle),
+        )
+
+
+@dataclass(frozen=True)
+class _PaintedRow:
+    """一行最近一次渲染的位图，及决定其内容的计时呈现、尺寸、像素比与任务副本。"""
+
+    signature: tuple
+    todo: dict
+    pixmap: QPixmap
+
+
+class TodoCardDelegate(QStyledItemDelegate):
+    """用一张隐藏的模板卡片逐行绘制任务，悬停行则从卡片池取出真实卡片承接交互。
+
+    模板卡片与真实卡片是同一个 ``TodoItemWidget``，因此样式表、省略规则与
+    ``calculate_task_card_layout`` 的几何结果完全一致。渲染结果按任务 ID 缓存，
+    任务内容、计时呈现、行尺寸与像素比都未变时重绘只贴位图；缓存按最近绘制顺序
+    只保留约两屏的行。
+    """
+
+    request_edit = Signal(object)
+    request_delete = Signal(object)
+    request_toggle_complete = Signal(object)
+
+    def __init__(self, palette: ThemeColors, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._palette = palette
+        self._stamp: Optional[TodoItemWidget] = None
+        self._viewport_width = 0
+        self._list_spacing = 0
+        self._height_cache: dict[tuple, int] = {}
+        # 与行高缓存同键的卡片测量值；viewport 变化时据此批量重算行高，无需重新绑定模板卡片。
+        self._layout_inputs: dict[tuple, TaskCardLayoutInput] = {}
+        # 按计时字体分组的测量原型：尚未测量的行先据此估算行高，绘制或空闲时再精确测量。
+        self._estimate_prototypes: dict[tuple, TaskCardLayoutInput] = {}
+        self._estimated_rows: dict[tuple, dict] = {}
+        self._idle_measure_timer = QTimer(self)
+        self._idle_measure_timer.setSingleShot(True)
+        self._idle_measure_timer.setInterval(0)
+        self._idle_measure_timer.timeout.connect(self._measure_estimated_rows)
+        # 按任务 ID 记录最近一次绘制的计时呈现，行移动后仍然有效。
+        self._painted_timers: dict[object, TimerPresentation] = {}
+        # 已绘制行的计时文本下一次变化时刻；每秒刷新只重算到期的行。
+        self._timer_deadlines: DeadlineQueue[object] = DeadlineQueue()
+        self._last_timer_refresh_ms: Optional[int] = None
+        self._painted_rows: OrderedDict[object, _PaintedRow] = OrderedDict()
+        self._card_pool = TodoCardPool(self._new_card)
+
+    @property
+    def card_pool(self) -> TodoCardPool:
+        return self._card_pool
+
+    def set_viewport_geometry(self, viewport_width: int, list_spacing: int) -> bool:
+        """记录卡片所在 viewport 的宽度与列表间距；变化时返回 True。"""
+
+        if (viewport_width, list_spacing) == (self._viewport_width, self._list_spacing):
+            return False
+        self._viewport_width = viewport_width
+        self._list_spacing = list_spacing
+        layouts = calculate_task_card_layouts(
+            self._layout_inputs.values(),
+            viewport_width,
+            list_spacing,
+        )
+        self._height_cache = {
+            key: layout.card_height
+            for key, layout in zip(self._layout_inputs, layouts)
+        }
+        return True
+
+    def apply_palette(self, palette: ThemeColors) -> None:
+        self._palette = palette
+        self._height_cache.clear()
+        self._layout_inputs.clear()
+        self._estimate_prototypes.clear()
+        self._estimated_rows.clear()
+        self._painted_timers.clear()
+        self._timer_deadlines.clear()
+        self._painted_rows.clear()
+        if self._stamp is not None:
+            self._stamp.apply_palette(palette)
+
+    def forget_rows(self, row_count: int) -> None:
+        """模型重置后丢弃已绘制的计时记录与行位图；行高缓存只在明显过大时清空。"""
+
+        self._painted_timers.clear()
+        self._timer_deadlines.clear()
+        self._painted_rows.clear()
+        if len(self._height_cache) > row_count + _HEIGHT_CACHE_SLACK:
+            self._height_cache.clear()
+            self._layout_inputs.clear()
+            self._estimated_rows.clear()
+
+    def discard_rows(self, todo_ids) -> None:
+        """丢弃这些任务缓存的行位图，由模型增量对齐删除或替换行时调用。"""
+
+        for todo_id in todo_ids:
+            self._painted_rows.pop(todo_id, None)
+
+    def _bind_stamp(self, todo: dict, current_time_utc: datetime) -> TaskCardLayout:
+        if self._stamp is None:
+            self._stamp = TodoItemWidget(todo, self.parent(), palette=self._palette)
+            self._stamp.hide()
+            # 模板卡片从不显示；先完成样式表润色，首行测量才与真实卡片使用同一字体。
+            self._stamp.ensurePolished()
+        else:
+            self._stamp.bind(todo, current_time_utc=current_time_utc)
+        card_width = calculate_card_width(self._viewport_width, self._list_spacing)
+        if card_width > 0 and self._stamp.width() != card_width:
+            self._stamp.resize(card_width, self._stamp.height())
+        return self._stamp.refresh_layout(
+            viewport_width=self._viewport_width,
+            list_spacing=self._list_spacing,
+        )
+
+    @staticmethod
+    def _height_key(todo: dict, presentation: TimerPresentation) -> tuple:
+        return (
+            todo.get("text", "无内容"),
+            todo.get("priority", "中"),
+            presentation.point_size,
+            presentation.bold,
+            presentation.italic,
+        )
+
+    def _measure_row(self, key: tuple, todo: dict, current_time_utc: datetime) -> int:
+        """绑定模板卡片精确测量一行，并记录测量值供批量重排与估算复用。"""
+
+        height = self._bind_stamp(todo, current_time_utc).card_height
+        measurements = self._stamp.layout_measurements()
+        self._height_cache[key] = height
+        self._layout_inputs[key] = measurements
+        self._estimate_prototypes[key[2:]] = measurements
+        self._estimated_rows.pop(key, None)
+        return height
+
+    def _estimated_height(self, todo: dict, presentation: TimerPresentation) -> Optional[int]:
+        """用同一计时字体的已测量卡片估算行高；行高只随逻辑行数变化。"""
+
+        prototype = self._estimate_prototypes.get(
+            (presentation.point_size, presentation.bold, presentation.italic)
+        )
+        if prototype is None:
+            return None
+        text = todo.get("text", "无内容")
+        line_count = text.count("\n") + text.count("\r") - text.count("\r\n") + 1
+        return calculate_task_card_layout(
+            replace(
+                prototype,
+                viewport_width=self._viewport_width,
+                list_spacing=self._list_spacing,
+                logical_line_count=line_count,
+            )
+        ).card_height
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:  # noqa: N802
+        todo = index.model().todo_at(index.row())
+        now_utc = datetime.now(timezone.utc)
+        presentation = timer_presentation(todo, now_utc, self._palette)
+        key = self._height_key(todo, presentation)
+        height = self._height_cache.get(key)
+        if height is None:
+            height = self._estimated_height(todo, presentation)
+            if height is None:
+                height = self._measure_row(key, todo, now_utc)
+            else:
+                self._height_cache[key] = height
+                self._estimated_rows[key] = todo
+                self._idle_measure_timer.start()
+        return QSize(0, height)
+
+    def _measure_estimated_rows(self) -> None:
+        """空闲时分批把估算行高换成精确值，有差异时请求视图重新排布。"""
+
+        now_utc = datetime.now(timezone.utc)
+        changed = False
+        for key in list(self._estimated_rows)[:_IDLE_MEASURE_BATCH]:
+            estimate = self._height_cache.get(key)
+            changed |= self._measure_row(key, self._estimated_rows[key], now_utc) != estimate
+        if self._estimated_rows:
+            self._idle_measure_timer.start()
+        view = self.parent()
+        if changed and isinstance(view, TodoListView):
+            view.scheduleDelayedItemsLayout()
+
+    def paint(self, painter, option, index: QModelIndex) -> None:
+        view = self.parent()
+        if isinstance(view, QAbstractItemView) and view.indexWidget(index) is not None:
+            return
+
+        model = index.model()
+        if isinstance(model, TodoListModel):
+            # 滚入视口的过期行在绘制前同步原始任务。
+            model.refresh_rows((index.row(),))
+        todo = model.todo_at(index.row())
+        now_utc = datetime.now(timezone.utc)
+        presentation = timer_presentation(todo, now_utc, self._palette)
+        key = self._height_key(todo, presentation)
+        if key in self._estimated_rows:
+            # 可见行优先精确测量，估算有偏差时立即重新排布。
+            estimate = self._height_cache.get(key)
+            height = self._measure_row(key, todo, now_utc)
+            if height != estimate and isinstance(view, TodoListView):
+                view.scheduleDelayedItemsLayout()
+        todo_id = todo.get("id")
+        self._remember_painted_timer(todo_id, presentation)
+        ratio = painter.device().devicePixelRatioF()
+        signature = (presentation, option.rect.size().toTuple(), ratio)
+        painted = self._painted_rows.get(todo_id)
+        # 行副本可能被原地同步，因此除签名外还要比较任务内容。
+        if painted is None or painted.signature != signature or painted.todo != todo:
+            pixmap = self._render_row(todo, now_utc, option, ratio)
+            painted = _PaintedRow(signature, dict(todo), pixmap)
+            self._painted_rows[todo_id] = painted
+            self._trim_painted_rows(view)
+        self._painted_rows.move_to_end(todo_id)
+        painter.drawPixmap(option.rect.topLeft(), painted.pixmap)
+
+    def _trim_painted_rows(self, view) -> None:
+        """按最近绘制顺序淘汰行位图，只保留约两屏；仅在渲染新位图后调用。"""
+
+        visible = len(view.visible_rows()) if isinstance(view, TodoListView) else 0
+        capacity = max(_PAINTED_ROWS_MIN_CAPACITY, 2 * visible)
+        while len(self._painted_rows) > capacity:
+            self._painted_rows.popitem(last=False)
+
+    def _render_row(self, todo: dict, now_utc: datetime, option, ratio: float) -> QPixmap:
+        """绑定模板卡片，渲染到与设备像素比一致的透明位图，圆角外保持列表背景。"""
+
+        self._bind_stamp(todo, now_utc)
+        stamp = self._stamp
+        stamp.resize(option.rect.size())
+        stamp.layout().activate()
+        pixmap = QPixmap(option.rect.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        stamp.render(pixmap, QPoint(), QRegion(), QWidget.RenderFlag.DrawChildren)
+        return pixmap
+
+    def _remember_painted_timer(self, todo_id: object, presentation: TimerPresentation) -> None:
+        self._painted_timers[todo_id] = presentation
+        next_change = presentation.next_change
+        self._timer_deadlines.schedule(
+            todo_id,
+            to_epoch_ms(next_change, round_up=True) if next_change is not None else None,
+            todo_id,
+        )
+
+    def refresh_timers(self, view: "TodoListView", current_time_utc: datetime) -> None:
+        """只重算计时文本到了变化时刻的可见行，呈现不同才重绘。
+
+        系统时间回拨时已记录的变化时刻失效，本次重算全部可见行。
+        """
+
+        now_ms = to_epoch_ms(current_time_utc)
+        clock_moved_back = (
+            self._last_timer_refresh_ms is not None and now_ms < self._last_timer_refresh_ms
+        )
+        self._last_timer_refresh_ms = now_ms
+        if clock_moved_back:
+            self._timer_deadlines.clear()
+            due_ids = None
+        else:
+            due_ids = set(self._timer_deadlines.pop_due(now_ms))
+            if not due_ids:
+                return
+
+        # 不在视口内的到期行不再排队，滚入视口重新绘制时会重新登记。
+        model = view.model()
+        for row in view.visible_rows():
+            todo = model.todo_at(row)
+            todo_id = todo.get("id")
+            if due_ids is not None and todo_id not in due_ids:
+                continue
+            previous = self._painted_timers.get(todo_id)
+            if previous is None:
+                continue
+            current = timer_presentation(todo, current_time_utc, self._palette)
+            if current != previous:
+                view.update(model.index(row, 0))
+            else:
+                self._remember_painted_timer(todo_id, current)
+
+    def _new_card(self, todo: dict, parent: QWidget) -> TodoItemWidget:
+        card = TodoItemWidget(todo, parent, palette=self._palette)
+        # 信号只在新建时连接一次；卡片回到池中后处于隐藏状态，不会再发出请求。
+        card.request_edit.connect(self.request_edit)
+        card.request_delete.connect(self.request_delete)
+        card.request_toggle_complete.connect(self.request_toggle_complete)
+        return card
+
+    def createEditor(self, parent: QWidget, option, index: QModelIndex) -> QWidget:  # noqa: N802
+        return self._card_pool.acquire(
+            index.model().todo_at(index.row()),
+            parent,
+            self._palette,
+        )
+
+    def destroyEditor(self, editor: QWidget, index: QModelIndex) -> None:  # noqa: N802
+        # 悬停移到别的行或模型重置时，卡片回到池中而不是销毁。
+        if isinstance(editor, TodoItemWidget):
+            self._card_pool.release(editor)
+        else:
+            super().destroyEditor(editor, index)
+
+    def setEditorData(self, editor: QWidget, index: QModelIndex) -> None:  # noqa: N802
+        # 卡片直接引用模型中的任务字典，这里只在行内容被替换时重新绑定。
+        todo = index.model().todo_at(index.row())
+        if isinstance(editor, TodoItemWidget) and editor.todo_item is not todo:
+            editor.bind(todo, self._palette)
+
+    def setModelData(self, editor: QWidget, model, index: QModelIndex) -> None:  # noqa: N802
+        # 修改都经由主窗口的编辑/删除/完成请求落盘，卡片本身不回写模型。
+        return
+
+    def updateEditorGeometry(self, editor: QWidget, option, index: QModelIndex) -> None:  # noqa: N802
+        if isinstance(editor, TodoItemWidget):
+            editor.refresh_layout(
+                viewport_width=self._viewport_width,
+                list_spacing=self._list_spacing,
+            )
+        editor.setGeometry(option.rect)
+
+
+class TodoListView(QListView):
+    """任务卡片列表；鼠标所在行按需打开真实卡片部件，其余行由委托绘制。"""
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._hovered_index = QPersistentModelIndex()
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(_LAYOUT_BATCH_SIZE)
+        self.viewport().setMouseTracking(True)
+
+    def hovered_row(self) -> int:
+        return self._hovered_index.row() if self._hovered_index.isValid() else -1
+
+    def card_widget(self, row: int) -> Optional[TodoItemWidget]:
+        """返回该行当前的真实卡片部件；未悬停的行只被绘制，返回 None。"""
+
+        model = self.model()
+        if model is None or not 0 <= row < model.rowCount():
+            return None
+        widget = self.indexWidget(model.index(row, 0))
+        return widget if isinstance(widget, TodoItemWidget) else None
+
+    def set_hovered_row(self, row: int) -> None:
+        """把真实卡片移到指定行；传入 -1 时关闭当前卡片。"""
+
+        model = self.model()
+        if model is None or not 0 <= row < model.rowCount():
+            row = -1
+        if row == self.hovered_row():
+            return
+        if self._hovered_index.isValid():
+            self.closePersistentEditor(QModelIndex(self._hovered_index))
+        self._hovered_index = QPersistentModelIndex()
+        if row >= 0:
+            index = model.index(row, 0)
+            self._hovered_index = QPersistentModelIndex(index)
+            self.openPersistentEditor(index)
+
+    def hovered_card(self) -> Optional[TodoItemWidget]:
+        return self.card_widget(self.hovered_row())
+
+    def visible_rows(self, margin: int = 0) -> range:
+        """返回与 viewport 相交的行号范围，两端各扩展 ``margin`` 行；列表不可见时为空。"""
+
+        model = self.model()
+        if model is None or not self.isVisible() or model.rowCount() == 0:
+            return range(0)
+        viewport_rect = self.viewport().rect()
+        probe_x = viewport_rect.center().x()
+        first = self.indexAt(QPoint(probe_x, 0))
+        if not first.isValid():
+            # 顶部恰好落在卡片间隙时，向下越过一个间隙再找。
+            first = self.indexAt(QPoint(probe_x, self.spacing() * 2 + 1))
+        start = first.row() if first.isValid() else 0
+        stop = start
+        row_count = model.rowCount()
+        while stop < row_count:
+            if self.visualRect(model.index(stop, 0)).top() > viewport_rect.bottom():
+                break
+            stop += 1
+        return range(max(start - margin, 0), min(stop + margin, row_count))
+
+    def _hover_row_under_cursor(self) -> None:
+        # 光标不在列表上时保持现状；离开 viewport 已经由 Leave 事件关闭卡片。
+        viewport = self.viewport()
+        if not viewport.underMouse():
+            return
+        index = self.indexAt(viewport.mapFromGlobal(QCursor.pos()))
+        self.set_hovered_row(index.row() if index.isValid() else -1)
+
+    def mouseMoveEvent(self, event) -> None:  # noqa: N802
+        index = self.indexAt(event.position().toPoint())
+        self.set_hovered_row(index.row() if index.isValid() else -1)
+        super().mouseMoveEvent(event)
+
+    def viewportEvent(self, event: QEvent) -> bool:  # noqa: N802
+        if event.type() == QEvent.Type.Leave:
+            self.set_hovered_row(-1)
+        return super().viewportEvent(event)
+
+    def reset(self) -> None:
+        # 模型重置会销毁全部编辑器；之后按光标位置重新打开悬停卡片。
+        self._hovered_index = QPersistentModelIndex()
+        delegate = self.itemDelegate()
+        if isinstance(delegate, TodoCardDelegate):
+            model = self.model()
+            delegate.forget_rows(model.rowCount() if model is not None else 0)
+        super().reset()
+        QTimer.singleShot(0, self, self._hover_row_under_cursor)
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:  # noqa: N802
+        super().scrollContentsBy(dx, dy)
+        if dy:
+            QTimer.singleShot(0, self, self._hover_row_under_cursor)
+
+
+__all__ = [
+    "CardPoolStats",
+    "TodoCardDelegate",
+    "TodoCardPool",
+    "TodoListModel",
+    "TodoListView",
+]
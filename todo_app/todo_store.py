@@ -0,0 +1,193 @@
+"""持有当前待办列表，并随每次改动增量维护按 ID 查找表与二级索引。"""
+from __future__ import annotations
+
+from datetime import date
+from itertools import count
+from typing import AbstractSet, Any, Collection, Hashable, Mapping, Optional
+
+from .scheduling import timestamp_datetime
+
+_IndexKey = tuple[bool, Any, Optional[date]]
+
+
+def _due_day(todo: Mapping[str, Any]) -> Optional[date]:
+    # 与“今天到期”筛选一致，不带时区的截止时间按本地时间解读。
+    due = timestamp_datetime(todo, "dueDate", naive_local=True)
+    return due.astimezone().date() if due is not None else None
+
+
+def _index_key(todo: Mapping[str, Any]) -> _IndexKey:
+    priority = todo.get("priority")
+    if not isinstance(priority, Hashable):
+        priority = None
+    return bool(todo.get("completed", False)), priority, _due_day(todo)
+
+
+class TodoStore:
+    """主窗口唯一的待办列表持有者。
+
+    ``todos`` 仍是可直接交给保存流程的原始列表，顺序即添加顺序；ID 查找表、
+    运行中的最大 ID 以及按完成状态、优先级、本地截止日期的二级索引都在
+    ``add``/``update``/``remove`` 中增量维护。绕过这些方法原地改写了列表或
+    已索引字段时，需调用 ``rebuild`` 重新建立索引。重复 ID 的查找以列表中首个为准；
+    缺少 ID 或 ID 重复的任务不进入索引，但 ``records()`` 仍会返回它们。
+    """
+
+    def __init__(self, todos: Optional[list[dict[str, Any]]] = None) -> None:
+        self._todos: list[dict[str, Any]] = []
+        self._by_id: dict[Hashable, dict[str, Any]] = {}
+        self._order: dict[Hashable, int] = {}
+        self._sequence = count()
+        self._index_keys: dict[Hashable, _IndexKey] = {}
+        self._by_completed: dict[bool, set[Hashable]] = {True: set(), False: set()}
+        self._by_priority: dict[Any, set[Hashable]] = {}
+        self._by_due_day: dict[Optional[date], set[Hashable]] = {}
+        self._max_id = 0
+        # 列表中未进入查找表的字典任务数（缺少 ID 或 ID 重复）。
+        self._unindexed = 0
+        self.replace(todos if todos is not None else [])
+
+    @property
+    def todos(self) -> list[dict[str, Any]]:
+        """返回原始列表，供保存与整体遍历使用；增删改应经由本类的方法。"""
+
+        return self._todos
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, todo_id: object) -> bool:
+        return todo_id in self._by_id
+
+    def get(self, todo_id: object) -> Optional[dict[str, Any]]:
+        return self._by_id.get(todo_id)
+
+    def replace(self, todos: list[dict[str, Any]]) -> None:
+        """整体换成 ``todos``（沿用同一列表对象），非列表输入视为空列表。"""
+
+        self._todos = todos if isinstance(todos, list) else []
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """按当前列表内容重建全部索引；最大 ID 只增不减。"""
+
+        self._by_id.clear()
+        self._order.clear()
+        self._index_keys.clear()
+        for ids in self._by_completed.values():
+            ids.clear()
+        self._by_priority.clear()
+        self._by_due_day.clear()
+        self._unindexed = 0
+        for todo in self._todos:
+            self._index(todo)
+
+    def add(self, todo: dict[str, Any]) -> None:
+        self._todos.append(todo)
+        self._index(todo)
+
+    def update(self, todo_id: object, fields: Mapping[str, Any]) -> Optional[dict[str, Any]]:
+        """原地合并字段并刷新该任务的二级索引；找不到时返回 None。"""
+
+        todo = self._by_id.get(todo_id)
+        if todo is None:
+            return None
+        todo.update(fields)
+        self._unindex_secondary(todo_id)
+        self._index_secondary(todo_id, todo)
+        return todo
+
+    def remove(self, todo_id: object) -> Optional[dict[str, Any]]:
+        """删除该 ID 的全部任务并返回首个；列表删除需要按位置重排，仍是线性的。"""
+
+        todo = self._by_id.pop(todo_id, None)
+        if todo is None:
+            return None
+        del self._order[todo_id]
+        self._unindex_secondary(todo_id)
+        self._todos[:] = [
+            item for item in self._todos if not isinstance(item, dict) or item.get("id") != todo_id
+        ]
+        if self._unindexed:
+            self._unindexed = sum(isinstance(item, dict) for item in self._todos) - len(self._by_id)
+        return todo
+
+    def allocate_id(self, minimum: int) -> int:
+        """分配不小于 ``minimum`` 且大于历史最大 ID 的新 ID，删除过的 ID 不会复用。"""
+
+        new_id = max(minimum, self._max_id + 1)
+        while new_id in self._by_id:
+            new_id += 1
+        return new_id
+
+    # 以下三个查询直接返回索引内部集合以免复制，调用方只读且不应跨越下一次改动持有。
+    def ids_with_completed(self, completed: bool) -> AbstractSet[Hashable]:
+        return self._by_completed[bool(completed)]
+
+    def ids_with_priority(self, priority: object) -> AbstractSet[Hashable]:
+        return self._by_priority.get(priority, frozenset())
+
+    def ids_due_on(self, day: date) -> AbstractSet[Hashable]:
+        """返回截止时间落在本地日期 ``day`` 的任务 ID。"""
+
+        return self._by_due_day.get(day, frozenset())
+
+    def has_unindexed(self) -> bool:
+        """列表中存在缺少 ID 或 ID 重复的任务时返回 True，此时二级索引不能覆盖全部任务。"""
+
+        return self._unindexed > 0
+
+    def records(self, todo_ids: Optional[Collection[Hashable]] = None) -> list[dict[str, Any]]:
+        """按列表顺序返回指定 ID 的任务；省略时返回列表中的全部字典任务。
+
+        选中比例较高时顺序扫描查找表比按位置排序更快。
+        """
+
+        if todo_ids is None:
+            if self._unindexed:
+                return [todo for todo in self._todos if isinstance(todo, dict)]
+            return list(self._by_id.values())
+        if len(todo_ids) * 8 > len(self._by_id):
+            return [todo for todo_id, todo in self._by_id.items() if todo_id in todo_ids]
+        order = self._order
+        ordered = sorted(
+            (todo_id for todo_id in todo_ids if todo_id in order), key=order.__getitem__
+        )
+        return [self._by_id[todo_id] for todo_id in ordered]
+
+    def _index(self, todo: object) -> None:
+        if not isinstance(todo, dict):
+            return
+        todo_id = todo.get("id")
+        if "id" not in todo or not isinstance(todo_id, Hashable) or todo_id in self._by_id:
+            self._unindexed += 1
+            return
+        self._by_id[todo_id] = todo
+        self._order[todo_id] = next(self._sequence)
+        if isinstance(todo_id, int) and todo_id > self._max_id:
+            self._max_id = todo_id
+        self._index_secondary(todo_id, todo)
+
+    def _index_secondary(self, todo_id: Hashable, todo: Mapping[str, Any]) -> None:
+        key = _index_key(todo)
+        completed, priority, due_day = key
+        self._index_keys[todo_id] = key
+        self._by_completed[completed].add(todo_id)
+        self._by_priority.setdefault(priority, set()).add(todo_id)
+        self._by_due_day.setdefault(due_day, set()).add(todo_id)
+
+    def _unindex_secondary(self, todo_id: Hashable) -> None:
+        key = self._index_keys.pop(todo_id, None)
+        if key is None:
+            return
+        completed, priority, due_day = key
+        self._by_completed[completed].discard(todo_id)
+        for index, value in ((self._by_priority, priority), (self._by_due_day, due_day)):
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(todo_id)
+                if not ids:
+                    del index[value]
+
+
+__all__ = ["TodoStore"]
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import os
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Hashable, Iterable
 
 from PySide6.QtCore import QUrl, QSize, Qt
 from PySide6.QtGui import QColor, QFont, QIcon, QPainter, QPixmap
@@ -13,21 +15,113 @@ from PySide6.QtWidgets import QApplication
 
 from .constants import DEFAULT_ICON_SIZE
 from .paths import resource_path
-from .theme import get_current_palette
+from .theme import get_current_palette, get_theme_manager
+
+# 进程级图标缓存的条目上限；超出后淘汰最久未用的图标。
+_ICON_CACHE_CAPACITY = 64
 
 _warned_icon_paths: set[str] = set()
 _warned_sound_paths: set[str] = set()
 
 
+@dataclass(frozen=True)
+class IconCacheStats:
+    """图标缓存的命中、未命中、淘汰次数与当前条目数。"""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+_icon_cache: OrderedDict[Hashable, QIcon] = OrderedDict()
+_icon_cache_counters = {"hits": 0, "misses": 0, "evictions": 0}
+_icon_cache_listening = False
+
+
+def _device_pixel_ratio() -> float:
+    app_instance = QApplication.instance()
+    return app_instance.devicePixelRatio() if app_instance else 1.0
+
+
+def cached_icon(key: Hashable, build: Callable[[], QIcon]) -> QIcon:
+    """按 ``key`` 返回进程内共享的图标，未命中时调用 ``build`` 生成并缓存。
+
+    键应包含图标来源（路径或绘制种类）、尺寸、颜色与设备像素比；主题变化时缓存整体失效。
+    """
+
+    global _icon_cache_listening
+    if not _icon_cache_listening and QApplication.instance() is not None:
+        get_theme_manager().theme_changed.connect(clear_icon_cache)
+        _icon_cache_listening = True
+
+    icon = _icon_cache.get(key)
+    if icon is not None:
+        _icon_cache.move_to_end(key)
+        _icon_cache_counters["hits"] += 1
+        return icon
+
+    _icon_cache_counters["misses"] += 1
+    icon = build()
+    _icon_cache[key] = icon
+    while len(_icon_cache) > _ICON_CACHE_CAPACITY:
+        _icon_cache.popitem(last=False)
+        _icon_cache_counters["evictions"] += 1
+    return icon
+
+
+def clear_icon_cache(*_args: object) -> None:
+    """清空图标缓存；连接到主题变化信号时会收到配色参数，这里忽略。"""
+
+    _icon_cache.clear()
+
+
+def icon_cache_stats() -> IconCacheStats:
+    return IconCacheStats(
+        hits=_icon_cache_counters["hits"],
+        misses=_icon_cache_counters["misses"],
+        evictions=_icon_cache_counters["evictions"],
+        size=len(_icon_cache),
+    )
+
+
 def get_icon(icon_path: os.PathLike[str] | str, fallback_char: str = "●", size: QSize | None = None) -> QIcon:
-    """加载图标，若缺失则生成回退图标。"""
+    """加载图标，若缺失则生成回退图标；结果按路径、尺寸与设备像素比缓存。"""
     icon_size = size or DEFAULT_ICON_SIZE
+    device_pixel_ratio = _device_pixel_ratio()
+    key = (
+        "file",
+        str(icon_path),
+        fallback_char,
+        icon_size.width(),
+        icon_size.height(),
+        device_pixel_ratio,
+        # 回退图标使用当前主题的次要文字色。
+        get_current_palette().text_secondary,
+    )
+    return cached_icon(
+        key,
+        lambda: _load_icon(icon_path, fallback_char, icon_size, device_pixel_ratio),
+    )
+
+
+def _load_icon(
+    icon_path: os.PathLike[str] | str,
+    fallback_char: str,
+    icon_size: QSize,
+    device_pixel_ratio: float,
+) -> QIcon:
     resolved_path: Path | None = None
     if icon_path:
         resolved_path = resource_path(icon_path)
 
     if resolved_path and resolved_path.exists():
-        return QIcon(str(resolved_path))
+        icon = QIcon(str(resolved_path))
+        # 按请求尺寸预先光栅化一次；其他尺寸仍由矢量源按需渲染。
+        pixmap = icon.pixmap(icon_size, device_pixel_ratio)
+        if not pixmap.isNull():
+            icon.addPixmap(pixmap)
+        return icon
 
     pixmap = QPixmap(icon_size)
     pixmap.fill(Qt.GlobalColor.transparent)
@@ -80,7 +174,11 @@ def any_true(values: Iterable[bool]) -> bool:
 
 
 __all__ = [
+    "IconCacheStats",
+    "cached_icon",
+    "clear_icon_cache",
     "get_icon",
+    "icon_cache_stats",
     "play_sound_effect",
     "any_true",
 ]
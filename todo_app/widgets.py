@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -15,7 +16,9 @@ from PySide6.QtGui import (
     QPen,
     QPixmap,
     QPolygonF,
+    QStaticText,
     QTextOption,
+    QTransform,
 )
 from PySide6.QtWidgets import (
     QFrame,
@@ -66,15 +69,24 @@ from .layout import (
     calculate_task_details_placement,
     calculate_task_details_width,
 )
-from .utils import get_icon
+from .utils import cached_icon, get_icon
 from .theme import ThemeColors, get_theme_manager
+from .scheduling import timestamp_datetime
 
 
 _TASK_LINE_BREAKS = re.compile(r"\r\n|\r|\n")
+_ACTION_ICON_SIZE = QSize(18, 18)
+_COMPLETE_ICON_SIZE = QSize(20, 20)
+_ONE_SECOND = timedelta(seconds=1)
+_ONE_MINUTE = timedelta(minutes=1)
+_ONE_HOUR = timedelta(hours=1)
+# 省略文本与字宽测量的共享缓存上限；拖动窗口时同一批行文本会在多个宽度下反复测量。
+_TEXT_METRICS_CACHE_CAPACITY = 4096
+_text_metrics_cache: OrderedDict[tuple, object] = OrderedDict()
 
 
 @dataclass(frozen=True)
-class _TimerPresentation:
+class TimerPresentation:
     """一次计时刷新最终需要呈现的可比较状态。"""
 
     text: str
@@ -83,12 +95,150 @@ class _TimerPresentation:
     bold: bool = False
     italic: bool = False
     strikeout: bool = False
+    # 文本或样式下一次随时间变化的时刻；None 表示只有任务数据变化才会改变。
+    next_change: Optional[datetime] = field(default=None, compare=False)
+
+
+def timer_presentation(
+    todo_item: dict,
+    current_time_utc: datetime,
+    palette: ThemeColors,
+) -> TimerPresentation:
+    """计算任务计时文本与样式，不触发 Qt 重绘；卡片部件与列表委托共用。"""
+
+    is_completed = todo_item.get("completed", False)
+    if is_completed:
+        return TimerPresentation(
+            text="已完成",
+            color=palette.text_completed,
+            italic=True,
+            strikeout=True,
+        )
 
+    snooze_until_str = todo_item.get("snoozeUntil")
+    if snooze_until_str:
+        snooze_until_dt = timestamp_datetime(todo_item, "snoozeUntil")
+        if snooze_until_dt is None:
+            print(
+                f"任务 '{todo_item.get('text', '')}' 的推迟日期格式错误: "
+                f"{snooze_until_str}"
+            )
+            todo_item["snoozeUntil"] = None
+        elif snooze_until_dt > current_time_utc:
+            snooze_left = snooze_until_dt - current_time_utc
+            return TimerPresentation(
+                text="推迟: " + _format_timedelta(snooze_left),
+                color=palette.snooze_badge,
+                next_change=current_time_utc + _time_until_format_change(snooze_left),
+            )
 
-def _build_action_icon(kind: str, color: str) -> QIcon:
+    due_date_str = todo_item.get("dueDate")
+    if not due_date_str:
+        return TimerPresentation(
+            text="无截止日期",
+            color=palette.text_secondary,
+        )
+
+    due_date_dt = timestamp_datetime(todo_item, "dueDate")
+    if due_date_dt is None:
+        return TimerPresentation(
+            text="日期格式错误!",
+            color=palette.due_critical,
+            bold=True,
+        )
+
+    diff = due_date_dt - current_time_utc
+    time_left_str = _format_timedelta(diff)
+    # 剩余不足一天时的警示色切换恰好落在整点，与文本变化时刻一致。
+    next_change = current_time_utc + _time_until_format_change(diff)
+    if diff.total_seconds() <= 0:
+        return TimerPresentation(
+            text=f"已到期 ({time_left_str.replace('-', '')})",
+            color=palette.due_critical,
+            point_size=10,
+            bold=True,
+            next_change=next_change,
+        )
+
+    color = (
+        palette.due_warning
+        if diff.total_seconds() < 86400
+        else palette.timer_positive
+    )
+    return TimerPresentation(
+        text=f"剩余: {time_left_str}",
+        color=color,
+        bold=True,
+        next_change=next_change,
+    )
+
+
+def _format_timedelta(diff: timedelta) -> str:
+    is_past = diff.total_seconds() < 0
+    effective_diff = abs(diff)
+    days = effective_diff.days
+    secs_in_day = effective_diff.seconds
+    hours = secs_in_day // 3600
+    minutes = (secs_in_day % 3600) // 60
+    seconds = secs_in_day % 60
+    parts = []
+    if days > 0:
+        parts.append(f"{days}天")
+    if hours > 0:
+        parts.append(f"{hours}时")
+    if minutes > 0 and days == 0:
+        parts.append(f"{minutes}分")
+    if not parts and effective_diff.total_seconds() > 0:
+        parts.append(f"{seconds}秒")
+
+    if not parts:
+        return "刚刚"
+
+    formatted_str = " ".join(parts[:2])
+    return f"-{formatted_str}" if is_past else formatted_str
+
+
+def _time_until_format_change(diff: timedelta) -> timedelta:
+    """返回 ``_format_timedelta(diff)`` 随时间推移下一次改变前还需经过的时长。
+
+    一天以上只显示天与时，按整点变化；一分钟以上按整分变化；其余按整秒变化。
+    """
+
+    effective_diff = abs(diff)
+    if effective_diff.days > 0:
+        step = _ONE_HOUR
+    elif effective_diff >= _ONE_MINUTE:
+        step = _ONE_MINUTE
+    else:
+        step = _ONE_SECOND
+    if diff > timedelta(0):
+        # 剩余时长递减，跌破当前步长的整数倍时变化。
+        return diff % step
+    # 已过时长递增，达到下一个整数倍时变化。
+    return step - effective_diff % step
+
+
+def _build_action_icon(kind: str, color: str, device_pixel_ratio: float = 1.0) -> QIcon:
+    """返回共享缓存中的操作图标，同一种类、颜色与像素比只绘制一次。"""
+
+    return cached_icon(
+        (
+            "action",
+            kind,
+            _ACTION_ICON_SIZE.width(),
+            _ACTION_ICON_SIZE.height(),
+            color,
+            device_pixel_ratio,
+        ),
+        lambda: _paint_action_icon(kind, color, device_pixel_ratio),
+    )
+
+
+def _paint_action_icon(kind: str, color: str, device_pixel_ratio: float) -> QIcon:
     """绘制不依赖系统字体或外部资源的轻量操作图标。"""
 
-    pixmap = QPixmap(QSize(18, 18))
+    pixmap = QPixmap(_ACTION_ICON_SIZE * device_pixel_ratio)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
     pixmap.fill(Qt.GlobalColor.transparent)
     painter = QPainter(pixmap)
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -130,6 +280,46 @@ def _build_action_icon(kind: str, color: str) -> QIcon:
     return QIcon(pixmap)
 
 
+def _text_metrics_key(widget: QWidget) -> tuple:
+    """字体与逻辑 DPI 共同决定测量结果，作为缓存键的字体部分。"""
+
+    return (widget.font().key(), widget.logicalDpiX())
+
+
+def _remember_text_metric(key: tuple, value: object) -> None:
+    _text_metrics_cache[key] = value
+    if len(_text_metrics_cache) > _TEXT_METRICS_CACHE_CAPACITY:
+        _text_metrics_cache.popitem(last=False)
+
+
+def _cached_elided_text(
+    widget: QWidget,
+    font_key: tuple,
+    text: str,
+    width: int,
+    mode: Qt.TextElideMode = Qt.TextElideMode.ElideRight,
+) -> str:
+    key = ("elided", font_key, text, width, mode)
+    elided = _text_metrics_cache.get(key)
+    if elided is None:
+        elided = widget.fontMetrics().elidedText(text, mode, width)
+        _remember_text_metric(key, elided)
+    else:
+        _text_metrics_cache.move_to_end(key)
+    return elided
+
+
+def _cached_horizontal_advance(widget: QWidget, font_key: tuple, text: str) -> int:
+    key = ("advance", font_key, text)
+    advance = _text_metrics_cache.get(key)
+    if advance is None:
+        advance = widget.fontMetrics().horizontalAdvance(text)
+        _remember_text_metric(key, advance)
+    else:
+        _text_metrics_cache.move_to_end(key)
+    return advance
+
+
 class _ElidedLabel(QLabel):
     """按实际宽度右侧省略，同时保留完整文本用于布局与提示。"""
 
@@ -166,9 +356,10 @@ class _ElidedLabel(QLabel):
     def preserved_prefix_minimum_width(self) -> int:
         """测量保留状态前缀与省略号所需宽度。"""
 
+        font_key = _text_metrics_key(self)
         return max(
             (
-                self.fontMetrics().horizontalAdvance(prefix + "…")
+                _cached_horizontal_advance(self, font_key, prefix + "…")
                 for prefix in self._preserved_prefixes
             ),
             default=0,
@@ -180,33 +371,37 @@ class _ElidedLabel(QLabel):
             available_width = self.contentsRect().width()
         displayed_text = self._full_text
         if available_width > 0:
-            displayed_text = self.fontMetrics().elidedText(
+            font_key = _text_metrics_key(self)
+            displayed_text = _cached_elided_text(
+                self,
+                font_key,
                 self._full_text,
-                Qt.TextElideMode.ElideRight,
                 available_width,
             )
             if displayed_text != self._full_text:
                 for prefix in self._preserved_prefixes:
                     if not self._full_text.startswith(prefix):
                         continue
-                    prefix_width = self.fontMetrics().horizontalAdvance(prefix)
+                    prefix_width = _cached_horizontal_advance(self, font_key, prefix)
                     suffix = self._full_text[len(prefix) :]
-                    suffix_text = self.fontMetrics().elidedText(
+                    suffix_text = _cached_elided_text(
+                        self,
+                        font_key,
                         suffix,
-                        Qt.TextElideMode.ElideRight,
                         max(available_width - prefix_width, 0),
                     )
                     if (
                         suffix
                         and not suffix_text.endswith("…")
-                        and self.fontMetrics().horizontalAdvance("…")
+                        and _cached_horizontal_advance(self, font_key, "…")
                         <= available_width - prefix_width
                     ):
                         suffix_text = "…"
                     candidate = prefix + suffix_text
                     if (
                         suffix_text
-                        and self.fontMetrics().horizontalAdvance(candidate) <= available_width
+                        and _cached_horizontal_advance(self, font_key, candidate)
+                        <= available_width
                     ):
                         displayed_text = candidate
                     break
@@ -222,7 +417,7 @@ class _ElidedLabel(QLabel):
 
         margins = self.contentsMargins()
         full_text_width = (
-            self.fontMetrics().horizontalAdvance(self._full_text)
+            _cached_horizontal_advance(self, _text_metrics_key(self), self._full_text)
             + margins.left()
             + margins.right()
             + (self.margin() * 2)
@@ -248,14 +443,25 @@ class _PerLineElidedTaskLabel(QLabel):
 
     def __init__(self, text: str = "", parent: Optional[QWidget] = None):
         super().__init__(text, parent)
+        self._logical_lines = _TASK_LINE_BREAKS.split(text)
+        # 逐行预排版的静态文本，只在正文、字体或可用宽度变化后重建。
+        self._static_lines: list[QStaticText] = []
+        self._static_lines_key: Optional[tuple] = None
         self._is_elided = False
         self._is_hovered = False
         self._layout_available_width: Optional[int] = None
         self.setMouseTracking(True)
         self.refresh_elision()
 
+    def setText(self, text: str) -> None:  # noqa: N802
+        self._logical_lines = _TASK_LINE_BREAKS.split(text)
+        self._static_lines_key = None
+        super().setText(text)
+
     def logical_lines(self) -> list[str]:
-        return _TASK_LINE_BREAKS.split(self.text())
+        """返回按换行拆分的逻辑行；结果在 ``setText`` 之间复用，调用方不得修改。"""
+
+        return self._logical_lines
 
     def _available_width(self) -> int:
         if self._layout_available_width is not None:
@@ -274,13 +480,9 @@ class _PerLineElidedTaskLabel(QLabel):
         if available_width <= 0:
             return logical_lines
 
-        metrics = self.fontMetrics()
+        font_key = _text_metrics_key(self)
         return [
-            metrics.elidedText(
-                line,
-                Qt.TextElideMode.ElideRight,
-                available_width,
-            )
+            _cached_elided_text(self, font_key, line, available_width)
             for line in logical_lines
         ]
 
@@ -295,9 +497,12 @@ class _PerLineElidedTaskLabel(QLabel):
         return self._is_hovered
 
     def natural_width(self) -> int:
-        metrics = self.fontMetrics()
+        font_key = _text_metrics_key(self)
         widest_line = max(
-            (metrics.horizontalAdvance(line) for line in self.logical_lines()),
+            (
+                _cached_horizontal_advance(self, font_key, line)
+                for line in self.logical_lines()
+            ),
             default=0,
         )
         margins = self.contentsMargins()
@@ -350,22 +555,39 @@ class _PerLineElidedTaskLabel(QLabel):
         painter.setClipRect(content_rect)
         painter.setFont(self.font())
         painter.setPen(self.palette().color(QPalette.ColorRole.WindowText))
-        text_option = QTextOption()
-        text_option.setAlignment(
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
-        )
-        text_option.setWrapMode(QTextOption.WrapMode.NoWrap)
         line_height = self.fontMetrics().lineSpacing()
-        for index, line in enumerate(self.displayed_lines()):
-            line_rect = QRectF(
-                content_rect.left(),
-                content_rect.top() + (index * line_height),
-                content_rect.width(),
-                line_height,
+        for index, static_line in enumerate(self._prepared_static_lines()):
+            # 与按行矩形垂直居中绘制的结果保持一致。
+            top_offset = (line_height - static_line.size().height()) / 2
+            painter.drawStaticText(
+                QPointF(
+                    content_rect.left(),
+                    content_rect.top() + (index * line_height) + top_offset,
+                ),
+                static_line,
             )
-            painter.drawText(line_rect, line, text_option)
         painter.end()
 
+    def _prepared_static_lines(self) -> list[QStaticText]:
+        font_key = _text_metrics_key(self)
+        key = (self._available_width(), font_key)
+        if key == self._static_lines_key:
+            return self._static_lines
+
+        text_option = QTextOption()
+        text_option.setWrapMode(QTextOption.WrapMode.NoWrap)
+        font = self.font()
+        static_lines: list[QStaticText] = []
+        for line in self.displayed_lines():
+            static_line = QStaticText(line)
+            static_line.setTextFormat(Qt.TextFormat.PlainText)
+            static_line.setTextOption(text_option)
+            static_line.prepare(QTransform(), font)
+            static_lines.append(static_line)
+        self._static_lines = static_lines
+        self._static_lines_key = key
+        return static_lines
+
     def resizeEvent(self, event: QEvent) -> None:  # noqa: N802
         super().resizeEvent(event)
         self.refresh_elision()
@@ -595,7 +817,13 @@ class TodoItemWidget(QFrame):
         self._layout_result: Optional[TaskCardLayout] = None
         self._applying_layout = False
         self._rendered_completed_state: Optional[bool] = None
-        self._rendered_timer_state: Optional[_TimerPresentation] = None
+        self._rendered_timer_state: Optional[TimerPresentation] = None
+        # 最近一次计算计时呈现的时刻与当时依据的任务字段；两者都未越界时跳过重算。
+        self._rendered_timer_at: Optional[datetime] = None
+        self._rendered_timer_inputs: Optional[tuple] = None
+        # 与 viewport 无关的布局测量值，以及测量时卡片是否已完成样式润色。
+        self._layout_measurements: Optional[TaskCardLayoutInput] = None
+        self._layout_measured_polished = False
         self._build_ui()
         self.apply_palette(self._palette)
 
@@ -615,7 +843,7 @@ class TodoItemWidget(QFrame):
         self.complete_button = QPushButton()
         self.complete_button.setObjectName("TodoCompleteButton")
         self.complete_button.setCheckable(True)
-        self.complete_button.setIconSize(QSize(20, 20))
+        self.complete_button.setIconSize(_COMPLETE_ICON_SIZE)
         self.complete_button.setToolTip("标记为完成/未完成")
         self.complete_button.clicked.connect(self._toggle_complete)
         main_layout.addWidget(self.complete_button)
@@ -642,7 +870,12 @@ class TodoItemWidget(QFrame):
         font = self.task_text_label.font()
         font.setPointSize(11)
         self.task_text_label.setFont(font)
-        self.task_details_popup = _TaskDetailsPopup(self)
+        # 详情浮层是独立的顶层窗口，操作浮层带两枚按钮与图标；同一时刻最多一张卡片
+        # 处于悬停状态，因此两者都推迟到首次悬停或首次需要详情时才创建。
+        self._task_details_popup: Optional[_TaskDetailsPopup] = None
+        self._actions_container: Optional[QWidget] = None
+        self._edit_button: Optional[QPushButton] = None
+        self._delete_button: Optional[QPushButton] = None
         self.task_text_label.details_requested.connect(self._show_task_details)
         self.task_text_label.details_dismissed.connect(self._hide_task_details)
         self.task_text_label.details_requirement_changed.connect(
@@ -671,10 +904,13 @@ class TodoItemWidget(QFrame):
         self.timer_display_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
         main_layout.addWidget(self.timer_display_label)
 
-        self.actions_container = QWidget(self)
-        self.actions_container.setObjectName("TodoActionsContainer")
-        self.actions_container.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
-        actions_layout = QVBoxLayout(self.actions_container)
+    def _ensure_actions_overlay(self) -> QWidget:
+        if self._actions_container is not None:
+            return self._actions_container
+        actions_container = QWidget(self)
+        actions_container.setObjectName("TodoActionsContainer")
+        actions_container.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        actions_layout = QVBoxLayout(actions_container)
         actions_layout.setContentsMargins(
             TASK_ACTION_LAYOUT_HORIZONTAL_MARGIN,
             TASK_ACTION_LAYOUT_VERTICAL_MARGIN,
@@ -683,39 +919,90 @@ class TodoItemWidget(QFrame):
         )
         actions_layout.setSpacing(TASK_ACTION_LAYOUT_SPACING)
 
-        self.edit_button = QPushButton()
-        self.edit_button.setObjectName("TodoEditButton")
-        self.edit_button.setIconSize(QSize(18, 18))
-        self.edit_button.setToolTip("编辑任务")
-        self.edit_button.setAccessibleName("编辑任务")
-        self.edit_button.clicked.connect(self._edit_item)
-
-        self.delete_button = QPushButton()
-        self.delete_button.setObjectName("TodoDeleteButton")
-        self.delete_button.setIconSize(QSize(18, 18))
-        self.delete_button.setToolTip("删除任务")
-        self.delete_button.setAccessibleName("删除任务")
-        self.delete_button.clicked.connect(self._delete_item)
-
-        for button in (self.edit_button, self.delete_button):
+        edit_button = QPushButton()
+        edit_button.setObjectName("TodoEditButton")
+        edit_button.setIconSize(_ACTION_ICON_SIZE)
+        edit_button.setToolTip("编辑任务")
+        edit_button.setAccessibleName("编辑任务")
+        edit_button.clicked.connect(self._edit_item)
+
+        delete_button = QPushButton()
+        delete_button.setObjectName("TodoDeleteButton")
+        delete_button.setIconSize(_ACTION_ICON_SIZE)
+        delete_button.setToolTip("删除任务")
+        delete_button.setAccessibleName("删除任务")
+        delete_button.clicked.connect(self._delete_item)
+
+        for button in (edit_button, delete_button):
             button.setMinimumWidth(TASK_ACTION_BUTTON_MINIMUM_WIDTH)
             button.setFixedHeight(TASK_ACTION_BUTTON_HEIGHT)
             button.setCursor(Qt.CursorShape.PointingHandCursor)
 
-        actions_layout.addWidget(self.edit_button)
-        actions_layout.addWidget(self.delete_button)
+        actions_layout.addWidget(edit_button)
+        actions_layout.addWidget(delete_button)
         actions_layout.addStretch()
 
-        self.actions_container.setFixedWidth(TASK_ACTION_AREA_WIDTH)
-        self.actions_container.hide()
+        actions_container.setFixedWidth(TASK_ACTION_AREA_WIDTH)
+        actions_container.hide()
+        device_pixel_ratio = self.devicePixelRatioF()
+        edit_button.setIcon(
+            _build_action_icon("edit", self._palette.action_icon, device_pixel_ratio)
+        )
+        delete_button.setIcon(
+            _build_action_icon("delete", self._palette.action_icon, device_pixel_ratio)
+        )
+
+        self._actions_container = actions_container
+        self._edit_button = edit_button
+        self._delete_button = delete_button
+        return actions_container
+
+    @property
+    def actions_container(self) -> QWidget:
+        """悬停时叠在卡片右侧的编辑/删除操作区，首次访问时创建。"""
+
+        return self._ensure_actions_overlay()
+
+    @property
+    def edit_button(self) -> QPushButton:
+        self._ensure_actions_overlay()
+        return self._edit_button
+
+    @property
+    def delete_button(self) -> QPushButton:
+        self._ensure_actions_overlay()
+        return self._delete_button
+
+    @property
+    def task_details_popup(self) -> _TaskDetailsPopup:
+        """完整任务文本的详情浮层，首次需要显示时创建。"""
+
+        if self._task_details_popup is None:
+            self._task_details_popup = _TaskDetailsPopup(self)
+            self._task_details_popup.apply_palette(self._palette)
+        return self._task_details_popup
+
+    def hide_hover_overlays(self) -> None:
+        """收起操作区与详情浮层；尚未创建的浮层保持未创建。"""
+
+        if self._actions_container is not None:
+            self._actions_container.hide()
+        self._hide_task_details()
 
     def apply_palette(self, palette: ThemeColors) -> None:
         """应用指定主题配色。"""
 
         self._palette = palette
-        self.edit_button.setIcon(_build_action_icon("edit", palette.action_icon))
-        self.delete_button.setIcon(_build_action_icon("delete", palette.action_icon))
-        self.task_details_popup.apply_palette(palette)
+        if self._actions_container is not None:
+            device_pixel_ratio = self.devicePixelRatioF()
+            self._edit_button.setIcon(
+                _build_action_icon("edit", palette.action_icon, device_pixel_ratio)
+            )
+            self._delete_button.setIcon(
+                _build_action_icon("delete", palette.action_icon, device_pixel_ratio)
+            )
+        if self._task_details_popup is not None:
+            self._task_details_popup.apply_palette(palette)
 
         self.priority_label.setText(self._priority_badge_html(self.todo_item.get("priority", "中")))
         self.priority_label.setTextFormat(Qt.TextFormat.RichText)
@@ -725,6 +1012,38 @@ class TodoItemWidget(QFrame):
         self._rendered_timer_state = None
         self.update_timer_display(datetime.now(timezone.utc))
 
+    def bind(
+        self,
+        todo_item: dict,
+        palette: Optional[ThemeColors] = None,
+        current_time_utc: Optional[datetime] = None,
+    ) -> None:
+        """把卡片重新绑定到另一条任务与配色，只刷新与上一次绑定不同的呈现。
+
+        ``palette`` 为 None 时沿用当前配色；卡片池与列表委托借此复用同一个部件。
+        """
+
+        previous_priority = self.todo_item.get("priority", "中")
+        self.todo_item = todo_item
+        text = todo_item.get("text", "无内容")
+        text_changed = text != self.original_text
+        if text_changed:
+            self.original_text = text
+            self.task_text_label.setText(text)
+        if palette is not None and palette != self._palette:
+            # 换配色会重建优先级标识并重新应用完整呈现。
+            self.apply_palette(palette)
+            return
+        priority = todo_item.get("priority", "中")
+        if priority != previous_priority:
+            self.priority_label.setText(self._priority_badge_html(priority))
+        if current_time_utc is None:
+            current_time_utc = datetime.now(timezone.utc)
+        if not self.update_timer_display(current_time_utc) and (
+            text_changed or priority != previous_priority
+        ):
+            self.update_text_display()
+
     def _update_frame_background(self) -> None:
         is_completed = self.todo_item.get("completed", False)
         bg_color = self._palette.completed_item_bg if is_completed else self._palette.primary_item_bg
@@ -794,8 +1113,7 @@ class TodoItemWidget(QFrame):
         super().enterEvent(event)
 
     def leaveEvent(self, event: QEvent) -> None:  # noqa: N802
-        self.actions_container.hide()
-        self._hide_task_details()
+        self.hide_hover_overlays()
         super().leaveEvent(event)
 
     def resizeEvent(self, event) -> None:  # noqa: N802
@@ -803,18 +1121,19 @@ class TodoItemWidget(QFrame):
         layout_result = self._refresh_task_card_layout(
             viewport_width=self.width() + (self._list_spacing * 2),
         )
-        self._position_actions_overlay(layout_result)
+        if self._actions_container is not None:
+            self._position_actions_overlay(layout_result)
         if (
             self.task_text_label.is_hovered()
             and self.task_text_label.needs_details()
         ):
             self._show_task_details()
-        elif self.task_details_popup.isVisible():
+        elif self._task_details_visible():
             self._hide_task_details()
 
     def moveEvent(self, event: QEvent) -> None:  # noqa: N802
         super().moveEvent(event)
-        if self.task_details_popup.isVisible():
+        if self._task_details_visible():
             self._hide_task_details()
 
     def hideEvent(self, event: QEvent) -> None:  # noqa: N802
@@ -832,7 +1151,11 @@ class TodoItemWidget(QFrame):
         self.task_details_popup.raise_()
 
     def _hide_task_details(self) -> None:
-        self.task_details_popup.hide()
+        if self._task_details_popup is not None:
+            self._task_details_popup.hide()
+
+    def _task_details_visible(self) -> bool:
+        return self._task_details_popup is not None and self._task_details_popup.isVisible()
 
     def _handle_task_details_requirement(self, required: bool) -> None:
         if not required:
@@ -842,7 +1165,7 @@ class TodoItemWidget(QFrame):
 
     def _handle_task_details_scroll(self, event: QEvent) -> None:
         if (
-            self.task_details_popup.isVisible()
+            self._task_details_visible()
             and self.task_details_popup.scroll_details(event.angleDelta().y())
         ):
             event.accept()
@@ -924,7 +1247,11 @@ class TodoItemWidget(QFrame):
         if viewport_width is None:
             viewport_width = self.width() + (self._list_spacing * 2)
         layout_result = calculate_task_card_layout(
-            self._task_card_layout_input(viewport_width)
+            replace(
+                self.layout_measurements(),
+                viewport_width=viewport_width,
+                list_spacing=self._list_spacing,
+            )
         )
         self._layout_result = layout_result
 
@@ -962,6 +1289,32 @@ class TodoItemWidget(QFrame):
 
         return layout_result
 
+    def layout_measurements(self) -> TaskCardLayoutInput:
+        """返回卡片已测量的布局输入，viewport 字段沿用测量时的值。
+
+        测量需要激活布局并读取多个子控件的 sizeHint，结果在正文、字体、配色或
+        计时文字变化（均经 ``update_text_display``）以及样式变化前一直复用。
+        """
+
+        polished = self.testAttribute(Qt.WidgetAttribute.WA_WState_Polished)
+        if (
+            self._layout_measurements is None
+            or self._layout_measured_polished != polished
+        ):
+            self._layout_measurements = self._task_card_layout_input(
+                self.width() + (self._list_spacing * 2)
+            )
+            self._layout_measured_polished = polished
+        return self._layout_measurements
+
+    def invalidate_layout_measurements(self) -> None:
+        self._layout_measurements = None
+
+    def changeEvent(self, event: QEvent) -> None:  # noqa: N802
+        if event.type() in (QEvent.Type.FontChange, QEvent.Type.StyleChange):
+            self.invalidate_layout_measurements()
+        super().changeEvent(event)
+
     def _task_card_layout_input(self, viewport_width: int) -> TaskCardLayoutInput:
         main_layout = self.layout()
         content_layout = self.content_container.layout()
@@ -1053,6 +1406,7 @@ class TodoItemWidget(QFrame):
     def update_text_display(self) -> None:
         if self.task_text_label.text() != self.original_text:
             self.task_text_label.setText(self.original_text)
+        self.invalidate_layout_measurements()
         self._refresh_task_card_layout()
         self.task_text_label.updateGeometry()
         self.content_container.updateGeometry()
@@ -1079,7 +1433,7 @@ class TodoItemWidget(QFrame):
         self.complete_button.setChecked(is_completed)
         icon_path = DONE_ICON_PATH if is_completed else INCOMPLETE_ICON_PATH
         fallback_char = "✓" if is_completed else "○"
-        self.complete_button.setIcon(get_icon(icon_path, fallback_char))
+        self.complete_button.setIcon(get_icon(icon_path, fallback_char, _COMPLETE_ICON_SIZE))
         self._update_frame_background()
 
         text_color = (
@@ -1102,91 +1456,15 @@ class TodoItemWidget(QFrame):
         self._rendered_completed_state = is_completed
         return True
 
-    def _timer_presentation(
-        self,
-        current_time_utc: datetime,
-        *,
-        is_completed: bool,
-    ) -> _TimerPresentation:
-        """计算计时标签状态，不触发 Qt 重绘。"""
-
-        if is_completed:
-            return _TimerPresentation(
-                text="已完成",
-                color=self._palette.text_completed,
-                italic=True,
-                strikeout=True,
-            )
-
-        snooze_until_str = self.todo_item.get("snoozeUntil")
-        if snooze_until_str:
-            try:
-                snooze_until_dt = datetime.fromisoformat(
-                    snooze_until_str.replace("Z", "+00:00")
-                )
-                if snooze_until_dt > current_time_utc:
-                    return _TimerPresentation(
-                        text=(
-                            "推迟: "
-                            + self._format_timedelta(
-                                snooze_until_dt - current_time_utc
-                            )
-                        ),
-                        color=self._palette.snooze_badge,
-                    )
-            except ValueError:
-                print(
-                    f"任务 '{self.todo_item.get('text', '')}' 的推迟日期格式错误: "
-                    f"{snooze_until_str}"
-                )
-                self.todo_item["snoozeUntil"] = None
-
-        due_date_str = self.todo_item.get("dueDate")
-        if not due_date_str:
-            return _TimerPresentation(
-                text="无截止日期",
-                color=self._palette.text_secondary,
-            )
-
-        try:
-            due_date_dt = datetime.fromisoformat(
-                due_date_str.replace("Z", "+00:00")
-            )
-        except ValueError:
-            return _TimerPresentation(
-                text="日期格式错误!",
-                color=self._palette.due_critical,
-                bold=True,
-            )
-
-        diff = due_date_dt - current_time_utc
-        time_left_str = self._format_timedelta(diff)
-        if diff.total_seconds() <= 0:
-            return _TimerPresentation(
-                text=f"已到期 ({time_left_str.replace('-', '')})",
-                color=self._palette.due_critical,
-                point_size=10,
-                bold=True,
-            )
-
-        color = (
-            self._palette.due_warning
-            if diff.total_seconds() < 86400
-            else self._palette.timer_positive
-        )
-        return _TimerPresentation(
-            text=f"剩余: {time_left_str}",
-            color=color,
-            bold=True,
-        )
-
     def _apply_timer_presentation(
         self,
-        presentation: _TimerPresentation,
+        presentation: TimerPresentation,
     ) -> bool:
         """仅在最终文本或样式变化时更新计时标签。"""
 
         if self._rendered_timer_state == presentation:
+            # 呈现相同但下一次变化时刻可能已后移，仍需记录。
+            self._rendered_timer_state = presentation
             return False
 
         self._set_timer_text(presentation.text)
@@ -1206,41 +1484,31 @@ class TodoItemWidget(QFrame):
         """刷新有变化的呈现状态，并返回是否触发了卡片重排。"""
 
         is_completed = self.todo_item.get("completed", False)
+        timer_inputs = (
+            is_completed,
+            self.todo_item.get("snoozeUntil"),
+            self.todo_item.get("dueDate"),
+        )
+        rendered = self._rendered_timer_state
+        if (
+            rendered is not None
+            and self._rendered_completed_state == is_completed
+            and self._rendered_timer_inputs == timer_inputs
+            and self._rendered_timer_at <= current_time_utc
+            and (rendered.next_change is None or current_time_utc < rendered.next_change)
+        ):
+            return False
+
         completed_changed = self._apply_completed_presentation(is_completed)
         timer_changed = self._apply_timer_presentation(
-            self._timer_presentation(
-                current_time_utc,
-                is_completed=is_completed,
-            )
+            timer_presentation(self.todo_item, current_time_utc, self._palette)
         )
+        self._rendered_timer_at = current_time_utc
+        self._rendered_timer_inputs = timer_inputs
         presentation_changed = completed_changed or timer_changed
         if presentation_changed:
             self.update_text_display()
         return presentation_changed
 
-    def _format_timedelta(self, diff: timedelta) -> str:
-        is_past = diff.total_seconds() < 0
-        effective_diff = abs(diff)
-        days = effective_diff.days
-        secs_in_day = effective_diff.seconds
-        hours = secs_in_day // 3600
-        minutes = (secs_in_day % 3600) // 60
-        seconds = secs_in_day % 60
-        parts = []
-        if days > 0:
-            parts.append(f"{days}天")
-        if hours > 0:
-            parts.append(f"{hours}时")
-        if minutes > 0 and days == 0:
-            parts.append(f"{minutes}分")
-        if not parts and effective_diff.total_seconds() > 0:
-            parts.append(f"{seconds}秒")
-
-        if not parts:
-            return "刚刚"
-
-        formatted_str = " ".join(parts[:2])
-        return f"-{formatted_str}" if is_past else formatted_str
-
-
-__all__ = ["TodoItemWidget"]
+
+__all__ = ["TimerPresentation", "TodoItemWidget", "timer_presentation"]